@@ -0,0 +1,85 @@
+"""
+Analytics module: Streamlit-free statistics shared by the UI, batch jobs and benchmarks
+"""
+
+from typing import Dict
+
+import pandas as pd
+import numpy as np
+
+from config import TECHNICAL_INDICATORS
+from utils import calculate_ma, calculate_rsi, calculate_bollinger_bands
+
+
+def statistics_values(close: pd.Series, volume: pd.Series) -> Dict[str, float]:
+    """Numeric values behind the statistics table, keyed by the table's metric labels"""
+    data = close
+    stats = {
+        'Current Price': data.iloc[-1],
+        'Mean Price': data.mean(),
+        'Median Price': data.median(),
+        'Standard Deviation': data.std(),
+        'Minimum Price': data.min(),
+        'Maximum Price': data.max(),
+        '52-Week High': data.tail(252).max() if len(data) >= 252 else data.max(),
+        '52-Week Low': data.tail(252).min() if len(data) >= 252 else data.min(),
+        'Volatility (30-day)': calculate_volatility(data),
+        'Average Volume': volume.mean(),
+    }
+    returns = data.pct_change().dropna()
+
+    if len(returns) > 0 :
+        stats['Sharpe Ratio(approx)'] = calculate_sharpe_ratio(returns)
+        stats['Max Drawdown'] = calculate_max_drawdown(data)
+        stats['Positive days%'] = (returns>0).mean()*100
+    return stats
+
+
+def indicator_snapshot(close: pd.Series) -> Dict[str, float]:
+    """Latest value of each configured technical indicator"""
+    ti = TECHNICAL_INDICATORS
+    upper, middle, lower = calculate_bollinger_bands(close, ti["BOLLINGER_PERIOD"], ti["BOLLINGER_STD"])
+
+    snapshot = {
+        f"MA_{ti['MA_SHORT']}": calculate_ma(close, ti["MA_SHORT"]).iloc[-1],
+        f"MA_{ti['MA_LONG']}": calculate_ma(close, ti["MA_LONG"]).iloc[-1],
+        f"MA_{ti['MA_EXTRA_LONG']}": calculate_ma(close, ti["MA_EXTRA_LONG"]).iloc[-1],
+        f"RSI_{ti['RSI_PERIOD']}": calculate_rsi(close, ti["RSI_PERIOD"]).iloc[-1],
+        "Bollinger Upper": upper.iloc[-1],
+        "Bollinger Middle": middle.iloc[-1],
+        "Bollinger Lower": lower.iloc[-1],
+    }
+    return {name: float(value) for name, value in snapshot.items()}
+
+
+def calculate_volatility(prices,window=30):
+    if not isinstance(prices,pd.Series):
+        prices = pd.Series(prices)
+
+    if len(prices) < window:
+        window = len(prices)
+
+    returns = prices.pct_change().dropna()
+
+    if len(returns) < window:
+        return 0
+
+    volatility= returns.std()*np.sqrt(252)
+    return volatility
+
+
+
+def calculate_sharpe_ratio(returns,risk_free_return=0.02):
+    if len(returns)==0 or returns.std()==0:
+        return 0
+
+    excess_returns= returns.mean()*252-risk_free_return
+    volatility =returns.std()*np.sqrt(252)
+    return excess_returns/volatility
+
+def calculate_max_drawdown(prices):
+    if len(prices) < 2:
+        return 0
+    peak=prices.expanding().max()
+    drawdown=(prices-peak)/peak*100
+    return drawdown.min()
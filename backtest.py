@@ -0,0 +1,234 @@
+"""
+Backtesting module
+Vectorized long/flat backtests of the TECHNICAL_INDICATORS rules (MA crossover,
+RSI oversold/overbought, Bollinger breakout) and parallel parameter sweeps.
+Sharpe ratio and max drawdown use the statistics-table definitions in analytics.py.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analytics import calculate_sharpe_ratio, calculate_max_drawdown
+from config import TECHNICAL_INDICATORS
+
+TRADING_DAYS = 252
+RISK_FREE_RETURN = 0.02  # same default as analytics.calculate_sharpe_ratio
+
+ti = TECHNICAL_INDICATORS
+STRATEGIES: Dict[str, Dict[str, Any]] = {
+    "ma_crossover": {
+        "description": "Long while MA(short) is above MA(long)",
+        "defaults": {"short": ti["MA_SHORT"], "long": ti["MA_LONG"]},
+    },
+    "rsi": {
+        "description": "Enter long below the oversold level, exit above the overbought level",
+        "defaults": {"period": ti["RSI_PERIOD"], "oversold": ti["RSI_OVERSOLD"], "overbought": ti["RSI_OVERBOUGHT"]},
+    },
+    "bollinger": {
+        "description": "Enter long on a close above the upper band, exit on a close below the middle band",
+        "defaults": {"period": ti["BOLLINGER_PERIOD"], "std": ti["BOLLINGER_STD"]},
+    },
+}
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean, NaN until the window is full (like pandas rolling().mean())"""
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        cumsum = np.concatenate(([0.0], np.cumsum(values)))
+        out[window - 1:] = (cumsum[window:] - cumsum[:-window]) / window
+    return out
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample std (ddof=1), NaN until the window is full"""
+    out = np.full(len(values), np.nan)
+    if 1 < window <= len(values):
+        centred = values - values.mean()  # keeps the sum-of-squares numerically stable
+        s1 = np.concatenate(([0.0], np.cumsum(centred)))
+        s2 = np.concatenate(([0.0], np.cumsum(centred ** 2)))
+        sums = s1[window:] - s1[:-window]
+        squares = s2[window:] - s2[:-window]
+        out[window - 1:] = np.sqrt(np.maximum(squares - sums ** 2 / window, 0) / (window - 1))
+    return out
+
+
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI with simple rolling means, as utils.calculate_rsi"""
+    out = np.full(len(close), np.nan)
+    delta = np.diff(close)
+    gain = _rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = 100 - 100 / (1 + gain / loss)
+    return out
+
+
+def _hold(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """
+    Long/flat state from entry and exit signals, column-wise and loop-free
+
+    The latest signal wins and is carried forward (a forward fill over the
+    signal index); bars before the first signal are flat.
+    """
+    state = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    rows = np.arange(state.shape[0])[:, None]
+    last_signal = np.where(~np.isnan(state), rows, 0)
+    np.maximum.accumulate(last_signal, axis=0, out=last_signal)
+    held = np.take_along_axis(state, last_signal, axis=0)
+    return np.nan_to_num(held, nan=0.0)
+
+
+def positions(strategy: str, close: np.ndarray, combos: List[Dict[str, float]]) -> np.ndarray:
+    """Target position (0 or 1) per bar (rows) and parameter combination (columns)"""
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    memo: Dict[Tuple, np.ndarray] = {}
+
+    def cached(key, build):
+        if key not in memo:
+            memo[key] = build()
+        return memo[key]
+
+    if strategy == "ma_crossover":
+        short = np.column_stack([cached(("ma", int(c["short"])), lambda c=c: _rolling_mean(close, int(c["short"])))
+                                 for c in combos])
+        long = np.column_stack([cached(("ma", int(c["long"])), lambda c=c: _rolling_mean(close, int(c["long"])))
+                                for c in combos])
+        with np.errstate(invalid="ignore"):
+            return (short > long).astype(float)
+
+    if strategy == "rsi":
+        rsi = np.column_stack([cached(("rsi", int(c["period"])), lambda c=c: _rsi(close, int(c["period"])))
+                               for c in combos])
+        oversold = np.array([c["oversold"] for c in combos], dtype=float)
+        overbought = np.array([c["overbought"] for c in combos], dtype=float)
+        with np.errstate(invalid="ignore"):
+            return _hold(rsi < oversold, rsi > overbought)
+
+    if strategy == "bollinger":
+        middle = np.column_stack([cached(("ma", int(c["period"])), lambda c=c: _rolling_mean(close, int(c["period"])))
+                                  for c in combos])
+        std = np.column_stack([cached(("std", int(c["period"])), lambda c=c: _rolling_std(close, int(c["period"])))
+                               for c in combos])
+        upper = middle + std * np.array([c["std"] for c in combos], dtype=float)
+        prices = close.reshape(n, 1)
+        with np.errstate(invalid="ignore"):
+            return _hold(prices > upper, prices < middle)
+
+    raise ValueError(f"Unknown strategy {strategy!r}; choose from {', '.join(STRATEGIES)}")
+
+
+def _strategy_returns(close: np.ndarray, held: np.ndarray, cost: float) -> np.ndarray:
+    """Bar returns of each column, trading at the close after the signal bar"""
+    close = np.asarray(close, dtype=float)
+    asset_returns = (close[1:] / close[:-1] - 1).reshape(-1, 1)
+    exposure = held[:-1]  # position decided at bar t earns the return of bar t+1
+    turnover = np.abs(np.diff(held, axis=0, prepend=0.0))[:-1]
+    return exposure * asset_returns - turnover * cost
+
+
+def _metrics(returns: np.ndarray, held: np.ndarray) -> Dict[str, np.ndarray]:
+    """Column-wise Sharpe, max drawdown (%), total return (%) and trade count"""
+    equity = np.cumprod(1 + returns, axis=0)
+    peak = np.maximum.accumulate(equity, axis=0)
+    std = returns.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, (returns.mean(axis=0) * TRADING_DAYS - RISK_FREE_RETURN)
+                          / (std * np.sqrt(TRADING_DAYS)), 0.0)
+    return {
+        "sharpe_ratio": sharpe,
+        "max_drawdown": ((equity - peak) / peak * 100).min(axis=0),
+        "total_return": (equity[-1] - 1) * 100,
+        "trades": (np.diff(held, axis=0, prepend=0.0) > 0).sum(axis=0),
+    }
+
+
+def run_backtest(prices: pd.Series, strategy: str, cost: float = 0.0, **params) -> Dict[str, Any]:
+    """
+    Backtest one parameter set on a Close series
+
+    Returns the equity curve and positions as Series plus the summary metrics,
+    computed with analytics.calculate_sharpe_ratio / calculate_max_drawdown.
+    """
+    combo = {**STRATEGIES[strategy]["defaults"], **params}
+    close = prices.to_numpy(dtype=float)
+    held = positions(strategy, close, [combo])
+    returns = pd.Series(_strategy_returns(close, held, cost)[:, 0], index=prices.index[1:])
+    equity = (1 + returns).cumprod()
+    return {
+        "params": combo,
+        "positions": pd.Series(held[:, 0], index=prices.index),
+        "equity": equity,
+        "sharpe_ratio": calculate_sharpe_ratio(returns),
+        "max_drawdown": calculate_max_drawdown(equity),
+        "total_return": (equity.iloc[-1] - 1) * 100,
+        "trades": int((np.diff(held[:, 0], prepend=0.0) > 0).sum()),
+    }
+
+
+def _evaluate_chunk(args) -> pd.DataFrame:
+    strategy, close, combos, cost = args
+    held = positions(strategy, close, combos)
+    metrics = _metrics(_strategy_returns(close, held, cost), held)
+    frame = pd.DataFrame(combos)
+    for name, values in metrics.items():
+        frame[name] = values
+    return frame
+
+
+def expand_grid(grid: Dict[str, Iterable[float]]) -> List[Dict[str, float]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(grid[name]) for name in names))]
+
+
+def sweep(prices: pd.Series, strategy: str, grid: Dict[str, Iterable[float]], workers: Optional[int] = None,
+          cost: float = 0.0, chunk_size: int = 250) -> pd.DataFrame:
+    """
+    Evaluate every parameter combination in `grid`, ranked by Sharpe ratio
+
+    Combinations are evaluated in vectorized chunks of `chunk_size` columns,
+    spread over a process pool when more than one worker is used. Parameters not
+    in the grid take the strategy's TECHNICAL_INDICATORS defaults.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; choose from {', '.join(STRATEGIES)}")
+    defaults = STRATEGIES[strategy]["defaults"]
+    combos = [{**defaults, **combo} for combo in expand_grid(grid)]
+    if strategy == "ma_crossover":
+        combos = [combo for combo in combos if combo["short"] < combo["long"]]
+    if not combos:
+        return pd.DataFrame()
+
+    close = prices.to_numpy(dtype=float)
+    chunks = [(strategy, close, combos[i:i + chunk_size], cost) for i in range(0, len(combos), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    if workers <= 1:
+        frames = [_evaluate_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_evaluate_chunk, chunks))
+
+    results = pd.concat(frames, ignore_index=True)
+    return results.sort_values("sharpe_ratio", ascending=False, ignore_index=True)
+
+
+def parse_grid(specs: Iterable[str]) -> Dict[str, List[float]]:
+    """['short=5:50:5', 'long=100,150,200'] -> {'short': [5, 10, ... 45], 'long': [100, 150, 200]}"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"Grid spec {spec!r} must look like name=start:stop:step or name=a,b,c")
+        if ":" in values:
+            start, stop, step = (float(part) for part in values.split(":"))
+            grid[name.strip()] = list(np.arange(start, stop, step))
+        else:
+            grid[name.strip()] = [float(part) for part in values.split(",")]
+    return grid
@@ -0,0 +1,273 @@
+"""
+TickerTrek batch mode
+Computes the statistics table, returns analysis and indicator snapshot for many
+tickers across a process pool, without Streamlit, and writes Parquet or CSV
+
+    python batch.py analyse --tickers AAPL MSFT NVDA --output report.csv
+    python batch.py analyse --tickers-file universe.txt --period 1y --workers 8 --output report.parquet
+    python batch.py snapshot --tickers-file universe.txt --period 2y     # history for the screener and replay provider
+    python batch.py backtest --tickers AAPL --period 10y --strategy ma_crossover \
+        --grid short=5:105:5 long=20:520:10 --output sweep.csv
+    python batch.py export --tickers-file watchlist.txt --period max --format parquet --output history.zip
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from analytics import statistics_values, indicator_snapshot
+from backtest import STRATEGIES, sweep, parse_grid
+from export import export_zip, EXPORT_FORMATS
+from config import PERIOD_OPTIONS, SCREENER_SETTINGS
+from corporate_actions import ActionLedger
+from data_etl import FetchError, StockData, StockDataManage
+import upstream
+
+logger = logging.getLogger("tickertrek.batch")
+# Action columns are kept so the replay provider and later snapshots can adjust incrementally
+SNAPSHOT_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+
+def _column_name(label: str) -> str:
+    """'52-Week High' -> '52_week_high', 'Positive days%' -> 'positive_days_pct'"""
+    label = label.replace("%", " pct")
+    return re.sub(r"[^0-9a-z]+", "_", label.lower()).strip("_")
+
+
+def analyse_symbol(symbol: str, period: str) -> Dict[str, Any]:
+    """One flat result row for a symbol; failures are reported in the `error` column"""
+    row: Dict[str, Any] = {"symbol": symbol.upper().strip(), "period": period, "error": None}
+    stock_data = StockDataManage().get_stock_data(symbol, period)
+    if not stock_data.is_valid():
+        row["error"] = stock_data.error or "no data"
+        return row
+
+    frame = stock_data.data
+    row["bars"] = len(frame)
+    row["first_date"] = frame.index[0]
+    row["last_date"] = frame.index[-1]
+    daily = stock_data.daily_bars()
+    for label, value in statistics_values(daily['Close'], daily['Volume']).items():
+        row[_column_name(label)] = float(value)
+    for key, value in stock_data.get_returns_analysis().items():
+        row[f"returns_{key}"] = float(value)
+    for label, value in indicator_snapshot(frame['Close']).items():
+        row[_column_name(label)] = value
+    return row
+
+
+def _analyse_task(args) -> Dict[str, Any]:
+    symbol, period = args
+    try:
+        return analyse_symbol(symbol, period)
+    except Exception as e:
+        return {"symbol": symbol, "period": period, "error": f"{type(e).__name__}: {e}"}
+
+
+def _init_worker(workers: int):
+    # Share the configured upstream budget between all worker processes
+    upstream.scale_rate_limits(1 / workers)
+
+
+def run_analysis(symbols: List[str], period: str, workers: int) -> pd.DataFrame:
+    tasks = [(symbol, period) for symbol in symbols]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    rows = []
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool:
+        for i, row in enumerate(pool.map(_analyse_task, tasks, chunksize=chunksize), start=1):
+            rows.append(row)
+            if i % 100 == 0 or i == len(tasks):
+                logger.info("%d/%d symbols done (%.1fs)", i, len(tasks), time.time() - started)
+    return pd.DataFrame(rows)
+
+
+def _stored_snapshot(symbol: str, directory: str):
+    """The symbol's previous snapshot with its corporate-action ledger, None when absent or unreadable"""
+    path = os.path.join(directory, f"{symbol}.parquet")
+    try:
+        with open(os.path.join(directory, f"{symbol}.actions.json")) as f:
+            ledger = ActionLedger.from_records(json.load(f))
+        frame = pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+    if frame.empty:
+        return None
+    stored = StockData(symbol, frame, info={}, current_price=float(frame["Close"].iloc[-1]))
+    stored.actions = ledger
+    return stored
+
+
+def snapshot_symbol(symbol: str, period: str, directory: str) -> Dict[str, Any]:
+    """
+    Store a symbol's daily OHLCV history as <directory>/<SYMBOL>.parquet (and its info for the replay provider)
+
+    An existing snapshot is extended with recent bars rather than downloaded again;
+    <SYMBOL>.actions.json records the splits and dividends already adjusted into it.
+    """
+    symbol = symbol.upper().strip()
+    previous = _stored_snapshot(symbol, directory)
+    if previous is not None:
+        try:
+            stock_data = StockDataManage.update_history(previous, period)
+        except FetchError as e:
+            return {"symbol": symbol, "error": str(e)}
+    else:
+        stock_data = StockDataManage().get_stock_data(symbol, period)
+    if not stock_data.is_valid():
+        return {"symbol": symbol, "error": stock_data.error or "no data"}
+    columns = [c for c in SNAPSHOT_COLUMNS if c in stock_data.data.columns]
+    path = os.path.join(directory, f"{stock_data.symbol}.parquet")
+    tmp_path = f"{path}.tmp"
+    stock_data.data[columns].to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+    with open(os.path.join(directory, f"{stock_data.symbol}.actions.json"), "w") as f:
+        json.dump(stock_data.actions.to_records(), f)
+    if stock_data.info:
+        with open(os.path.join(directory, f"{stock_data.symbol}.info.json"), "w") as f:
+            json.dump(stock_data.info, f, default=str)
+    return {"symbol": stock_data.symbol, "error": None, "bars": len(stock_data.data),
+            "incremental": previous is not None}
+
+
+def _snapshot_task(args) -> Dict[str, Any]:
+    symbol, period, directory = args
+    try:
+        return snapshot_symbol(symbol, period, directory)
+    except Exception as e:
+        return {"symbol": symbol, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_snapshot(symbols: List[str], period: str, workers: int, directory: str) -> pd.DataFrame:
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(symbol, period, directory) for symbol in symbols]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers,)) as pool:
+        return pd.DataFrame(list(pool.map(_snapshot_task, tasks, chunksize=chunksize)))
+
+
+def run_backtests(symbols: List[str], period: str, strategy: str, grid: Dict[str, List[float]],
+                  workers: int, cost: float) -> pd.DataFrame:
+    """Parameter sweep per symbol; the grid itself is spread over the process pool"""
+    frames = []
+    for symbol in symbols:
+        stock_data = StockDataManage().get_stock_data(symbol, period)
+        if not stock_data.is_valid():
+            logger.warning("Skipping %s: %s", symbol, stock_data.error or "no data")
+            continue
+        started = time.time()
+        frame = sweep(stock_data.data['Close'], strategy, grid, workers=workers, cost=cost)
+        logger.info("%s: %d combinations in %.2fs", stock_data.symbol, len(frame), time.time() - started)
+        frame.insert(0, "symbol", stock_data.symbol)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def write_frame(frame: pd.DataFrame, path: str, file_format: str = None):
+    """Write to Parquet or CSV, inferring the format from the extension when not given"""
+    file_format = file_format or ("parquet" if path.endswith(".parquet") else "csv")
+    if file_format == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def read_symbols(args) -> List[str]:
+    symbols = list(args.tickers or [])
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            for line in f:
+                line = line.split("#")[0].strip()
+                if line:
+                    symbols.extend(part.strip() for part in line.split(",") if part.strip())
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="TickerTrek batch jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyse = commands.add_parser("analyse", help="statistics, returns analysis and indicators per ticker")
+    analyse.add_argument("--tickers", nargs="+", help="ticker symbols")
+    analyse.add_argument("--tickers-file", help="file with one ticker per line (or comma separated)")
+    analyse.add_argument("--period", default="1y", choices=sorted(set(PERIOD_OPTIONS.values()) | {"5y", "10y", "max"}))
+    analyse.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    analyse.add_argument("--output", required=True, help="output file (.parquet or .csv)")
+    analyse.add_argument("--format", choices=["parquet", "csv"], help="override the format implied by --output")
+
+    snapshot = commands.add_parser("snapshot", help="store daily history per ticker for the screener")
+    snapshot.add_argument("--tickers", nargs="+", help="ticker symbols")
+    snapshot.add_argument("--tickers-file", help="file with one ticker per line (or comma separated)")
+    snapshot.add_argument("--period", default="2y", choices=sorted(set(PERIOD_OPTIONS.values()) | {"5y", "10y", "max"}))
+    snapshot.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    snapshot.add_argument("--output-dir", default=SCREENER_SETTINGS["universe_dir"])
+
+    backtest = commands.add_parser("backtest", help="parameter sweep of an indicator strategy per ticker")
+    backtest.add_argument("--tickers", nargs="+", help="ticker symbols")
+    backtest.add_argument("--tickers-file", help="file with one ticker per line (or comma separated)")
+    backtest.add_argument("--period", default="10y", choices=sorted(set(PERIOD_OPTIONS.values()) | {"5y", "10y", "max"}))
+    backtest.add_argument("--strategy", default="ma_crossover", choices=list(STRATEGIES))
+    backtest.add_argument("--grid", nargs="*", default=[],
+                          help="parameter ranges, e.g. short=5:105:5 long=50,100,200 (others use TECHNICAL_INDICATORS)")
+    backtest.add_argument("--cost", type=float, default=0.0, help="cost per position change as a fraction, e.g. 0.001")
+    backtest.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    backtest.add_argument("--output", required=True, help="output file (.parquet or .csv)")
+    backtest.add_argument("--format", choices=["parquet", "csv"], help="override the format implied by --output")
+
+    export = commands.add_parser("export", help="full history plus indicators, zipped per ticker")
+    export.add_argument("--tickers", nargs="+", help="ticker symbols")
+    export.add_argument("--tickers-file", help="file with one ticker per line (or comma separated)")
+    export.add_argument("--period", default="max", choices=sorted(set(PERIOD_OPTIONS.values()) | {"5y", "10y", "max"}))
+    export.add_argument("--format", default="csv", choices=EXPORT_FORMATS)
+    export.add_argument("--output", required=True, help="output .zip file")
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = build_parser().parse_args(argv)
+
+    symbols = read_symbols(args)
+    if not symbols:
+        logger.error("No tickers given, use --tickers or --tickers-file")
+        return 2
+
+    if args.command == "analyse":
+        frame = run_analysis(symbols, args.period, max(1, args.workers))
+        write_frame(frame, args.output, args.format)
+        failed = int(frame["error"].notna().sum())
+        logger.info("Wrote %d rows to %s (%d failed)", len(frame), args.output, failed)
+    elif args.command == "snapshot":
+        frame = run_snapshot(symbols, args.period, max(1, args.workers), args.output_dir)
+        failed = int(frame["error"].notna().sum())
+        logger.info("Stored %d symbols in %s (%d failed)", len(frame) - failed, args.output_dir, failed)
+    elif args.command == "backtest":
+        try:
+            grid = parse_grid(args.grid)
+        except ValueError as e:
+            logger.error("%s", e)
+            return 2
+        frame = run_backtests(symbols, args.period, args.strategy, grid, max(1, args.workers), args.cost)
+        write_frame(frame, args.output, args.format)
+        logger.info("Wrote %d rows to %s", len(frame), args.output)
+    elif args.command == "export":
+        results = export_zip(symbols, args.period, args.format, args.output,
+                             progress=lambda i, total, symbol: logger.info("%d/%d %s", i, total, symbol))
+        failed = {symbol: error for symbol, error in results.items() if error}
+        for symbol, error in failed.items():
+            logger.warning("Skipped %s: %s", symbol, error)
+        logger.info("Exported %d symbols to %s (%d failed)", len(results) - len(failed), args.output, len(failed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
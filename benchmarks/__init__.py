@@ -0,0 +1,3 @@
+"""
+Benchmark suite for TickerTrek, see run_benchmarks.py
+"""
@@ -0,0 +1,391 @@
+"""
+Load test: concurrent simulated sessions against one TickerTrek server process
+
+Starts `trek_app.py` on a real Streamlit server (replaying a synthetic universe
+with `--latency` seconds added to every provider call in place of Yahoo Finance)
+and connects N headless sessions over Streamlit's websocket protocol, the way
+browsers do. Each session runs a seeded random mix of symbol switches,
+quick-select clicks, period and interval changes and live-mode ticks. Reports
+rerun-latency percentiles, reruns per second and the server's peak RSS per
+session count; each count gets a fresh server so caches and memory start cold.
+
+(Streamlit's AppTest cannot be used here: it is not safe to run from several
+threads of one process, and one process is what is being measured.)
+
+Run from the repository root:
+    python -m benchmarks.load_test                              # compare with load_baseline.json
+    python -m benchmarks.load_test --sessions 1 8 32 --actions 30 --latency 0.25
+    python -m benchmarks.load_test --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.run_benchmarks import compare
+from benchmarks.synthetic import generate_ohlcv
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_baseline.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "trek_app.py")
+DEFAULT_SESSIONS = [1, 4, 16]
+# Typed-in symbols besides the quick-select ones
+EXTRA_SYMBOLS = ["MSFT", "AMZN", "TSLA", "RELIANCE.NS", "INFY.NS", "HSBA.L"]
+ACTIONS = ["symbol", "quick_select", "period", "interval", "live"]
+PERCENTILES = [50, 90, 95, 99]
+SYMBOL_INPUT_LABEL = "Enter Stock Symbol:"
+
+
+def write_universe(directory: str, symbols: List[str]):
+    """Synthetic recording for the replay provider: 10 years of daily and 60 days of hourly bars"""
+    os.makedirs(directory, exist_ok=True)
+    for seed, symbol in enumerate(symbols):
+        daily = generate_ohlcv(2_520, seed=seed, start="2016-01-01", freq="B")
+        daily.index = daily.index.normalize()
+        hourly = generate_ohlcv(60 * 24, seed=seed, start=str((daily.index[-1] - pd.Timedelta(days=60)).date()))
+        columns = ["Open", "High", "Low", "Close", "Volume"]
+        daily[columns].to_parquet(os.path.join(directory, f"{symbol}.parquet"))
+        hourly[columns].to_parquet(os.path.join(directory, f"{symbol}.1h.parquet"))
+        with open(os.path.join(directory, f"{symbol}.info.json"), "w") as f:
+            json.dump({"longName": f"{symbol} (synthetic)", "sector": "Technology",
+                       "marketCap": 1e12, "trailingPE": 25.0, "trailingEps": 4.2}, f)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_bytes(pid: int) -> Optional[int]:
+    """High-water RSS of a process (Linux /proc; None elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def serve(port: int, replay_dir: str, latency: float):
+    """Server side of a level (runs in its own interpreter): the app on the replay provider"""
+    from streamlit.web import bootstrap
+    from providers import ReplayProvider, set_provider
+
+    set_provider(ReplayProvider(replay_dir, latency))
+    flag_options = {
+        "server_port": port,
+        "server_address": "127.0.0.1",
+        "server_headless": True,
+        "server_fileWatcherType": "none",
+        "browser_gatherUsageStats": False,
+        "logger_level": "error",
+    }
+    bootstrap.load_config_options(flag_options)
+    bootstrap.run(APP_PATH, False, [], flag_options)
+
+
+class Session:
+    """
+    One headless browser tab
+
+    Keeps the widget values a browser would send back with every rerun and
+    times each rerun from the request to the script_finished message.
+    """
+
+    def __init__(self, url: str, seed: int, symbols: List[str]):
+        self.url = url
+        self.rng = random.Random(seed)
+        self.symbols = symbols
+        self.ws = None
+        self.widgets: Dict[str, Any] = {}  # widget id -> (type, element proto) of the latest full run
+        self.values: Dict[str, Any] = {}   # widget id -> value sent back (all but buttons)
+        self.page_script_hash = ""
+        self.fragment_id = ""               # live-price fragment, set while live mode is on
+        self.timings: List[float] = []
+        self.kinds: List[str] = []
+        self.exceptions = 0
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"], max_message_size=64 * 2 ** 20)
+
+    def _widget_states(self, trigger: Optional[str]):
+        from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+        states = WidgetStates()
+        for widget_id, value in self.values.items():
+            state = states.widgets.add(id=widget_id)
+            if isinstance(value, bool):
+                state.bool_value = value
+            else:
+                state.string_value = value
+        if trigger:
+            states.widgets.add(id=trigger, trigger_value=True)
+        return states
+
+    def _track(self, kind: str, element):
+        """Record a widget from a delta, with the value a browser would start from"""
+        widget_id = element.id
+        self.widgets[widget_id] = (kind, element)
+        if widget_id in self.values:
+            return
+        if kind == "text_input":
+            self.values[widget_id] = element.value if element.set_value else element.default
+        elif kind == "selectbox" and element.options:
+            index = element.value if element.set_value else element.default
+            self.values[widget_id] = element.raw_value or element.options[index]
+        elif kind == "checkbox":
+            self.values[widget_id] = element.value if element.set_value else element.default
+
+    async def rerun(self, kind: str, trigger: Optional[str] = None, fragment_id: str = ""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = self.page_script_hash
+        message.rerun_script.widget_states.CopyFrom(self._widget_states(trigger))
+        if fragment_id:
+            message.rerun_script.fragment_id = fragment_id
+            message.rerun_script.is_auto_rerun = True
+        else:
+            self.widgets = {}
+            self.fragment_id = ""
+
+        started = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("Server closed the session")
+            forward = ForwardMsg()
+            forward.ParseFromString(payload)
+            message_type = forward.WhichOneof("type")
+            if message_type == "new_session":
+                self.page_script_hash = forward.new_session.page_script_hash
+            elif message_type == "auto_rerun":
+                self.fragment_id = forward.auto_rerun.fragment_id
+            elif message_type == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    self.exceptions += 1
+                elif element_type in ("text_input", "selectbox", "checkbox", "button"):
+                    self._track(element_type, getattr(element, element_type))
+            elif message_type == "script_finished" and forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.timings.append(time.perf_counter() - started)
+        self.kinds.append(kind)
+        if not fragment_id:
+            # Widgets that were not drawn this run are gone from the page
+            self.values = {k: v for k, v in self.values.items() if k in self.widgets}
+
+    def _find(self, kind: str, match) -> Optional[str]:
+        for widget_id, (widget_kind, element) in self.widgets.items():
+            if widget_kind == kind and match(widget_id, element):
+                return widget_id
+        return None
+
+    async def act(self, action: str):
+        rng = self.rng
+        if action == "symbol":
+            widget_id = self._find("text_input", lambda _, e: e.label == SYMBOL_INPUT_LABEL)
+            self.values[widget_id] = rng.choice(self.symbols)
+            await self.rerun(action)
+        elif action == "quick_select":
+            buttons = [w for w, (kind, _) in self.widgets.items() if kind == "button" and "-quick_" in w]
+            await self.rerun(action, trigger=rng.choice(buttons))
+        elif action in ("period", "interval"):
+            key = "sidebar_period_select" if action == "period" else "sidebar_interval_select_"
+            widget_id = self._find("selectbox", lambda w, _: key in w)
+            self.values[widget_id] = rng.choice(list(self.widgets[widget_id][1].options))
+            await self.rerun(action)
+        else:
+            # Turn live mode on or off; while it is on, fragment reruns stand in for the live ticks
+            widget_id = self._find("checkbox", lambda w, _: w.endswith("-live_mode"))
+            self.values[widget_id] = not self.values[widget_id]
+            await self.rerun(action)
+            if self.fragment_id:
+                for _ in range(rng.randint(1, 3)):
+                    await self.rerun("live_tick", fragment_id=self.fragment_id)
+
+    async def run(self, actions: int, think: float):
+        await self.connect()
+        try:
+            await self.rerun("first_load")
+            for _ in range(actions):
+                if think:
+                    await asyncio.sleep(self.rng.uniform(0, 2 * think))
+                await self.act(self.rng.choice(ACTIONS))
+        finally:
+            self.ws.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_healthy(port: int, server: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not become healthy within {timeout:.0f}s")
+
+
+def run_level(sessions: int, args) -> Dict[str, Any]:
+    """One fresh server, `sessions` concurrent sessions against it"""
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_test", "--serve", str(port),
+         "--replay-dir", args.replay_dir, "--latency", str(args.latency)],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_healthy(port, server)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        symbols = sorted(name[:-len(".info.json")] for name in os.listdir(args.replay_dir)
+                         if name.endswith(".info.json"))
+        clients = [Session(url, args.seed + i, symbols) for i in range(sessions)]
+
+        async def drive():
+            await asyncio.gather(*(client.run(args.actions, args.think) for client in clients))
+
+        started = time.perf_counter()
+        asyncio.run(drive())
+        wall = time.perf_counter() - started
+        rss = peak_rss_bytes(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    timings = [t for client in clients for t in client.timings]
+    by_kind: Dict[str, List[float]] = {}
+    for client in clients:
+        for kind, seconds in zip(client.kinds, client.timings):
+            by_kind.setdefault(kind, []).append(seconds)
+    return {
+        "sessions": sessions,
+        "reruns": len(timings),
+        "wall_seconds": wall,
+        "reruns_per_second": len(timings) / wall,
+        "latency": {**{f"p{q}": percentile(timings, q) for q in PERCENTILES}, "max": max(timings)},
+        "median_by_action": {kind: statistics.median(values) for kind, values in sorted(by_kind.items())},
+        "exceptions": sum(client.exceptions for client in clients),
+        "peak_rss_bytes": rss,
+    }
+
+
+def print_level(level: Dict[str, Any]):
+    latency = level["latency"]
+    rss = level["peak_rss_bytes"]
+    print(
+        f"{level['sessions']:>4} sessions  {level['reruns']:>5} reruns  "
+        f"p50 {latency['p50'] * 1000:8.1f} ms  p95 {latency['p95'] * 1000:8.1f} ms  "
+        f"p99 {latency['p99'] * 1000:8.1f} ms  {level['reruns_per_second']:7.1f} reruns/s  "
+        + (f"peak RSS {rss / 2 ** 20:7.1f} MiB" if rss else "peak RSS n/a"),
+        flush=True,
+    )
+    if level["exceptions"]:
+        print(f"      {level['exceptions']} reruns raised an exception", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TickerTrek concurrent-session load test")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="session counts to test")
+    parser.add_argument("--actions", type=int, default=20, help="interactions per session after the first load")
+    parser.add_argument("--think", type=float, default=0.2, help="mean seconds a user waits between interactions")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds added to every provider call")
+    parser.add_argument("--replay-dir", help="recorded universe to replay (default: a synthetic one)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown ratio before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)  # internal: run the server on this port
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.replay_dir, args.latency)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="tickertrek-load-") as tmp:
+        if not args.replay_dir:
+            from config import POPULAR_STOCKS
+            args.replay_dir = os.path.join(tmp, "universe")
+            write_universe(args.replay_dir, list(POPULAR_STOCKS.values()) + EXTRA_SYMBOLS)
+        levels = []
+        for sessions in args.sessions:
+            level = run_level(sessions, args)
+            print_level(level)
+            levels.append(level)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for level in levels:
+        for name in ["p50", "p95", "p99"]:
+            results.setdefault(f"load.rerun_{name}", {})[f"{level['sessions']} sessions"] = level["latency"][name]
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "actions": args.actions,
+            "think": args.think,
+            "latency": args.latency,
+            "seed": args.seed,
+        },
+        "levels": levels,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance}x:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.tolerance}x baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Benchmark suite for the ETL, analytics, table and chart paths
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks                     # compare with baseline.json
+    python -m benchmarks.run_benchmarks --update-baseline   # record a new baseline
+    python -m benchmarks.run_benchmarks --sizes 1000 100000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import generate_ohlcv
+from data_etl import StockData, StockDataManage
+from data_table import compute_statistics
+from analytics import calculate_volatility, calculate_sharpe_ratio, calculate_max_drawdown
+from utils import calculate_ma, calculate_rsi, calculate_bollinger_bands, calculate_support_resistance
+from visualization import plot_candlestick
+from resample import resample_ohlcv
+from overlays import anchored_vwap, volume_profile
+from columnar_store import ColumnarStore
+from risk import clear_risk_memo
+from config import TECHNICAL_INDICATORS
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BENCH_SYMBOL = "BENCH"
+BENCH_PERIOD = "max"
+# Differences below this many seconds are treated as noise, whatever the ratio
+NOISE_FLOOR = 0.002
+
+
+def build_cases(stock_data: StockData) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable over the given data"""
+    close = stock_data.data['Close']
+    returns = close.pct_change().dropna()
+    manager = StockDataManage()
+    ti = TECHNICAL_INDICATORS
+    store = ColumnarStore()
+    store.put(BENCH_SYMBOL, stock_data.data)
+
+    return {
+        "etl.get_price_change": stock_data.get_price_change,
+        # Cleared first, otherwise every repeat after the first only times a memo hit
+        "etl.get_returns_analysis": lambda: (clear_risk_memo(), stock_data.get_returns_analysis()),
+        "etl.get_candlestick_data": lambda: manager.get_candlestick_data(BENCH_SYMBOL, BENCH_PERIOD),
+        "table.compute_statistics": lambda: compute_statistics(stock_data),
+        "table.calculate_volatility": lambda: calculate_volatility(close),
+        "table.calculate_sharpe_ratio": lambda: calculate_sharpe_ratio(returns),
+        "table.calculate_max_drawdown": lambda: calculate_max_drawdown(close),
+        "utils.calculate_ma": lambda: calculate_ma(close, ti["MA_LONG"]),
+        "utils.calculate_rsi": lambda: calculate_rsi(close, ti["RSI_PERIOD"]),
+        "utils.calculate_bollinger_bands": lambda: calculate_bollinger_bands(
+            close, ti["BOLLINGER_PERIOD"], ti["BOLLINGER_STD"]),
+        "utils.calculate_support_resistance": lambda: calculate_support_resistance(close),
+        "resample.resample_ohlcv_1d": lambda: resample_ohlcv(stock_data.data, "1d"),
+        "resample.resample_ohlcv_1mo": lambda: resample_ohlcv(stock_data.data, "1mo"),
+        "chart.plot_candlestick": lambda: plot_candlestick(BENCH_SYMBOL, BENCH_PERIOD, "1d"),
+        "chart.anchored_vwap": lambda: anchored_vwap(stock_data.data),
+        "chart.volume_profile": lambda: volume_profile(stock_data.data, 40),
+        "store.put": lambda: ColumnarStore().put(BENCH_SYMBOL, stock_data.data),
+        "store.get": lambda: store.get(BENCH_SYMBOL),
+        "store.arrays_tail_252": lambda: store.arrays(BENCH_SYMBOL, ["Close"], start=stock_data.data.index[-252]),
+    }
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: List[int], repeat: int, only: List[str] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        frame = generate_ohlcv(size)
+        stock_data = StockData(BENCH_SYMBOL, frame, info={}, current_price=float(frame['Close'].iloc[-1]))
+        StockDataManage.prime_cache(stock_data, BENCH_PERIOD)
+
+        for name, func in build_cases(stock_data).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            seconds = time_call(func, repeat)
+            results.setdefault(name, {})[str(size)] = seconds
+            print(f"{name:<36} {size:>9,} rows  {seconds * 1000:10.2f} ms", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Human-readable regressions: cases slower than tolerance x baseline"""
+    regressions = []
+    for name, by_size in results.items():
+        for size, seconds in by_size.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+            if seconds > reference * tolerance and seconds - reference > NOISE_FLOOR:
+                where = f"{int(size):,} rows" if size.isdigit() else size
+                regressions.append(
+                    f"{name} @ {where}: {seconds * 1000:.2f} ms vs "
+                    f"baseline {reference * 1000:.2f} ms ({seconds / reference:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TickerTrek benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="row counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best is kept")
+    parser.add_argument("--only", nargs="+", help="only run cases whose name contains one of these")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown ratio before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": run(args.sizes, args.repeat, args.only),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(report["results"], baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance}x baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions over {args.tolerance}x baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
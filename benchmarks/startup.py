@@ -0,0 +1,123 @@
+"""
+Start-up benchmark: import time of the app and of each module it pulls in
+
+Every run imports the module in a fresh interpreter with `python -X importtime`,
+so the numbers are what a newly spawned worker pays before serving its first page.
+Run from the repository root:
+    python -m benchmarks.startup                     # compare with startup_baseline.json
+    python -m benchmarks.startup --update-baseline   # record a new baseline
+    python -m benchmarks.startup --module batch --top 15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.run_benchmarks import compare
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Third-party packages reported on their own, next to the app's modules
+TRACKED_PACKAGES = ["streamlit", "pandas", "numpy", "pyarrow", "yfinance", "plotly"]
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """(wall seconds, {module: cumulative import seconds}) for one cold import of `module`"""
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+
+    cumulative: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        # importtime reports a module once, where it is first imported
+        cumulative.setdefault(name, int(cumulative_us) / 1e6)
+    return wall, cumulative
+
+
+def first_party_modules() -> List[str]:
+    return sorted(name[:-3] for name in os.listdir(REPO_ROOT) if name.endswith(".py"))
+
+
+def run(module: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Median over `repeat` cold starts, keyed like the main benchmark results"""
+    walls, samples = [], {}
+    for _ in range(repeat):
+        wall, cumulative = import_profile(module)
+        walls.append(wall)
+        for name, seconds in cumulative.items():
+            samples.setdefault(name, []).append(seconds)
+
+    tracked = set(first_party_modules()) | set(TRACKED_PACKAGES)
+    results = {"startup.process_wall": {module: statistics.median(walls)}}
+    for name, values in samples.items():
+        if name in tracked and len(values) == repeat:
+            results[f"import.{name}"] = {module: statistics.median(values)}
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TickerTrek start-up benchmark")
+    parser.add_argument("--module", default="trek_app", help="module to import, as a fresh worker would")
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts, the median is kept")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown ratio before failing")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args(argv)
+
+    results = run(args.module, args.repeat)
+    ranked = sorted(results.items(), key=lambda item: item[1][args.module], reverse=True)
+    for name, by_module in ranked[:args.top + 1]:
+        print(f"{name:<36} {by_module[args.module] * 1000:10.1f} ms", flush=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.tolerance}x baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions over {args.tolerance}x baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
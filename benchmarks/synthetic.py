@@ -0,0 +1,66 @@
+"""
+Synthetic OHLCV generator for benchmarks
+Geometric Brownian motion bars with missing sessions (gaps) and stock splits,
+shaped like the frames yfinance's Ticker.history returns
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def generate_ohlcv(n_rows: int, seed: int = 42, start: str = "1990-01-01", freq: str = "h",
+                   start_price: float = 100.0, mu: float = 0.08, sigma: float = 0.25,
+                   gap_prob: float = 0.02, split_every: int = 50_000) -> pd.DataFrame:
+    """
+    Generate `n_rows` OHLCV bars
+
+    Args:
+        n_rows: number of bars returned (after gaps are removed)
+        seed: RNG seed, the same seed always yields the same frame
+        start, freq: timestamp grid the bars are drawn from
+        mu, sigma: annualised GBM drift and volatility
+        gap_prob: probability that a slot on the grid has no bar
+        split_every: average bars between 2:1 stock splits (0 disables splits)
+    """
+    rng = np.random.default_rng(seed)
+
+    # Draw enough grid slots that n_rows survive the gaps
+    slots = int(n_rows / (1 - gap_prob)) + 16
+    keep = rng.random(slots) >= gap_prob
+    index = pd.date_range(start=start, periods=slots, freq=freq, tz="America/New_York")[keep][:n_rows]
+    n = len(index)
+
+    dt = 1 / 252
+    log_returns = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n)
+    close = start_price * np.exp(np.cumsum(log_returns))
+
+    splits = np.zeros(n)
+    if split_every:
+        split_idx = np.flatnonzero(rng.random(n) < 1 / split_every)
+        splits[split_idx] = 2.0
+        # Raw (unadjusted) prices halve on each split day
+        factor = np.cumprod(1 / np.where(splits > 0, splits, 1.0))
+        close = close * factor
+
+    open_ = np.empty(n)
+    open_[0] = start_price
+    open_[1:] = close[:-1] * (1 + 0.002 * rng.standard_normal(n - 1))
+    spread = np.abs(rng.normal(0, 0.004, n))
+    high = np.maximum(open_, close) * (1 + spread)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(mean=13, sigma=0.5, size=n).astype(np.int64)
+
+    dividends = np.zeros(n)
+    dividends[rng.random(n) < 1 / 2000] = 0.25
+
+    frame = pd.DataFrame({
+        "Open": open_,
+        "High": high,
+        "Low": low,
+        "Close": close,
+        "Volume": volume,
+        "Dividends": dividends,
+        "Stock Splits": splits,
+    }, index=index)
+    frame.index.name = "Date"
+    return frame
@@ -0,0 +1,270 @@
+"""
+Process-wide stale-while-revalidate cache
+Serves expired entries immediately while a background thread refreshes them
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Lookup outcomes returned alongside every value
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+class CacheEntry:
+    """A cached value, the time it was fetched, how long it stays fresh and how often it was read"""
+
+    def __init__(self, value: Any, fetched_at: float, nbytes: int = 0, ttl: Optional[float] = None):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.nbytes = nbytes
+        self.ttl = ttl
+        self.hits = 0  # reads served from this entry (fresh or stale); approximate under contention
+        self.last_access = fetched_at
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.fetched_at
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        """Seconds until the entry stops being fresh (negative once expired)"""
+        return self.ttl - self.age(now)
+
+
+class SWRCache:
+    """
+    Cache with a freshness TTL and a hard staleness bound
+
+    - age < ttl:              served as a hit
+    - ttl <= age < max_stale: served immediately as stale, refreshed in the background
+    - age >= max_stale:       treated as a miss, the caller blocks on a fetch
+
+    Concurrent misses for the same key share a single fetch. `ttl_for(key, value,
+    fetched_at)` can give each entry its own TTL; the stale window after it stays
+    max_stale - ttl long.
+
+    Beyond `max_entries` entries or `max_bytes` (as measured by `sizeof`) the
+    least recently read entries are evicted. A failed load (an exception, or a
+    value rejected by `cacheable`) is remembered for `failure_ttl` seconds and
+    returned or re-raised without calling the loader again.
+    """
+
+    def __init__(self, ttl: float, max_stale: float, refresh_workers: int = 4,
+                 sizeof: Optional[Callable[[Any], int]] = None,
+                 ttl_for: Optional[Callable[[Hashable, Any, float], float]] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 failure_ttl: float = 0.0):
+        self.ttl = ttl
+        self.max_stale = max(ttl, max_stale)
+        self.sizeof = sizeof
+        self.ttl_for = ttl_for
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.failure_ttl = failure_ttl
+        self.evictions = 0
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        # key -> (expires at, value or exception) of recent failed loads
+        self._failures: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # key -> (lock, callers using it); only keys with a load in progress or waiting
+        self._key_locks: Dict[Hashable, Tuple[threading.Lock, int]] = {}
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="swr-refresh")
+
+    @contextmanager
+    def _key_lock(self, key: Hashable) -> Iterator[None]:
+        """Hold key's load lock; it is dropped once no caller uses it, so locks never outlive their loads"""
+        with self._lock:
+            lock, users = self._key_locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._key_locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                users = self._key_locks[key][1] - 1
+                if users:
+                    self._key_locks[key] = (lock, users)
+                else:
+                    del self._key_locks[key]
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: Hashable, value: Any, fetched_at: Optional[float] = None):
+        nbytes = self.sizeof(value) if self.sizeof else 0
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        ttl = self.ttl_for(key, value, fetched_at) if self.ttl_for else self.ttl
+        entry = CacheEntry(value, fetched_at, nbytes, ttl)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                # A refresh replaces the value, not the entry's access history
+                entry.hits, entry.last_access = previous.hits, previous.last_access
+            self._entries[key] = entry
+            self._failures.pop(key, None)
+            self._evict(keep=key)
+
+    def _evict(self, keep: Hashable):
+        """Drop least recently read entries (never `keep`) until within the bounds; holds the lock"""
+        total = sum(entry.nbytes for entry in self._entries.values())
+        while len(self._entries) > 1 and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and total > self.max_bytes)):
+            victim = min((k for k in self._entries if k != keep), key=lambda k: self._entries[k].last_access)
+            total -= self._entries.pop(victim).nbytes
+            self.evictions += 1
+
+    def _failure(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            failure = self._failures.get(key)
+            if failure is not None and failure[0] <= time.time():
+                del self._failures[key]
+                return None
+            return failure
+
+    def _remember_failure(self, key: Hashable, outcome: Any):
+        if self.failure_ttl > 0:
+            now = time.time()
+            with self._lock:
+                for expired in [k for k, (expires, _) in self._failures.items() if expires <= now]:
+                    del self._failures[expired]
+                self._failures[key] = (now + self.failure_ttl, outcome)
+
+    def get(self, key: Hashable, loader: Callable[[], Any],
+            cacheable: Callable[[Any], bool] = lambda value: True) -> Tuple[Any, str]:
+        """
+        Return (value, status) for key, loading it with `loader` when needed
+
+        Values rejected by `cacheable` are returned to the caller but not stored,
+        so a failed fetch never replaces (or masks) good data.
+        """
+        entry = self.peek(key)
+        if entry is not None:
+            now = time.time()
+            age = entry.age(now)
+            if age < entry.ttl + self.max_stale - self.ttl:
+                entry.hits += 1
+                entry.last_access = now
+                if age < entry.ttl:
+                    return entry.value, HIT
+                self._schedule_refresh(key, loader, cacheable)
+                return entry.value, STALE
+
+        with self._key_lock(key):
+            # Another caller may have filled the entry while we waited
+            entry = self.peek(key)
+            if entry is not None and entry.age() < entry.ttl:
+                entry.hits += 1
+                entry.last_access = time.time()
+                return entry.value, HIT
+            return self._load(key, loader, cacheable), MISS
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], cacheable: Callable[[Any], bool]) -> Any:
+        """Call loader and store or remember its outcome, unless a recent failure answers it; under key's lock"""
+        failure = self._failure(key)
+        if failure is not None:
+            if isinstance(failure[1], Exception):
+                # Without the stored traceback, which would grow with every re-raise
+                raise failure[1].with_traceback(None)
+            return failure[1]
+        try:
+            value = loader()
+        except Exception as e:
+            self._remember_failure(key, e)
+            raise
+        if cacheable(value):
+            self.put(key, value)
+        else:
+            self._remember_failure(key, value)
+        return value
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Any], cacheable: Callable[[Any], bool]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, loader, cacheable)
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any],
+                cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Load key now, whatever the age of its entry, and store the result if cacheable
+
+        Like get(), a failure remembered within failure_ttl is answered without
+        calling the loader, and a new one is remembered.
+        """
+        with self._key_lock(key):
+            return self._load(key, loader, cacheable)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], cacheable: Callable[[Any], bool]):
+        try:
+            self.refresh(key, loader, cacheable)
+        except Exception:
+            # Keep serving the stale entry; stale reads retry once the failure_ttl has passed
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def items(self) -> List[Tuple[Hashable, CacheEntry]]:
+        """Snapshot of (key, entry) pairs currently held"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def stats(self) -> Dict[str, int]:
+        """Number of entries, the bytes they hold (as measured by `sizeof`) and evictions so far"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "evictions": self.evictions,
+            }
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop key (and any remembered failure); returns whether it was cached"""
+        with self._lock:
+            self._failures.pop(key, None)
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failures.clear()
+
+
+class LRUMemo:
+    """
+    Bounded memo for values derived from cached data (indicators, overlays)
+
+    Keys must identify the data version they were computed from, e.g. include
+    its fetched_at, so a refetch simply computes under a new key.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,336 @@
+"""
+Columnar store module
+Compressed in-memory bar history: prices as scaled integers, every column
+delta-encoded in fixed-size chunks and each chunk zlib-compressed, so a
+whole universe of daily history stays resident at a fraction of its pandas
+size and a symbol or date range decodes straight back into NumPy
+"""
+
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import COLUMNAR_STORE
+
+# Mostly-zero event columns, kept as (row, value) pairs instead of full columns
+SPARSE_COLUMNS = ("Dividends", "Stock Splits", "Capital Gains")
+INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+RECORDING_INTERVALS = ("1m", "1h", "1wk", "1mo")
+
+
+def _narrowest(values: np.ndarray):
+    low, high = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for dtype in INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def _column_decimals(values: np.ndarray, minimum: int, significant: int) -> int:
+    """
+    Decimals to store a price column with: at least `minimum`, and enough to
+    keep `significant` digits of its smallest non-zero value (sub-cent and
+    micro-priced tickers such as SHIB-USD would otherwise round to 0)
+    """
+    magnitudes = np.abs(values[np.isfinite(values) & (values != 0)])
+    if not len(magnitudes):
+        return minimum
+    return max(minimum, significant - 1 - int(np.floor(np.log10(magnitudes.min()))))
+
+
+class _Chunk:
+    """
+    One block of an integer column: its first value and the deltas after it,
+    narrowed to the smallest int type, byte-shuffled (all low bytes, then the
+    next byte plane...) and zlib-compressed
+    """
+
+    __slots__ = ("first", "dtype", "payload")
+
+    def __init__(self, values: np.ndarray, level: int):
+        self.first = int(values[0])
+        deltas = np.diff(values)
+        self.dtype = np.dtype(_narrowest(deltas))
+        planes = deltas.astype(self.dtype).view(np.uint8).reshape(-1, self.dtype.itemsize).T
+        self.payload = zlib.compress(planes.tobytes(), level)
+
+    def decode(self) -> np.ndarray:
+        planes = np.frombuffer(zlib.decompress(self.payload), dtype=np.uint8).reshape(self.dtype.itemsize, -1)
+        deltas = planes.T.copy().view(self.dtype).ravel()
+        values = np.empty(len(deltas) + 1, dtype=np.int64)
+        values[0] = self.first
+        np.cumsum(deltas, out=values[1:], dtype=np.int64)
+        values[1:] += self.first
+        return values
+
+
+class _FloatChunk:
+    """Fallback for values too large to scale into int64: the float64 bytes, shuffled and compressed"""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, values: np.ndarray, level: int):
+        self.payload = zlib.compress(values.view(np.uint8).reshape(-1, 8).T.tobytes(), level)
+
+    def decode(self) -> np.ndarray:
+        planes = np.frombuffer(zlib.decompress(self.payload), dtype=np.uint8).reshape(8, -1)
+        return planes.T.copy().view(np.float64).ravel()
+
+
+class _Column:
+    """A dense column as chunked, delta-encoded integers scaled by 10**decimals (NaN rows kept aside)"""
+
+    def __init__(self, values: np.ndarray, decimals: int, chunk_rows: int, level: int):
+        missing = np.isnan(values)
+        self.nan_rows = np.flatnonzero(missing).astype(np.int32)
+        if missing.any():
+            # Carry the previous value into the gaps so they add no deltas
+            filled = pd.Series(values).ffill().fillna(0.0).to_numpy()
+        else:
+            filled = values
+        scaled = filled * 10 ** decimals
+        if len(scaled) and np.abs(scaled).max() >= 2 ** 62:
+            self.decimals = None
+            self.chunks = [_FloatChunk(filled[start:start + chunk_rows], level)
+                           for start in range(0, len(filled), chunk_rows)]
+            return
+        self.decimals = decimals
+        scaled = np.round(scaled).astype(np.int64)
+        self.chunks = [_Chunk(scaled[start:start + chunk_rows], level)
+                       for start in range(0, len(scaled), chunk_rows)]
+
+    def decode(self, first_chunk: int, last_chunk: int, chunk_rows: int) -> np.ndarray:
+        decoded = np.concatenate([chunk.decode() for chunk in self.chunks[first_chunk:last_chunk + 1]])
+        if self.decimals is None:
+            values = decoded
+        else:
+            values = decoded / 10 ** self.decimals if self.decimals else decoded.astype(float)
+        offset = first_chunk * chunk_rows
+        rows = self.nan_rows[(self.nan_rows >= offset) & (self.nan_rows < offset + len(values))]
+        values[rows - offset] = np.nan
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(chunk.payload) + 16 for chunk in self.chunks) + self.nan_rows.nbytes
+
+
+class _Series:
+    """One symbol's bars: chunked timestamps and columns, plus sparse event columns"""
+
+    def __init__(self, frame: pd.DataFrame, decimals: int, significant: int, chunk_rows: int, level: int,
+                 version: Hashable):
+        self.version = version
+        self.length = len(frame)
+        self.chunk_rows = chunk_rows
+        index = pd.DatetimeIndex(frame.index)
+        self.tz = index.tz
+        self.index_name = index.name
+        # Epoch seconds (UTC for tz-aware bars): daily bars step by about 86400, so deltas stay narrow
+        seconds = index.asi8 // 10 ** 9
+        self.chunk_starts = seconds[::chunk_rows].copy()
+        self.times = _Column(seconds.astype(float), 0, chunk_rows, level)
+        self.columns: Dict[str, _Column] = {}
+        self.sparse: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.order = list(frame.columns)
+        self.int_columns = {name: dtype for name, dtype in frame.dtypes.items() if dtype.kind in "iu"}
+        self.reads = 0
+        self.last_read: Optional[float] = None
+        for name in frame.columns:
+            values = frame[name].to_numpy(dtype=float)
+            if name in SPARSE_COLUMNS:
+                rows = np.flatnonzero(np.nan_to_num(values) != 0).astype(np.int32)
+                self.sparse[name] = (rows, values[rows])
+            else:
+                column_decimals = 0 if name == "Volume" else _column_decimals(values, decimals, significant)
+                self.columns[name] = _Column(values, column_decimals, chunk_rows, level)
+        self.raw_nbytes = int(frame.memory_usage(deep=True).sum())
+
+    @property
+    def nbytes(self) -> int:
+        return (self.times.nbytes + self.chunk_starts.nbytes
+                + sum(column.nbytes for column in self.columns.values())
+                + sum(rows.nbytes + values.nbytes for rows, values in self.sparse.values()))
+
+    def _chunk_range(self, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> Tuple[int, int]:
+        first, last = 0, len(self.chunk_starts) - 1
+        if start is not None:
+            first = max(int(np.searchsorted(self.chunk_starts, self._seconds(start), side="right")) - 1, 0)
+        if end is not None:
+            last = max(int(np.searchsorted(self.chunk_starts, self._seconds(end), side="right")) - 1, first)
+        return first, last
+
+    def _seconds(self, timestamp) -> int:
+        timestamp = pd.Timestamp(timestamp)
+        if self.tz is None:
+            timestamp = timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+        elif timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(self.tz)
+        return timestamp.value // 10 ** 9
+
+    def decode(self, columns: Iterable[str], start=None, end=None,
+               tail: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Timestamps (epoch seconds) and the requested columns for rows between
+        start and end (inclusive), or for the last `tail` rows
+        """
+        self.reads += 1
+        self.last_read = time.time()
+        if tail is not None:
+            first, last = max(self.length - tail, 0) // self.chunk_rows, len(self.chunk_starts) - 1
+        else:
+            first, last = self._chunk_range(start, end)
+        seconds = self.times.decode(first, last, self.chunk_rows).astype(np.int64)
+        low = 0 if start is None else int(np.searchsorted(seconds, self._seconds(start), side="left"))
+        if tail is not None:
+            low = max(len(seconds) - tail, 0)
+        high = len(seconds) if end is None else int(np.searchsorted(seconds, self._seconds(end), side="right"))
+        high = max(high, low)
+        offset = first * self.chunk_rows
+        arrays = {}
+        for name in columns:
+            if name in self.columns:
+                arrays[name] = self.columns[name].decode(first, last, self.chunk_rows)[low:high]
+            elif name in self.sparse:
+                rows, values = self.sparse[name]
+                dense = np.zeros(high - low)
+                selected = (rows >= offset + low) & (rows < offset + high)
+                dense[rows[selected] - offset - low] = values[selected]
+                arrays[name] = dense
+        return seconds[low:high], arrays
+
+    def index(self, seconds: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(seconds * 10 ** 9, name=self.index_name)
+        return index.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else index
+
+
+class ColumnarStore:
+    """
+    Compressed bar history per symbol
+
+    Prices are kept to COLUMNAR_STORE["price_decimals"] decimals, or more for
+    columns whose values are too small to keep COLUMNAR_STORE["significant_digits"]
+    digits with them; volumes and timestamps are exact. Reads decode only the
+    chunks overlapping the requested date range.
+    """
+
+    def __init__(self, price_decimals: Optional[int] = None, chunk_rows: Optional[int] = None,
+                 compression_level: Optional[int] = None, significant_digits: Optional[int] = None):
+        self.price_decimals = COLUMNAR_STORE["price_decimals"] if price_decimals is None else price_decimals
+        self.significant_digits = (COLUMNAR_STORE["significant_digits"]
+                                   if significant_digits is None else significant_digits)
+        self.chunk_rows = chunk_rows or COLUMNAR_STORE["chunk_rows"]
+        self.compression_level = (COLUMNAR_STORE["compression_level"]
+                                  if compression_level is None else compression_level)
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._series
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return sorted(self._series)
+
+    def put(self, symbol: str, frame: pd.DataFrame, version: Hashable = None):
+        """Store (or replace) a symbol's bars; `version` is any tag, e.g. the source file's mtime"""
+        series = _Series(frame.sort_index(), self.price_decimals, self.significant_digits, self.chunk_rows,
+                         self.compression_level, version)
+        with self._lock:
+            self._series[symbol] = series
+
+    def version(self, symbol: str) -> Hashable:
+        series = self._series.get(symbol)
+        return series.version if series is not None else None
+
+    def drop(self, symbol: str) -> bool:
+        with self._lock:
+            return self._series.pop(symbol, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def arrays(self, symbol: str, columns: Optional[Iterable[str]] = None,
+               start=None, end=None, tail: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        (timestamps as datetime64[ns] in UTC for tz-aware bars, {column: float64 array})
+        for the rows from start to end (inclusive, either may be None) or the last `tail`;
+        KeyError when not stored
+        """
+        series = self._series[symbol]
+        seconds, arrays = series.decode(series.order if columns is None else columns, start, end, tail)
+        return (seconds * 10 ** 9).astype("datetime64[ns]"), arrays
+
+    def span(self, symbol: str) -> Tuple[int, Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """(rows, first timestamp, last timestamp) of a stored symbol, decoding only its last chunk"""
+        series = self._series[symbol]
+        if series.length == 0:
+            return 0, None, None
+        last = series.decode((), tail=1)[0]
+        index = series.index(np.r_[series.chunk_starts[:1], last])
+        return series.length, index[0], index[-1]
+
+    def get(self, symbol: str, columns: Optional[Iterable[str]] = None, start=None, end=None,
+            tail: Optional[int] = None) -> pd.DataFrame:
+        """The stored bars (from start to end, or the last `tail`) as a DataFrame with their original index"""
+        series = self._series[symbol]
+        seconds, arrays = series.decode(series.order if columns is None else columns, start, end, tail)
+        frame = pd.DataFrame(arrays, index=series.index(seconds))
+        # Integer columns (Volume) come back as they went in
+        return frame.astype({name: dtype for name, dtype in series.int_columns.items() if name in arrays})
+
+    def index(self, symbol: str) -> pd.DatetimeIndex:
+        """Timestamps of every stored bar (decodes the time column only)"""
+        series = self._series[symbol]
+        return series.index(series.decode((), None, None)[0])
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        """(symbol, {rows, bytes, raw_bytes, version, reads, last_read}) per stored symbol"""
+        with self._lock:
+            series = list(self._series.items())
+        return [(symbol, {"rows": item.length, "bytes": item.nbytes, "raw_bytes": item.raw_nbytes,
+                          "version": item.version, "reads": item.reads, "last_read": item.last_read})
+                for symbol, item in series]
+
+    def stats(self, symbol: Optional[str] = None) -> Dict[str, int]:
+        """Rows, compressed bytes and the bytes the same bars took as a pandas DataFrame"""
+        with self._lock:
+            series = [self._series[symbol]] if symbol is not None else list(self._series.values())
+        return {
+            "symbols": len(series),
+            "rows": sum(item.length for item in series),
+            "bytes": sum(item.nbytes for item in series),
+            "raw_bytes": sum(item.raw_nbytes for item in series),
+        }
+
+    def sync_directory(self, directory: str, suffix: str = ".parquet") -> bool:
+        """
+        Load every <SYMBOL><suffix> file of a directory that is new or changed
+        since it was stored (and drop symbols whose file is gone); returns whether
+        anything changed
+        """
+        found = {}
+        if directory and os.path.isdir(directory):
+            for entry in os.scandir(directory):
+                symbol = entry.name[:-len(suffix)]
+                # <SYMBOL>.parquet only, not the <SYMBOL>.1h.parquet / .1m.parquet recordings
+                if entry.name.endswith(suffix) and symbol.rsplit(".", 1)[-1] not in RECORDING_INTERVALS:
+                    found[symbol] = (entry.path, entry.stat().st_mtime_ns)
+        changed = False
+        for symbol, (path, mtime) in found.items():
+            if self.version(symbol) != mtime:
+                self.put(symbol, pd.read_parquet(path), version=mtime)
+                changed = True
+        for symbol in set(self.symbols()) - set(found):
+            changed = self.drop(symbol) or changed
+        return changed
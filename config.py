@@ -219,6 +219,19 @@ TECHNICAL_INDICATORS = {
     "CCI_PERIOD": 20
 }
 
+# Candlestick chart overlays (see overlays.py)
+#   default_overlays -> switched on for new sessions: "volume", "vwap", "profile"
+#   profile_bins     -> price bins of the volume profile
+#   volume_height    -> share of the chart height taken by the volume bars
+#   live_bars        -> trailing bars on the live chart (see live_chart.py); each
+#                       tick re-sends only this window, whatever the period loaded
+CHART_SETTINGS = {
+    "default_overlays": ["volume"],
+    "profile_bins": 40,
+    "volume_height": 0.2,
+    "live_bars": 60,
+}
+
 COLOR_SCHEMES = {
     "Default": {
         "primary": "#FF6B6B",
@@ -241,4 +254,249 @@ COLOR_SCHEMES = {
         "background": "#F8F9FA",
         "text": "#2C3E50"
     }
-}
\ No newline at end of file
+}
+
+# Upstream (Yahoo Finance) protection, per call type:
+#   rate/burst        -> token bucket shared by the whole process (calls/sec, max burst)
+#   max_wait          -> seconds a caller may wait for a token before giving up
+#   retries           -> extra attempts on transient errors, exponential full-jitter backoff
+#   failure_threshold -> consecutive failures that open the circuit breaker
+#   reset_timeout     -> seconds the circuit stays open before a half-open trial call
+UPSTREAM_SETTINGS = {
+    "history": {
+        "rate": 2.0, "burst": 5, "max_wait": 10.0,
+        "retries": 3, "backoff_base": 0.5, "backoff_max": 8.0,
+        "failure_threshold": 5, "reset_timeout": 60.0,
+    },
+    "info": {
+        "rate": 1.0, "burst": 3, "max_wait": 5.0,
+        "retries": 2, "backoff_base": 1.0, "backoff_max": 8.0,
+        "failure_threshold": 5, "reset_timeout": 120.0,
+    },
+    "quote": {
+        "rate": 5.0, "burst": 10, "max_wait": 2.0,
+        "retries": 1, "backoff_base": 0.25, "backoff_max": 2.0,
+        "failure_threshold": 10, "reset_timeout": 30.0,
+    },
+}
+
+# Trading sessions per exchange (see market_calendar.py)
+#   suffixes        -> ticker suffixes listed there; the exchange with "" takes unsuffixed tickers
+#   indices         -> unsuffixed index symbols ("^NSEI") listed there. RISK_SETTINGS benchmarks
+#                      are mapped to their exchange as well, so only other indices need listing
+#   timezone        -> exchange local time zone; open/close -> regular session, local time
+#   holidays        -> full-day closures (YYYY-MM-DD); extend from each exchange's yearly holiday list.
+#                      Years after the last listed one log a warning and keep the default cache TTL
+#   settle_minutes  -> after the close, data fetched earlier than this is still refreshed
+#                      normally so the day's final bar is picked up
+#   always_open     -> trades around the clock (crypto, FX, futures): always the default cache TTL
+# Suffixes are matched in order, so the round-the-clock markets come before the "" default.
+EXCHANGES = {
+    "24/7": {
+        "suffixes": ["-USD", "-USDT", "-EUR", "-GBP", "-BTC", "-ETH", "=X", "=F"],
+        "timezone": "UTC",
+        "open": "00:00", "close": "00:00",
+        "always_open": True,
+    },
+    "US": {
+        "suffixes": [""],
+        "timezone": "America/New_York",
+        "open": "09:30", "close": "16:00",
+        "holidays": [
+            "2025-01-01", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26", "2025-06-19",
+            "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25",
+            "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+            "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+            "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31", "2027-06-18",
+            "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+        ],
+        "settle_minutes": 20,
+    },
+    "NSE": {
+        "suffixes": [".NS"],
+        "indices": ["^NSEI", "^NSEBANK", "^CNXIT", "^NSMIDCP"],
+        "timezone": "Asia/Kolkata",
+        "open": "09:15", "close": "15:30",
+        "holidays": [
+            "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
+            "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22",
+            "2025-11-05", "2025-12-25",
+            "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03", "2026-04-14",
+            "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02", "2026-10-20",
+            "2026-11-10", "2026-11-24", "2026-12-25",
+        ],
+        "settle_minutes": 20,
+    },
+    "BSE": {
+        "suffixes": [".BO", ".BS"],
+        "indices": ["^BSESN", "^BSESMLCAP"],
+        "timezone": "Asia/Kolkata",
+        "open": "09:15", "close": "15:30",
+        "holidays": [
+            "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
+            "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22",
+            "2025-11-05", "2025-12-25",
+            "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03", "2026-04-14",
+            "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02", "2026-10-20",
+            "2026-11-10", "2026-11-24", "2026-12-25",
+        ],
+        "settle_minutes": 20,
+    },
+    "LSE": {
+        "suffixes": [".L"],
+        "indices": ["^FTSE", "^FTMC", "^FTAS"],
+        "timezone": "Europe/London",
+        "open": "08:00", "close": "16:30",
+        "holidays": [
+            "2025-01-01", "2025-04-18", "2025-04-21", "2025-05-05", "2025-05-26", "2025-08-25",
+            "2025-12-25", "2025-12-26",
+            "2026-01-01", "2026-04-03", "2026-04-06", "2026-05-04", "2026-05-25", "2026-08-31",
+            "2026-12-25", "2026-12-28",
+            "2027-01-01", "2027-03-26", "2027-03-29", "2027-05-03", "2027-05-31", "2027-08-30",
+            "2027-12-27", "2027-12-28",
+        ],
+        "settle_minutes": 20,
+    },
+}
+# Exchange used by get_trading_session_info() when no symbol is given
+DEFAULT_EXCHANGE = "NSE"
+
+# Risk analytics (see risk.py)
+#   benchmarks     -> index each exchange's symbols are measured against (beta, alpha, capture ratios);
+#                     the index history is fetched once per period and shared by every symbol
+#   confidence     -> confidence level of VaR and CVaR
+#   risk_free_rate -> annual rate used by the Sharpe and Sortino ratios and alpha
+RISK_SETTINGS = {
+    "benchmarks": {"US": "^GSPC", "NSE": "^NSEI", "BSE": "^BSESN", "LSE": "^FTSE"},
+    "confidence": 0.95,
+    "risk_free_rate": 0.02,
+}
+
+# Market data source (see providers.py and data_service.py)
+#   provider     -> "yahoo" (Yahoo Finance) or "replay" (recorded files in replay_dir, fully offline);
+#                   the TICKERTREK_PROVIDER environment variable overrides it
+#   replay_dir   -> <SYMBOL>.parquet daily bars, optional <SYMBOL>.1h.parquet and <SYMBOL>.info.json
+#   replay_latency -> seconds added to every replay call to mimic upstream round trips (load tests)
+#   service_url  -> fetch through a local data service (python data_service.py) instead of the
+#                   provider, sharing its caches between workers; None fetches in-process.
+#                   The TICKERTREK_DATA_SERVICE environment variable overrides it
+#   service_host/service_port -> where data_service.py listens by default
+#   client_ttl   -> seconds a worker reuses a service response before asking again; the
+#                   history is only re-sent once the service has refetched it (live: every call)
+DATA_SOURCE = {
+    "provider": "yahoo",
+    "replay_dir": "data/universe",
+    "replay_latency": 0.0,
+    "service_url": None,
+    "service_host": "127.0.0.1",
+    "service_port": 8765,
+    "client_ttl": 5,
+}
+
+# Stale-while-revalidate cache tiers (seconds):
+#   ttl       -> entries younger than this are fresh
+#   max_stale -> older entries are served immediately and refreshed in the
+#                background until they reach this age, then fetched blocking
+#   max_entries -> entries kept; beyond it (or max_bytes of price history) the
+#                  least recently read entries are evicted
+#   failure_ttl -> a failed fetch (e.g. an unknown symbol) is answered from
+#                  memory for this long instead of calling upstream again
+# These apply while the symbol's exchange is open. Data fetched after the close
+# (see EXCHANGES) stays fresh until the next open instead.
+CACHE_SETTINGS = {
+    "history": {"ttl": 300, "max_stale": 1800, "max_entries": 256, "max_bytes": 512 * 1024 ** 2,
+                "failure_ttl": 60},
+    "live": {"ttl": 10, "max_stale": 60, "max_entries": 512, "max_bytes": 64 * 1024 ** 2, "failure_ttl": 10},
+}
+
+# Polled live quotes kept per symbol (see live_buffer.py):
+#   capacity         -> quotes in each symbol's ring buffer (at the live ttl of
+#                       10 s, 2048 quotes cover about 5.5 hours)
+#   sparkline_points -> 1-minute closes drawn in the live sparkline
+LIVE_BUFFER = {
+    "capacity": 2048,
+    "sparkline_points": 120,
+}
+
+# Longest window kept per symbol and base interval (see resample.py); shorter
+# periods at the same interval are served as slices of it without a download.
+# Periods longer than these are fetched and cached on their own.
+PERIOD_SUPERSETS = {
+    "1h": "5d",
+    "1d": "2y",
+}
+
+# Company info store (see info_store.py)
+#   path          -> SQLite file holding the displayed info fields per symbol
+#   refresh_after -> seconds before a symbol's info is fetched again
+INFO_STORE = {
+    "path": "data/company_info.sqlite3",
+    "refresh_after": 24 * 3600,
+}
+
+# Background prefetch of the quick-select symbols (see prefetch.py)
+#   period         -> period kept warm (its PERIOD_SUPERSETS window is what gets cached)
+#   hot_list       -> symbols kept warm besides POPULAR_STOCKS; the TICKERTREK_HOT_LIST
+#                     environment variable (comma separated) adds more
+#   lead           -> refresh an entry this many seconds before its history TTL runs out
+#   check_interval -> seconds between scheduler passes
+#   workers        -> parallel fetches per pass (the upstream rate limits still apply)
+#   max_backoff    -> a symbol that keeps failing (e.g. delisted) is retried after
+#                     check_interval, then twice as long after each further failure, up to this
+PREFETCH_SETTINGS = {
+    "enabled": True,
+    "period": "1y",
+    "hot_list": [],
+    "lead": 60,
+    "check_interval": 30,
+    "workers": 4,
+    "max_backoff": 3600,
+}
+
+# Prometheus text-format metrics export (see telemetry.py)
+#   port -> serve http://host:port/metrics (None disables the endpoint)
+#   port_range -> ports tried from `port` up; each worker process on the host takes the
+#                 first free one, so scrape port .. port + port_range - 1
+#   file -> also rewrite this file every file_interval seconds (None disables); with several
+#           workers include "{pid}" in the name so each process writes its own file
+METRICS_EXPORT = {
+    "enabled": True,
+    "host": "127.0.0.1",
+    "port": 9464,
+    "port_range": 16,
+    "file": None,
+    "file_interval": 15,
+}
+
+# Compressed in-memory bar history (see columnar_store.py), used for the
+# screener universe and replayed daily recordings
+#   price_decimals     -> prices are stored as integers of at least this many decimals
+#   significant_digits -> more decimals are used for a column whose smallest price
+#                         would keep fewer significant digits (sub-cent tickers)
+#   chunk_rows         -> bars per compressed chunk; date-range reads decode only
+#                         the chunks they overlap
+#   compression_level  -> zlib level of each chunk
+COLUMNAR_STORE = {
+    "price_decimals": 4,
+    "significant_digits": 6,
+    "chunk_rows": 512,
+    "compression_level": 6,
+}
+
+# Refresh of expired daily history (see corporate_actions.py)
+#   incremental   -> fetch only recent_period and merge it into the cached or
+#                    snapshotted bars; splits and dividends found in it back-adjust
+#                    the older bars once. False refetches the whole period.
+#   recent_period -> window fetched on refresh; history older than it is kept
+CORPORATE_ACTIONS = {
+    "incremental": True,
+    "recent_period": "1mo",
+}
+
+# Stock screener (see screener.py)
+#   universe_dir -> per-symbol <SYMBOL>.parquet daily history, filled by `python batch.py snapshot`
+#   max_results  -> rows shown on the screener page
+SCREENER_SETTINGS = {
+    "universe_dir": "data/universe",
+    "max_results": 100,
+}
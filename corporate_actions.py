@@ -0,0 +1,192 @@
+"""
+Corporate actions module
+Splits and dividends per symbol (from the Dividends / Stock Splits columns of
+the history) and the back-adjustment they imply for earlier bars. New actions
+are applied to stored bars in place, each exactly once, so a split or ex-dividend
+day extends stored history with recent bars instead of re-downloading it;
+the raw (as traded) prices stay recoverable from the same ledger.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Adj Close")
+ACTION_COLUMNS = {"Dividends": "dividend", "Stock Splits": "split"}
+
+
+class Action(NamedTuple):
+    date: pd.Timestamp
+    kind: str  # "dividend" (cash per share, as reported) or "split" (new shares per old share)
+    value: float
+
+
+def extract_actions(frame: pd.DataFrame) -> List[Action]:
+    """Every non-zero dividend and split in a history frame, oldest first"""
+    actions = []
+    for column, kind in ACTION_COLUMNS.items():
+        if column not in frame.columns:
+            continue
+        values = frame[column].to_numpy(dtype=float)
+        for row in np.flatnonzero(np.nan_to_num(values) != 0):
+            actions.append(Action(frame.index[row], kind, float(values[row])))
+    return sorted(actions)
+
+
+def _key(action: Action) -> Tuple:
+    # Not the value: reported dividends are restated after a later split
+    return pd.Timestamp(action.date).value, action.kind
+
+
+class ActionLedger:
+    """
+    The actions already reflected in one symbol's stored bars, with the price
+    and volume factors each one multiplied into the bars before its date
+
+    Adjustment follows Yahoo's convention: a split of r divides earlier prices by
+    r and multiplies earlier volumes by r; a dividend D multiplies earlier prices
+    by 1 - D / (close before the ex-date).
+    """
+
+    def __init__(self, entries: Optional[Dict[Tuple, Tuple[Action, float, float]]] = None):
+        self._entries: Dict[Tuple, Tuple[Action, float, float]] = dict(entries or {})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, action: Action) -> bool:
+        return _key(action) in self._entries
+
+    def copy(self) -> "ActionLedger":
+        return ActionLedger(self._entries)
+
+    def actions(self) -> List[Tuple[Action, float, float]]:
+        """(action, price_factor, volume_factor) oldest first"""
+        return sorted(self._entries.values())
+
+    def _dividend_factors_after(self, timestamp: pd.Timestamp, pending: Dict) -> float:
+        # Reported dividends are split-adjusted, so only later dividends separate them from the stored close
+        product = 1.0
+        for action, price_factor, _ in list(self._entries.values()) + list(pending.values()):
+            if action.kind == "dividend" and action.date > timestamp:
+                product *= price_factor
+        return product
+
+    def _factors(self, action: Action, frame: pd.DataFrame, position: int, adjusted_before: bool,
+                 pending: Dict) -> Tuple[float, float]:
+        if action.kind == "split":
+            return 1.0 / action.value, action.value
+        if position == 0 or "Close" not in frame.columns:
+            return 1.0, 1.0
+        close = float(frame["Close"].iloc[position - 1])
+        # Fresh bars carry every action after them; stored bars only those already recorded
+        later = self._dividend_factors_after(frame.index[position - 1], pending if adjusted_before else {})
+        if not close > 0:
+            return 1.0, 1.0
+        if adjusted_before:
+            # The close already carries this dividend's factor f: close = raw * later * f
+            return close / (close + action.value * later), 1.0
+        return 1.0 - action.value * later / close, 1.0
+
+    def apply(self, frame: pd.DataFrame, actions: Iterable[Action], boundary: Optional[int] = None) -> List[Action]:
+        """
+        Back-adjust `frame` in place for the actions not yet in the ledger and record them
+
+        Only rows before `boundary` (default: all rows) are adjusted: rows from
+        `boundary` on are taken to be adjusted already, as freshly fetched bars are.
+        Actions dated before `boundary` are therefore recorded without adjusting.
+        Returns the actions that were new.
+        """
+        boundary = len(frame) if boundary is None else boundary
+        pending: Dict[Tuple, Tuple[Action, float, float]] = {}
+        price_steps = np.ones(len(frame) + 1)
+        volume_steps = np.ones(len(frame) + 1)
+        # Newest first, so each dividend's factor sees the later actions' adjustments
+        for action in sorted(set(actions), reverse=True):
+            key = _key(action)
+            if key in self._entries or key in pending:
+                continue
+            position = int(frame.index.searchsorted(action.date, side="left"))
+            price_factor, volume_factor = self._factors(
+                action, frame, position, adjusted_before=position - 1 >= boundary, pending=pending)
+            pending[key] = (action, price_factor, volume_factor)
+            if boundary > 0 and position >= boundary:
+                # Every stored row precedes the action
+                price_steps[boundary] *= price_factor
+                volume_steps[boundary] *= volume_factor
+        if (price_steps != 1).any() or (volume_steps != 1).any():
+            # Row i takes the product of the steps after it
+            price_cumulative = np.cumprod(price_steps[::-1])[::-1][1:]
+            volume_cumulative = np.cumprod(volume_steps[::-1])[::-1][1:]
+            for column in PRICE_COLUMNS:
+                if column in frame.columns:
+                    frame[column] = frame[column].to_numpy(dtype=float) * price_cumulative
+            if "Volume" in frame.columns:
+                frame["Volume"] = np.round(frame["Volume"].to_numpy(dtype=float) * volume_cumulative).astype(
+                    frame["Volume"].dtype)
+        self._entries.update(pending)
+        return [action for action, _, _ in pending.values()]
+
+    def raw(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Copy of adjusted bars with every recorded action's adjustment undone (prices as traded)"""
+        raw = frame.copy()
+        if not self._entries or raw.empty:
+            return raw
+        price_steps = np.ones(len(raw) + 1)
+        volume_steps = np.ones(len(raw) + 1)
+        for action, price_factor, volume_factor in self._entries.values():
+            position = int(raw.index.searchsorted(action.date, side="left"))
+            price_steps[position] *= price_factor
+            volume_steps[position] *= volume_factor
+        price_cumulative = np.cumprod(price_steps[::-1])[::-1][1:]
+        volume_cumulative = np.cumprod(volume_steps[::-1])[::-1][1:]
+        for column in PRICE_COLUMNS:
+            if column in raw.columns:
+                raw[column] = raw[column].to_numpy(dtype=float) / price_cumulative
+        if "Volume" in raw.columns:
+            raw["Volume"] = np.round(raw["Volume"].to_numpy(dtype=float) / volume_cumulative).astype(raw["Volume"].dtype)
+        return raw
+
+    def merge(self, stored: pd.DataFrame, recent: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Stored bars extended with freshly fetched (already adjusted) recent bars
+
+        Recent bars replace stored ones from the first recent date on; actions
+        found in them adjust the older stored bars once. Returns None when the
+        recent bars do not reach back to the stored ones (a gap needs a full fetch).
+        """
+        if stored.empty:
+            return None
+        if recent.empty:
+            return stored
+        if recent.index[0] > stored.index[-1]:
+            return None
+        older = stored[stored.index < recent.index[0]]
+        columns = list(dict.fromkeys(list(older.columns) + list(recent.columns)))
+        merged = pd.concat([older.reindex(columns=columns), recent.reindex(columns=columns)])
+        for column in ACTION_COLUMNS:
+            if column in merged.columns:
+                merged[column] = merged[column].fillna(0.0)
+        self.apply(merged, extract_actions(recent), boundary=len(older))
+        return merged
+
+    @classmethod
+    def from_history(cls, frame: pd.DataFrame) -> "ActionLedger":
+        """Ledger of a freshly fetched (already adjusted) history: its actions, recorded as applied"""
+        ledger = cls()
+        ledger.apply(frame, extract_actions(frame), boundary=0)
+        return ledger
+
+    def to_records(self) -> List[Dict]:
+        return [{"date": action.date.isoformat(), "kind": action.kind, "value": action.value,
+                 "price_factor": price_factor, "volume_factor": volume_factor}
+                for action, price_factor, volume_factor in self.actions()]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "ActionLedger":
+        entries = {}
+        for record in records:
+            action = Action(pd.Timestamp(record["date"]), record["kind"], float(record["value"]))
+            entries[_key(action)] = (action, float(record["price_factor"]), float(record["volume_factor"]))
+        return cls(entries)
@@ -1,8 +1,32 @@
-import yfinance as yf
+"""
+Data layer: fetching, caching and per-symbol analytics
+Free of Streamlit so it can run in worker processes, batch jobs and cron
+"""
+
+import copy
+import logging
+import time
 import pandas as pd
-import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 from dataclasses import dataclass
+from cache import SWRCache, HIT, MISS, STALE
+from config import CACHE_SETTINGS, CORPORATE_ACTIONS, DATA_SOURCE
+from corporate_actions import ActionLedger
+from resample import (base_interval, default_interval, resampled, clear_resampled, superset_period, window_start,
+                      resample_ohlcv)
+from upstream import call_upstream, UpstreamUnavailable
+from telemetry import counter, register_collector
+from info_store import company_info
+from market_calendar import cache_ttl
+from providers import get_provider
+from service_client import service_url, fetch_stock, fetch_minute_bars
+from overlays import clear_overlays
+from risk import benchmark_symbol, returns_analysis, risk_analysis, clear_risk_memo
+from live_buffer import record_quote, live_candles
+
+logger = logging.getLogger(__name__)
+
+
 @dataclass()
 class StockData:
     """Data to hold stock information"""
@@ -12,6 +36,37 @@ class StockData:
         self.data = data
         self.info = info
         self.current_price = current_price
+        self.fetched_at = time.time()
+        self.is_stale = False
+        self.error = None #user-facing message when the fetch failed
+        self.error_level = "error" #"error" or "warning"
+        self.actions = ActionLedger() #splits/dividends already back-adjusted into `data`
+        self.previous_close = None #close of the session before the latest one, when `data` starts after it
+
+    @property
+    def age(self) -> float:
+        """Seconds since this data was fetched from the provider"""
+        return time.time() - self.fetched_at
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the price history"""
+        if self.data is None:
+            return 0
+        return int(self.data.memory_usage(deep=True).sum())
+
+    def window(self, period: str) -> "StockData":
+        """The trailing `period` of this data, sharing its price history (a row slice, not a copy)"""
+        start = window_start(self.data.index, period)
+        if start == 0:
+            return self
+        sliced = copy.copy(self)
+        sliced.previous_close = _previous_session_close(self.data)
+        sliced.data = self.data.iloc[start:]
+        return sliced
+
+    def raw_view(self) -> pd.DataFrame:
+        """Price history as traded, with the recorded split and dividend adjustments undone"""
+        return self.actions.raw(self.data)
 
     def is_valid(self) -> bool :
         return(
@@ -20,12 +75,22 @@ class StockData:
         )
 
 
+    def daily_bars(self) -> pd.DataFrame:
+        """The history at daily resolution: intraday (1h) bars are aggregated per session"""
+        if self.data is None or self.data.empty or not _session_days(self.data.index).has_duplicates:
+            return self.data
+        return resample_ohlcv(self.data, "1d")
+
     def get_price_change(self)-> Dict[str,float]:
-        """Calculate price and % change"""
-        if len(self.data) < 2:
+        """Price and % change against the previous session's close (the previous bar's for daily bars)"""
+        if self.data is None or self.data.empty:
+            return {'Price Change':0.0,'Change %':0.0}
+        prev_close = _previous_session_close(self.data)
+        if prev_close is None:
+            prev_close = self.previous_close
+        if prev_close is None:
             return {'Price Change':0.0,'Change %':0.0}
         try:
-            prev_close = self.data['Close'].iloc[-2]
             price_change = self.current_price - prev_close
             price_change_p = (price_change/prev_close)*100
             return {'Price Change':price_change,'Change %':price_change_p}
@@ -50,143 +115,439 @@ class StockData:
         if not self.is_valid() or len(self.data) < 2:
             return {}
         try:
-            returns = self.data['Close'].pct_changes().dropna()
-
-            cumulative = (1+returns).cumprod()
-            running_max = cumulative.cummax()
-            drawdown = (cumulative /running_max -1)
-            max_drawdown = drawdown.min()
-
-            sharpe_ratio = 0
-            if returns.std() != 0:
-                sharpe_ratio = (returns.mean() / returns.std()) * (252 ** 0.5)
-
-            return {
-                'daily_return_mean': returns.mean(),
-                'daily_return_std': returns.std(),
-                'sharpe_ratio': sharpe_ratio,
-                'max_draw_down': max_drawdown
-            }
+            return returns_analysis(self)
         except Exception as e:
-            st.write(f"Error while retrieving{self.data}:{str(e)}")
+            logger.warning("Error while analysing returns for %s: %s", self.symbol, e)
             return {}
 
+def _session_days(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Exchange-local date of each bar"""
+    return (index.tz_localize(None) if index.tz is not None else index).normalize()
+
+
+def _previous_session_close(frame: pd.DataFrame) -> Optional[float]:
+    """Last close dated before the latest bar's session, None when the frame holds a single session"""
+    # Only the tail is searched, widening until it reaches back past the latest session
+    rows = 64
+    while True:
+        days = _session_days(frame.index[-rows:])
+        earlier = int(days.searchsorted(days[-1], side="left"))
+        if earlier > 0:
+            return float(frame['Close'].iloc[len(frame) - len(days) + earlier - 1])
+        if rows >= len(frame):
+            return None
+        rows *= 4
+
+
+class FetchError(Exception):
+    """Fetch failure carrying the user-facing message and its severity"""
+
+    def __init__(self, message: str, level: str = "error"):
+        super().__init__(message)
+        self.level = level
+
+
+def _market_ttl(tier: str, interval_of: Callable[[str], str]):
+    """Per-entry TTL for a tier: its configured TTL while the market is open, until the next open otherwise"""
+    default_ttl = CACHE_SETTINGS[tier]["ttl"]
+
+    def ttl_for(key, value, fetched_at: float) -> float:
+        symbol, period = key
+        return cache_ttl(symbol, interval_of(period), fetched_at, default_ttl)
+    return ttl_for
+
+
+# Process-wide caches shared by every session, one per data tier
+_history_cache = SWRCache(**CACHE_SETTINGS["history"], sizeof=StockData.nbytes,
+                          ttl_for=_market_ttl("history", base_interval))
+_live_cache = SWRCache(**CACHE_SETTINGS["live"], sizeof=StockData.nbytes,
+                       ttl_for=_market_ttl("live", lambda period: "1m"))
+# Thin-client copies of data service responses, keyed (symbol, superset period); revalidated
+# against the service's fetched_at once client_ttl passes (live data on every call)
+_client_cache = SWRCache(ttl=DATA_SOURCE["client_ttl"], max_stale=DATA_SOURCE["client_ttl"],
+                         sizeof=StockData.nbytes, max_entries=CACHE_SETTINGS["history"]["max_entries"],
+                         ttl_for=lambda key, value, fetched_at: 0.0 if key[1] == "live" else DATA_SOURCE["client_ttl"])
+# 1-minute bars behind get_current_price, keyed by symbol
+_price_cache = SWRCache(ttl=60, max_stale=60, max_entries=CACHE_SETTINGS["live"]["max_entries"])
+
+CACHE_REQUESTS = counter(
+    "tickertrek_cache_requests_total", "Stock data cache lookups by tier and result (hit/stale/miss)",
+    ["tier", "result"]
+)
+INCREMENTAL_UPDATES = counter(
+    "tickertrek_incremental_updates_total", "Daily history refreshes merged from recent bars or refetched in full",
+    ["result"]
+)
+
+
+def _collect_cache_metrics():
+    tiers = {"history": _history_cache.stats(), "live": _live_cache.stats()}
+    return [
+        ("tickertrek_cache_entries", "gauge", "Cached StockData entries",
+         [({"tier": tier}, stats["entries"]) for tier, stats in tiers.items()]),
+        ("tickertrek_cache_bytes", "gauge", "Memory held by cached StockData price history",
+         [({"tier": tier}, stats["bytes"]) for tier, stats in tiers.items()]),
+        ("tickertrek_cache_evictions_total", "counter", "Entries evicted to stay within the tier's bounds",
+         [({"tier": tier}, stats["evictions"]) for tier, stats in tiers.items()]),
+    ]
+
+
+register_collector(_collect_cache_metrics)
+
+
 class StockDataManage:
 
     def __init__(self):
-        self.cache_ttl = 300 #5 min cache for historical data
-        self.realtime_cache_ttl = 60 #1 min chace for realtime data
-
-    @st.cache_data(ttl=300)
-    def get_stock_data(_self,_symbol: str, period: str = '1y') -> StockData:
+        self.cache_ttl = CACHE_SETTINGS["history"]["ttl"] #5 min cache for historical data
+        self.realtime_cache_ttl = CACHE_SETTINGS["live"]["ttl"] #cache for realtime data
+        self.last_cache_status = None #hit/stale/miss of the latest get_stock_data call
+
+    def get_stock_data(self, _symbol: str, period: str = '1y', cache_result: bool = True) -> StockData:
+        """
+        Cached stock data for a symbol and period
+
+        History is cached once per symbol for the longest window of the period's
+        base interval (PERIOD_SUPERSETS); shorter periods are slices of it.
+        Expired entries are served straight away (marked with is_stale) while a
+        background refresh fetches new data; entries older than the tier's
+        max_stale bound force a blocking fetch. Failures never raise: they
+        return an empty StockData whose `error` holds the message to show.
+
+        With cache_result=False (one-off bulk reads such as exports) a fresh
+        entry is still used, but a fetched symbol is not added to the cache.
+        """
+        ticker_symbol = _symbol.upper().strip()
+        if service_url() and ticker_symbol:
+            return self._get_from_service(ticker_symbol, period, cache_result)
+        cache = _live_cache if period == "live" else _history_cache
+        source_period = period if period == "live" else superset_period(period)
+        self.last_cache_status = None
         try:
-            ticker_symbol = _symbol.upper().strip()
             if not ticker_symbol:
                 raise ValueError("Empty stock symbol")
+            key = (ticker_symbol, source_period)
+            if cache_result:
+                stock_data, status = cache.get(
+                    key,
+                    lambda: self._load_stock_data(ticker_symbol, source_period, self._cached(cache, key)),
+                    cacheable=StockData.is_valid
+                )
+            else:
+                entry = cache.peek(key)
+                if entry is not None and entry.expires_in() > 0:
+                    stock_data, status = entry.value, HIT
+                else:
+                    previous = entry.value if entry is not None else None
+                    stock_data, status = self._load_stock_data(ticker_symbol, source_period, previous), MISS
+            self.last_cache_status = status
+            CACHE_REQUESTS.inc(tier="live" if period == "live" else "history", result=status)
+            if source_period != period:
+                stock_data = stock_data.window(period)
+            if status == STALE:
+                stock_data = copy.copy(stock_data)
+                stock_data.is_stale = True
+            return stock_data
+
+        except FetchError as fe:
+            message, level = str(fe), fe.level
+        except ValueError as ve:
+            message, level = f"Input error for symbol '{_symbol}': {ve}", "error"
+        except UpstreamUnavailable as ue:
+            message, level = f"Yahoo Finance is busy, please retry '{_symbol}' shortly ({ue.reason})", "warning"
+        except Exception as e:
+            message, level = f"Unexpected error fetching data for '{_symbol}': {type(e).__name__} - {str(e)}", "error"
 
-            stock = yf.Ticker(ticker_symbol)
-            #Live Data
-            if period=="live":
-                try:
-                    info=stock.fast_info
-                    current_price=info.get("last_price",0.0)
-                except Exception as e :
-                    st.error(f"Live data fetch error:  {e}")
-                    return StockData(symbol=ticker_symbol, data=pd.DataFrame(),info={},current_price=0.0)
-                data=pd.DataFrame([{"Live Price:":current_price,"Symbol":ticker_symbol}])
-                return  StockData(symbol=ticker_symbol,data=data,info=info,current_price=current_price)
-
-            #Historical Data
-            try:
-                data = stock.history(period=period)
-            except (KeyError, IndexError, ValueError) as e:
-                st.error(f"Error retrieving historical data: {e}")
-                return StockData(symbol=ticker_symbol, data=pd.DataFrame(), info={}, current_price=0.0)
+        logger.info(message)
+        return self._failed(_symbol, message, level)
 
-            if data.empty:
-                st.warning(f"No data found for the ticker '{ticker_symbol}'")
-                return StockData(symbol=ticker_symbol, data=pd.DataFrame(), info={}, current_price=0.0)
+    @staticmethod
+    def _failed(symbol: str, message: str, level: str) -> StockData:
+        failed = StockData(symbol=symbol, data=pd.DataFrame(), info={}, current_price=0.0)
+        failed.error, failed.error_level = message, level
+        return failed
+
+    def _get_from_service(self, ticker_symbol: str, period: str, cache_result: bool = True) -> StockData:
+        """
+        get_stock_data through the local data service, which owns fetching and caching
+
+        Responses are kept for DATA_SOURCE["client_ttl"] seconds (_client_cache), so
+        the several reads of one rerun make a single request; after that the
+        service only re-sends the history when it has refetched it. As in-process,
+        the period's PERIOD_SUPERSETS window is requested and cached once per
+        symbol, and shorter periods are sliced from it here.
+        """
+        self.last_cache_status = None
+        source_period = period if period == "live" else superset_period(period)
+        key = (ticker_symbol, source_period)
+        try:
+            if not cache_result:
+                return self._fetch_from_service(ticker_symbol, period, None)
+            stock_data, status = _client_cache.get(
+                key,
+                lambda: self._fetch_from_service(ticker_symbol, source_period, self._cached(_client_cache, key)),
+                cacheable=StockData.is_valid
+            )
+        except OSError as e:
+            message = f"Data service at {service_url()} is unavailable, please retry shortly ({e})"
+            logger.warning(message)
+            return self._failed(ticker_symbol, message, "warning")
+        if status == HIT:
+            self.last_cache_status = HIT
+        if source_period != period and stock_data.is_valid():
+            stock_data = stock_data.window(period)
+        return stock_data
+
+    def _fetch_from_service(self, ticker_symbol: str, period: str, previous: Optional[StockData]) -> StockData:
+        frame, meta = fetch_stock(ticker_symbol, period,
+                                  fetched_at=previous.fetched_at if previous is not None else None)
+        if meta.get("unchanged") and previous is not None:
+            frame = previous.data
+        stock_data = StockData(meta.get("symbol", ticker_symbol), frame, meta.get("info") or {},
+                               meta.get("current_price") or 0.0)
+        stock_data.fetched_at = meta.get("fetched_at", stock_data.fetched_at)
+        stock_data.is_stale = bool(meta.get("is_stale"))
+        stock_data.error, stock_data.error_level = meta.get("error"), meta.get("error_level", "error")
+        self.last_cache_status = meta.get("cache_status")
+        return stock_data
 
-            # Safe info extraction
-            try:
-                info = stock.info
-            except (KeyError, ValueError):
-                info = {}
+    @staticmethod
+    def _cached(cache: SWRCache, key) -> Optional[StockData]:
+        entry = cache.peek(key)
+        return entry.value if entry is not None else None
 
-            # Get current price
+    @staticmethod
+    def _load_stock_data(ticker_symbol: str, period: str, previous: Optional[StockData] = None) -> StockData:
+        """
+        Fetch a symbol from the configured provider, raising FetchError on failure
+
+        With `previous` daily data (an expired cache entry or stored snapshot) only
+        the last CORPORATE_ACTIONS["recent_period"] is fetched and merged in; splits
+        and dividends among the new bars back-adjust the stored ones once. A full
+        fetch is the fallback when the recent bars do not overlap the stored ones.
+        """
+        provider = get_provider()
+        #Live Data
+        if period=="live":
             try:
-                current_price = data["Close"].iloc[-1]
-            except (KeyError, IndexError):
-                current_price = 0.0
-
-            return StockData(
-                symbol=ticker_symbol,
-                data=data,
-                info=info,
-                current_price=current_price
-            )
+                current_price = provider.quote(ticker_symbol)
+            except UpstreamUnavailable:
+                raise
+            except Exception as e :
+                raise FetchError(f"Live data fetch error:  {e}") from e
+            # Each poll lands in the symbol's quote buffer; the live data is its 1-minute candles
+            record_quote(ticker_symbol, current_price)
+            data = live_candles(ticker_symbol)
+            return  StockData(symbol=ticker_symbol,data=data,info={},current_price=current_price)
+
+        #Historical Data
+        data = None
+        try:
+            if (previous is not None and previous.is_valid() and CORPORATE_ACTIONS["incremental"]
+                    and base_interval(period) == "1d"):
+                recent = provider.history(ticker_symbol, CORPORATE_ACTIONS["recent_period"], "1d")
+                ledger = previous.actions.copy()
+                # A new frame: the previous one may still be shared by other sessions
+                merged = ledger.merge(previous.data, recent) if not recent.empty else None
+                if merged is not None:
+                    data = merged.iloc[window_start(merged.index, period):]
+                    INCREMENTAL_UPDATES.inc(result="merged")
+                else:
+                    INCREMENTAL_UPDATES.inc(result="full")
+            if data is None:
+                data = provider.history(ticker_symbol, period, base_interval(period))
+                ledger = ActionLedger.from_history(data)
+        except (KeyError, IndexError, ValueError) as e:
+            raise FetchError(f"Error retrieving historical data: {e}") from e
+
+        if data.empty:
+            raise FetchError(f"No data found for the ticker '{ticker_symbol}'", level="warning")
+
+        # Displayed info fields only, from the local store on its own refresh schedule
+        info = company_info(ticker_symbol, lambda: provider.info(ticker_symbol))
+
+        # Get current price
+        try:
+            current_price = data["Close"].iloc[-1]
+        except (KeyError, IndexError):
+            current_price = 0.0
+
+        stock_data = StockData(
+            symbol=ticker_symbol,
+            data=data,
+            info=info,
+            current_price=current_price
+        )
+        stock_data.actions = ledger
+        return stock_data
+
+    def with_live_price(self, stock_data: StockData) -> StockData:
+        """Copy of stock_data priced at the latest live quote (live tier cache), when one is available"""
+        live = self.get_stock_data(stock_data.symbol, "live")
+        if not live.current_price or live.current_price <= 0:
+            return stock_data
+        priced = copy.copy(stock_data)
+        priced.current_price = float(live.current_price)
+        return priced
 
-        except ValueError as ve:
-            st.error(f"Input error for symbol '{_symbol}': {ve}")
+    @staticmethod
+    def cached_histories(exclude_periods=("live", "1d", "5d")) -> Dict[str, pd.DataFrame]:
+        """
+        Price history for every symbol currently cached, without any upstream calls
+
+        Intraday periods are skipped; when a symbol is cached for several periods
+        the longest history wins. Thin clients of a data service only hold what
+        this worker has requested recently, not the service's whole cache.
+        """
+        histories: Dict[str, pd.DataFrame] = {}
+        for (symbol, period), entry in _history_cache.items() + _client_cache.items():
+            if period in exclude_periods or not entry.value.is_valid():
+                continue
+            frame = entry.value.data
+            if symbol not in histories or len(frame) > len(histories[symbol]):
+                histories[symbol] = frame
+        return histories
+
+    @staticmethod
+    def history_expires_in(_symbol: str, period: str = '1y') -> Optional[float]:
+        """Seconds until the cached history serving (symbol, period) expires, None when not cached"""
+        entry = _history_cache.peek((_symbol.upper().strip(), superset_period(period)))
+        return entry.expires_in() if entry is not None else None
+
+    @staticmethod
+    def refresh_history(_symbol: str, period: str = '1y') -> StockData:
+        """Fetch the history serving (symbol, period) into the cache now; raises FetchError / UpstreamUnavailable"""
+        ticker_symbol = _symbol.upper().strip()
+        source_period = superset_period(period)
+        key = (ticker_symbol, source_period)
+        return _history_cache.refresh(
+            key,
+            lambda: StockDataManage._load_stock_data(
+                ticker_symbol, source_period, StockDataManage._cached(_history_cache, key)),
+            cacheable=StockData.is_valid
+        )
+
+    @staticmethod
+    def update_history(previous: StockData, period: str = '1y') -> StockData:
+        """`previous` daily history extended with recent bars (no cache); raises FetchError / UpstreamUnavailable"""
+        return StockDataManage._load_stock_data(previous.symbol, period, previous)
+
+    @staticmethod
+    def prime_cache(stock_data: StockData, period: str = '1y'):
+        """Store already-loaded data as a fresh cache entry for (symbol, period)"""
+        cache = _live_cache if period == "live" else _history_cache
+        cache.put((stock_data.symbol, period), stock_data, fetched_at=stock_data.fetched_at)
+
+    @staticmethod
+    def clear_cache():
+        """Drop every cached symbol so the next request refetches"""
+        _history_cache.clear()
+        _live_cache.clear()
+        _client_cache.clear()
+        clear_resampled()
+        clear_risk_memo()
+        clear_overlays()
+
+    def get_risk_analysis(self, stock_data: StockData, period: str = '1y') -> Dict[str, float]:
+        """
+        VaR/CVaR, Sortino, Calmar and, against the exchange's benchmark index, beta, alpha and capture ratios
+
+        Needs daily bars, so intraday periods return {}. The benchmark history
+        comes from the shared history cache, fetched once for every symbol.
+        """
+        if not stock_data.is_valid() or base_interval(period) != "1d":
+            return {}
+        benchmark = None
+        index_symbol = benchmark_symbol(stock_data.symbol)
+        if index_symbol and index_symbol != stock_data.symbol:
+            benchmark = StockDataManage().get_stock_data(index_symbol, period)
+            if not benchmark.is_valid():
+                logger.info("Benchmark %s unavailable: %s", index_symbol, benchmark.error)
+                benchmark = None
+        try:
+            return risk_analysis(stock_data, benchmark)
         except Exception as e:
-            st.error(f"Unexpected error fetching data for '{_symbol}': {type(e).__name__} - {str(e)}")
+            logger.warning("Error while computing risk metrics for %s: %s", stock_data.symbol, e)
+            return {}
+
+    def get_bars(self, ticker_symbol: str, period: str = '1y', interval: Optional[str] = None) -> pd.DataFrame:
+        """
+        OHLCV bars for a period at the given interval (default from INTERVAL_OPTIONS)
 
-        return StockData(symbol=_symbol, data=pd.DataFrame(), info={}, current_price=0.0)
+        Coarser intervals are resampled locally from the period's cached base bars.
+        """
+        stock_data = self.get_stock_data(ticker_symbol, period)
+        if not stock_data.is_valid():
+            return stock_data.data
+        return resampled(stock_data.symbol, period, stock_data.data, stock_data.fetched_at,
+                         interval or default_interval(period))
 
-    def get_candlestick_data(self, ticker_symbol, period: str='1y'):
-        stock_data = self.get_stock_data(ticker_symbol,period)
-        df = stock_data.data
+    def get_candlestick_data(self, ticker_symbol, period: str='1y', interval: Optional[str] = None):
+        df = self.get_bars(ticker_symbol, period, interval)
 
         if 'Date' not in df.columns:
-            df = df.reset_index()
+            # intraday bars come indexed by 'Datetime'
+            df = df.rename_axis('Date').reset_index()
         df.columns=[col.strip().capitalize() for col in df.columns]
 
         required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
         if not all(col in df.columns for col in required_cols):
             raise ValueError("Data is missing one or more required OHLC columns.")
         df.dropna(subset=['Open','High','Low','Close'], inplace=True)
-        return df[required_cols]
+        return df[required_cols + (['Volume'] if 'Volume' in df.columns else [])]
+
+    @staticmethod
+    def get_minute_bars(symbol: str) -> pd.DataFrame:
+        """Today's 1-minute bars (shared with get_current_price), empty when unavailable"""
+        ticker_symbol = symbol.upper().strip()
+        try:
+            if service_url():
+                frame, _ = fetch_minute_bars(ticker_symbol)
+                return frame
+            frame, _ = _price_cache.get(ticker_symbol, lambda: get_provider().history(ticker_symbol, '1d', '1m'))
+            return frame
+        except (KeyError, ValueError, OSError, UpstreamUnavailable) as e:
+            logger.info("No minute bars for %s: %s", ticker_symbol, e)
+            return pd.DataFrame()
 
     @staticmethod
     def _safe_get_info(stock) -> Dict[str, Any]:
             """Safely fetch stock info with error handling"""
             info = {}
             try:
-                result = stock.info
+                result = call_upstream("info", lambda: stock.info)
                 if isinstance(result,dict):
                     info = result
             except Exception as e:
-                st.error(f"error refreshing the price for {stock}: {str(e)}")
-
-                pass
+                logger.warning("error fetching info for %s: %s", stock, e)
             return info
 
-    @st.cache_data(ttl=60)
     def get_current_price(_self,stock,historical_data : pd.DataFrame) -> float :
         try :
-            real_time_data = stock.history(period='1d', interval='1m')
+            real_time_data, _ = _price_cache.get(
+                stock.ticker,
+                lambda: call_upstream("quote", stock.history, period='1d', interval='1m')
+            )
             if not real_time_data.empty:
                 return float(real_time_data['Close'].iloc[-1])
             if not historical_data.empty:
                 return float(historical_data['Close'].iloc[-1])
             return 0.0
 
-        except (KeyError, ValueError, AttributeError):
+        except (KeyError, ValueError, AttributeError, UpstreamUnavailable):
             if not historical_data.empty:
                 return float(historical_data['Close'].iloc[-1])
             return 0.
 
     def refresh_real_time_data(_self,symbol:str)-> Optional[float]:
         try:
-            _self.get_current_price.clear()
-            stock = yf.Ticker(symbol.upper())
-            real_time_data = stock.history(period='1d',interval='1m')
+            _price_cache.clear()
+            real_time_data = get_provider().history(symbol.upper(), '1d', '1m')
 
             if not real_time_data.empty:
                 return float(real_time_data['Close'].iloc[-1])
 
         except Exception as e:
-            st.error(f"error refreshing the price for {symbol}: {str(e)}")
+            logger.warning("error refreshing the price for %s: %s", symbol, e)
 
         return None
 
@@ -197,11 +558,10 @@ class StockDataManage:
             if not symbol:
                 return False
 
-            stock = yf.Ticker(symbol)
-            data = stock.history(period='5d')
+            data = get_provider().history(symbol, '5d', '1d')
             return not data.empty
 
-        except (KeyError, ValueError, AttributeError):
+        except (KeyError, ValueError, AttributeError, UpstreamUnavailable):
             return False
 
     @staticmethod
@@ -0,0 +1,209 @@
+"""
+Local market-data service
+One process per host that owns fetching, caching, the live quotes and prefetch,
+so every Streamlit worker on the host shares a single cache and one upstream budget.
+Workers become thin clients when DATA_SOURCE["service_url"] (or TICKERTREK_DATA_SERVICE)
+points at it.
+
+    python data_service.py                                   # Yahoo Finance on 127.0.0.1:8765
+    python data_service.py --provider replay --replay-dir data/universe --port 8765
+    TICKERTREK_DATA_SERVICE=http://127.0.0.1:8765 streamlit run trek_app.py
+
+Endpoints (GET):
+    /stock?symbol=AAPL&period=1y   price history as an Arrow stream, StockData fields in its metadata;
+                                   with &fetched_at= of the client's copy, no rows unless refetched since
+    /minute?symbol=AAPL            today's 1-minute bars as an Arrow stream
+    /indicators?symbol=&period=    statistics table values, latest indicators, returns and risk analysis (JSON)
+    /health                        provider and cache summary (JSON)
+    /cache                         every cached entry with its size and access stats, plus totals (JSON)
+    /metrics                       Prometheus text format
+
+Endpoints (POST):
+    /cache/evict?tier=&symbol=&period=&interval=   drop one cached entry (JSON {"evicted": bool})
+"""
+
+import argparse
+import json
+import logging
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from analytics import statistics_values, indicator_snapshot
+from config import DATA_SOURCE
+from data_etl import StockDataManage, _history_cache, _live_cache
+from inventory import cache_inventory, inventory_totals, evict
+from prefetch import start_prefetch
+from providers import create_provider, get_provider, set_provider
+from service_client import encode_frame, use_data_service, CONTENT_TYPE
+from telemetry import counter, render_metrics
+
+logger = logging.getLogger("tickertrek.data_service")
+
+SERVICE_REQUESTS = counter(
+    "tickertrek_service_requests_total", "Data service requests by endpoint and status code", ["endpoint", "code"]
+)
+
+
+def _plain(value):
+    """JSON-safe version of numpy scalars and NaN"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def stock_payload(symbol: str, period: str, known_fetched_at: Optional[float] = None) -> bytes:
+    manager = StockDataManage()
+    stock_data = manager.get_stock_data(symbol, period)
+    meta = {
+        "symbol": stock_data.symbol,
+        "info": {key: _plain(value) for key, value in (stock_data.info or {}).items()},
+        "current_price": _plain(stock_data.current_price),
+        "fetched_at": stock_data.fetched_at,
+        "is_stale": stock_data.is_stale,
+        "error": stock_data.error,
+        "error_level": stock_data.error_level,
+        "cache_status": manager.last_cache_status,
+    }
+    if known_fetched_at is not None and stock_data.is_valid() and stock_data.fetched_at == known_fetched_at:
+        # The client's copy is current: send the metadata only
+        return encode_frame(stock_data.data.iloc[:0], {**meta, "unchanged": True})
+    return encode_frame(stock_data.data, meta)
+
+
+def indicators_payload(symbol: str, period: str) -> Dict[str, Any]:
+    manager = StockDataManage()
+    stock_data = manager.get_stock_data(symbol, period)
+    if not stock_data.is_valid():
+        return {"symbol": symbol, "error": stock_data.error or "no data"}
+    close = stock_data.data['Close']
+    daily = stock_data.daily_bars()
+    return {
+        "symbol": stock_data.symbol,
+        "fetched_at": stock_data.fetched_at,
+        "statistics": {k: _plain(v) for k, v in statistics_values(daily['Close'], daily['Volume']).items()},
+        "indicators": {k: _plain(v) for k, v in indicator_snapshot(close).items()},
+        "returns": {k: _plain(v) for k, v in stock_data.get_returns_analysis().items()},
+        "risk": {k: _plain(v) for k, v in manager.get_risk_analysis(stock_data, period).items()},
+    }
+
+
+def health_payload() -> Dict[str, Any]:
+    return {
+        "status": "ok",
+        "provider": get_provider().name,
+        "cache": {"history": _history_cache.stats(), "live": _live_cache.stats()},
+    }
+
+
+def cache_payload() -> Dict[str, Any]:
+    rows = cache_inventory()
+    return {"entries": rows, "totals": inventory_totals(rows)}
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    def _send(self, code: int, body: bytes, content_type: str):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        code = 200
+        try:
+            if url.path in ("/stock", "/minute", "/indicators"):
+                if not params.get("symbol"):
+                    code = 400
+                    self._send(code, b'{"error": "symbol is required"}', "application/json")
+                elif url.path == "/stock":
+                    known = float(params["fetched_at"]) if params.get("fetched_at") else None
+                    self._send(code, stock_payload(params["symbol"], params.get("period", "1y"), known), CONTENT_TYPE)
+                elif url.path == "/minute":
+                    self._send(code, encode_frame(StockDataManage.get_minute_bars(params["symbol"]), {}), CONTENT_TYPE)
+                else:
+                    body = json.dumps(indicators_payload(params["symbol"], params.get("period", "1y")))
+                    self._send(code, body.encode(), "application/json")
+            elif url.path == "/health":
+                self._send(code, json.dumps(health_payload()).encode(), "application/json")
+            elif url.path == "/cache":
+                self._send(code, json.dumps(cache_payload()).encode(), "application/json")
+            elif url.path == "/metrics":
+                self._send(code, render_metrics().encode(), "text/plain; version=0.0.4; charset=utf-8")
+            else:
+                code = 404
+                self._send(code, b'{"error": "not found"}', "application/json")
+        except Exception as e:
+            code = 500
+            logger.exception("Request %s failed", self.path)
+            self._send(code, json.dumps({"error": f"{type(e).__name__}: {e}"}).encode(), "application/json")
+        finally:
+            SERVICE_REQUESTS.inc(endpoint=url.path, code=str(code))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        code = 200
+        try:
+            if url.path != "/cache/evict":
+                code = 404
+                self._send(code, b'{"error": "not found"}', "application/json")
+            elif not params.get("tier") or not params.get("symbol"):
+                code = 400
+                self._send(code, b'{"error": "tier and symbol are required"}', "application/json")
+            else:
+                evicted = evict(params["tier"], params["symbol"], params.get("period"), params.get("interval"))
+                self._send(code, json.dumps({"evicted": evicted}).encode(), "application/json")
+        except ValueError as e:
+            code = 400
+            self._send(code, json.dumps({"error": str(e)}).encode(), "application/json")
+        finally:
+            SERVICE_REQUESTS.inc(endpoint=url.path, code=str(code))
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def create_server(host: str, port: int, prefetch: bool = True) -> ThreadingHTTPServer:
+    """Bind the service; call serve_forever() on the result (shutdown() from another thread stops it)"""
+    # This process is the service: always fetch locally
+    use_data_service(None)
+    if prefetch:
+        start_prefetch()
+    server = ThreadingHTTPServer((host, port), _ServiceHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="TickerTrek local market-data service")
+    parser.add_argument("--host", default=DATA_SOURCE["service_host"])
+    parser.add_argument("--port", type=int, default=DATA_SOURCE["service_port"])
+    parser.add_argument("--provider", choices=["yahoo", "replay"], help="override DATA_SOURCE['provider']")
+    parser.add_argument("--replay-dir", help="recorded data for the replay provider (implies --provider replay)")
+    parser.add_argument("--no-prefetch", action="store_true", help="do not keep the hot symbols warm")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.provider or args.replay_dir:
+        set_provider(create_provider(args.provider or "replay", args.replay_dir))
+    server = create_server(args.host, args.port, prefetch=not args.no_prefetch)
+    logger.info("Data service (%s provider) listening on http://%s:%d", get_provider().name, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,10 @@ Data table components: Handles display of the tabular data
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 from utils import format_number,calculate_percentage_change
+from analytics import statistics_values, calculate_volatility, calculate_sharpe_ratio, calculate_max_drawdown
+from config import RISK_SETTINGS
+from risk import benchmark_symbol, RELATIVE_METRICS
 
 def render_recent_data(stock_data,num_rows=9):
     if stock_data.data is None or stock_data.data.empty:
@@ -42,7 +44,7 @@ def render_recent_data(stock_data,num_rows=9):
 
         display_d['Daily Change'] = daily_changes
 
-    display_d.reset_index(inplace=True)
+    display_d = display_d.rename_axis('Date').reset_index()  # intraday bars come indexed by 'Datetime'
     display_d['Data'] = display_d['Date'].dt.strftime('%Y-%m-%d')
 
     st.dataframe(
@@ -61,51 +63,40 @@ def render_recent_data(stock_data,num_rows=9):
     )
 
 
+# Rows statistics_values only adds when there are returns, i.e. at least two prices
+RETURN_METRICS = {'Sharpe Ratio(approx)', 'Max Drawdown', 'Positive days%'}
+
+
+def compute_statistics(stock_data):
+    """Statistics table rows for the daily Close series, as {'Metric': [...], 'Value': [...]}"""
+    daily = stock_data.daily_bars()
+    values = statistics_values(daily['Close'], daily['Volume'])
+    stats_data = {'Metric': [], 'Value': []}
+
+    for metric, value in values.items():
+        if metric == 'Average Volume':
+            formatted = f"{format_number(value)}"
+        elif metric == 'Max Drawdown':
+            formatted = f"{value:.2f}%"
+        elif metric == 'Positive days%':
+            formatted = f"{value:.1f}%"
+        else:
+            formatted = f"{value:.2f}"
+        stats_data['Metric'].append(metric)
+        stats_data['Value'].append(formatted)
+    return stats_data
+
+
 def render_statistics(stock_data):
     if stock_data.data is None or stock_data.data.empty:
         st.error("No data available for statistical analysis")
         return ""
 
     st.subheader("📊 Statistical Data Analysis")
-    data =stock_data.data['Close']
-    stats_data= {
-        'Metric': [
-            'Current Price',
-            'Mean Price',
-            'Median Price',
-            'Standard Deviation',
-            'Minimum Price',
-            'Maximum Price',
-            '52-Week High',
-            '52-Week Low',
-            'Volatility (30-day)',
-            'Average Volume'
-        ],
-
-        'Value':[
-            f"{data.iloc[-1]:.2f}",
-            f"{data.mean():.2f}",
-            f"{data.median():.2f}",
-            f"{data.std():.2f}",
-            f"{data.min():.2f}",
-            f"{data.max():.2f}",
-            f"{data.tail(252).max():.2f}" if len(data) >= 252 else f"{data.max():.2f}",
-            f"{data.tail(252).min():.2f}" if len(data) >= 252 else f"{data.min():.2f}",
-            f"{calculate_volatility(data):.2f}",
-            f"{format_number(stock_data.data['Volume'].mean())}"
-        ]
-    }
-    returns = data.pct_change().dropna()
-
-    if len(returns) > 0 :
-        stats_data['Metric'].extend(
-            ['Sharpe Ratio(approx)','Max Drawdown','Positive days%'])
-        stats_data['Value'].extend([
-            f"{calculate_sharpe_ratio(returns):.2f}",
-            f"{calculate_max_drawdown(data):.2f}%",
-            f"{(returns>0).mean()*100:.1f}%"
-            ])
+    stats_data = compute_statistics(stock_data)
 
+    # The table is only shown once the return-based rows are there
+    if RETURN_METRICS.issubset(stats_data['Metric']):
         stats_df=pd.DataFrame(stats_data)
         col1,col2=st.columns(2)
         midpoint=len(stats_df) //2
@@ -125,6 +116,36 @@ def render_statistics(stock_data):
             )
     st.markdown("---")
 
+RISK_RATIOS = {'Sortino Ratio', 'Calmar Ratio', 'Beta', 'Correlation'}
+
+
+def render_risk_analysis(stock_data, risk):
+    st.subheader("🛡️ Risk Analysis")
+    if not risk:
+        st.info("Risk metrics need at least a month of daily data")
+        return
+
+    rows = {'Metric': [], 'Value': []}
+    for metric, value in risk.items():
+        rows['Metric'].append(metric)
+        rows['Value'].append("N/A" if value != value else f"{value:.2f}" if metric in RISK_RATIOS else f"{value:.2f}%")
+    risk_df = pd.DataFrame(rows)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(risk_df[~risk_df['Metric'].isin(RELATIVE_METRICS)], use_container_width=True, hide_index=True)
+    with col2:
+        relative = risk_df[risk_df['Metric'].isin(RELATIVE_METRICS)]
+        benchmark = benchmark_symbol(stock_data.symbol)
+        if relative.empty:
+            st.caption(f"Benchmark {benchmark} unavailable" if benchmark else "No benchmark configured for this exchange")
+        else:
+            st.caption(f"Against {benchmark}")
+            st.dataframe(relative, use_container_width=True, hide_index=True)
+    st.caption(f"VaR/CVaR: one-day loss at {RISK_SETTINGS['confidence']:.0%} confidence")
+    st.markdown("---")
+
+
 def render_performance_summary(stock_data):
     st.subheader("Performance summary")
     data=stock_data.data['Close']
@@ -170,35 +191,3 @@ def render_performance_summary(stock_data):
     else:
         st.info("Insufficient Data for performance analytics")
     st.markdown("---")
-
-def calculate_volatility(prices,window=30):
-    if not isinstance(prices,pd.Series):
-        prices = pd.Series(prices)
-
-    if len(prices) < window:
-        window = len(prices)
-
-    returns = prices.pct_change().dropna()
-
-    if len(returns) < window:
-        return 0
-
-    volatility= returns.std()*np.sqrt(252)
-    return volatility
-
-
-
-def calculate_sharpe_ratio(returns,risk_free_return=0.02):
-    if len(returns)==0 or returns.std()==0:
-        return 0
-
-    excess_returns= returns.mean()*252-risk_free_return
-    volatility =returns.std()*np.sqrt(252)
-    return excess_returns/volatility
-
-def calculate_max_drawdown(prices):
-    if len(prices) < 2:
-        return 0
-    peak=prices.expanding().max()
-    drawdown=(prices-peak)/peak*100
-    return drawdown.min()
@@ -0,0 +1,129 @@
+"""
+Bulk export module
+Writes full price history plus indicators for many symbols into a zip (one CSV or
+Parquet file per symbol), chunk by chunk, so memory stays bounded by one symbol's
+history rather than the whole export
+"""
+
+import io
+import logging
+import os
+import tempfile
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from config import TECHNICAL_INDICATORS
+from data_etl import StockDataManage
+from utils import calculate_ma, calculate_rsi, calculate_bollinger_bands
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ["csv", "parquet"]
+CHUNK_ROWS = 50_000
+# st.download_button holds the whole file in server memory, so the Export page only
+# offers zips up to this size; larger exports go through `batch.py export`
+MAX_DOWNLOAD_BYTES = 100 * 1024 * 1024
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+
+def add_indicators(frame: pd.DataFrame) -> pd.DataFrame:
+    """Price columns plus the TECHNICAL_INDICATORS moving averages, RSI and Bollinger bands"""
+    ti = TECHNICAL_INDICATORS
+    close = frame["Close"]
+    out = frame[[c for c in PRICE_COLUMNS if c in frame.columns]].copy()
+    for key in ("MA_SHORT", "MA_LONG", "MA_EXTRA_LONG"):
+        out[f"MA_{ti[key]}"] = calculate_ma(close, ti[key])
+    out[f"RSI_{ti['RSI_PERIOD']}"] = calculate_rsi(close, ti["RSI_PERIOD"])
+    upper, middle, lower = calculate_bollinger_bands(close, ti["BOLLINGER_PERIOD"], ti["BOLLINGER_STD"])
+    out["BB_Upper"], out["BB_Middle"], out["BB_Lower"] = upper, middle, lower
+    out.index.name = "Date"
+    return out
+
+
+def _chunks(frame: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def write_csv(frame: pd.DataFrame, stream, chunk_rows: int = CHUNK_ROWS):
+    """Write frame as CSV to a binary stream, one chunk at a time"""
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        for i, chunk in enumerate(_chunks(frame, chunk_rows)):
+            chunk.to_csv(text, header=(i == 0))
+    finally:
+        text.flush()
+        text.detach()
+
+
+def write_parquet(frame: pd.DataFrame, stream, chunk_rows: int = CHUNK_ROWS):
+    """Write frame as Parquet to a binary stream, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _chunks(frame, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=True)
+            if writer is None:
+                writer = pq.ParquetWriter(stream, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export_zip(symbols: Iterable[str], period: str, file_format: str, target,
+               chunk_rows: int = CHUNK_ROWS,
+               progress: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Optional[str]]:
+    """
+    Write <SYMBOL>.<format> for each symbol into a zip at `target` (path or binary file)
+
+    Symbols are loaded and written one at a time and are not added to the
+    history cache (already cached ones are reused). Returns symbol -> error message
+    (None when exported); symbols without data are skipped and not in the zip.
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown export format {file_format!r}; choose from {', '.join(EXPORT_FORMATS)}")
+    symbols = list(symbols)
+    manager = StockDataManage()
+    results: Dict[str, Optional[str]] = {}
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for i, symbol in enumerate(symbols, start=1):
+            if progress:
+                progress(i, len(symbols), symbol)
+            # Not cached: a long watchlist would otherwise keep every full history in memory
+            stock_data = manager.get_stock_data(symbol, period, cache_result=False)
+            if not stock_data.is_valid():
+                results[symbol] = stock_data.error or "no data"
+                continue
+            frame = add_indicators(stock_data.data)
+            # force_zip64: entry sizes are not known up front when streaming
+            with archive.open(f"{stock_data.symbol}.{file_format}", "w", force_zip64=True) as stream:
+                WRITERS[file_format](frame, stream, chunk_rows)
+            results[symbol] = None
+    return results
+
+
+def export_to_tempfile(symbols: Iterable[str], period: str, file_format: str,
+                       progress: Optional[Callable[[int, int, str], None]] = None):
+    """export_zip into a named temporary file; returns (path, results), the caller removes the file"""
+    handle, path = tempfile.mkstemp(prefix="tickertrek-export-", suffix=".zip")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            results = export_zip(symbols, period, file_format, f, progress=progress)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, results
+
+
+def parse_symbols(text: str) -> List[str]:
+    """'aapl, msft nvda' -> ['AAPL', 'MSFT', 'NVDA']"""
+    parts = text.replace(",", " ").split()
+    return list(dict.fromkeys(part.upper().strip() for part in parts if part.strip()))
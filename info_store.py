@@ -0,0 +1,144 @@
+"""
+Company info store
+Keeps only the company-info fields the app displays, in a small SQLite table with
+its own refresh schedule, instead of carrying the full Yahoo Finance info dict
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import INFO_STORE
+from telemetry import counter
+
+logger = logging.getLogger(__name__)
+
+# Stored field -> (Yahoo Finance info key, SQLite column type)
+INFO_FIELDS = {
+    "longName": ("longName", "TEXT"),
+    "longBusinessSummary": ("longBusinessSummary", "TEXT"),
+    "sector": ("sector", "TEXT"),
+    "industry": ("industry", "TEXT"),
+    "country": ("country", "TEXT"),
+    "employees": ("fullTimeEmployees", "INTEGER"),
+    "website": ("website", "TEXT"),
+    "marketCap": ("marketCap", "REAL"),
+    "trailingPE": ("trailingPE", "REAL"),
+    "trailingEps": ("trailingEps", "REAL"),
+    "dividendYield": ("dividendYield", "REAL"),
+}
+
+INFO_LOOKUPS = counter(
+    "tickertrek_info_lookups_total", "Company info lookups by result (hit/refreshed/stale/miss)", ["result"]
+)
+
+
+def project(info: Dict[str, Any]) -> Dict[str, Any]:
+    """The displayed fields of a Yahoo Finance info dict, under their stored names"""
+    projected = {}
+    for field, (source, _) in INFO_FIELDS.items():
+        value = info.get(source, info.get(field))
+        if value is not None and value != "":
+            projected[field] = value
+    return projected
+
+
+class InfoStore:
+    """Projected company info per symbol in SQLite, safe to share between threads and processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = self._connect(path)
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        if path != ":memory:":
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Company info store at %s unavailable (%s), keeping it in memory", path, e)
+                conn = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            conn = sqlite3.connect(path, check_same_thread=False)
+        columns = ", ".join(f'"{field}" {kind}' for field, (_, kind) in INFO_FIELDS.items())
+        conn.execute(f"CREATE TABLE IF NOT EXISTS company_info "
+                     f"(symbol TEXT PRIMARY KEY, fetched_at REAL NOT NULL, {columns})")
+        conn.commit()
+        return conn
+
+    def get(self, symbol: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(info, fetched_at) for symbol, or None when it was never stored"""
+        fields = ", ".join(f'"{field}"' for field in INFO_FIELDS)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT fetched_at, {fields} FROM company_info WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        if row is None:
+            return None
+        info = {field: value for field, value in zip(INFO_FIELDS, row[1:]) if value is not None}
+        return info, row[0]
+
+    def put(self, symbol: str, info: Dict[str, Any], fetched_at: Optional[float] = None):
+        values = [info.get(field) for field in INFO_FIELDS]
+        fields = ", ".join(f'"{field}"' for field in INFO_FIELDS)
+        placeholders = ", ".join("?" * (len(INFO_FIELDS) + 2))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO company_info (symbol, fetched_at, {fields}) VALUES ({placeholders})",
+                [symbol, fetched_at if fetched_at is not None else time.time(), *values]
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM company_info")
+            self._conn.commit()
+
+
+_store: Optional[InfoStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> InfoStore:
+    """The process-wide store, opened on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InfoStore(INFO_STORE["path"])
+        return _store
+
+
+def company_info(symbol: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Projected company info for symbol, from the store when recent enough
+
+    Entries older than INFO_STORE["refresh_after"] are refetched with `fetch`;
+    if that fails the stored copy is kept and served, or {} when there is none.
+    """
+    store = get_store()
+    stored = store.get(symbol)
+    if stored is not None and time.time() - stored[1] < INFO_STORE["refresh_after"]:
+        INFO_LOOKUPS.inc(result="hit")
+        return stored[0]
+
+    try:
+        info = project(fetch() or {})
+    except Exception as e:
+        logger.info("Company info fetch for %s failed: %s", symbol, e)
+        info = {}
+
+    if info:
+        store.put(symbol, info)
+        INFO_LOOKUPS.inc(result="refreshed")
+        return info
+    if stored is not None:
+        INFO_LOOKUPS.inc(result="stale")
+        return stored[0]
+    INFO_LOOKUPS.inc(result="miss")
+    return {}
@@ -0,0 +1,115 @@
+"""
+Cache inventory module
+Every entry held by the process-wide caches with its size, age and access
+statistics, and manual eviction, for the Admin page and the data service's /cache
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from data_etl import _history_cache, _live_cache, _price_cache
+from live_buffer import live_buffers, drop_live_buffer
+from providers import get_provider
+from resample import base_interval, resampled_items, evict_resampled
+from screener import universe_store
+
+# Cache tiers in display order, with what their entries hold
+TIERS = {
+    "history": "price history per symbol and superset period",
+    "live": "latest quote as 1-minute candles",
+    "minute": "today's 1-minute bars",
+    "resampled": "coarser bars derived from cached history",
+    "quotes": "ring buffer of polled live quotes",
+    "universe": "compressed snapshot history for the screener",
+    "replay": "compressed daily recordings of the replay provider",
+}
+
+
+def _frame_bytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return 0
+
+
+def _row(tier: str, symbol: str, period: Optional[str], interval: Optional[str], nbytes: int,
+         fetched_at: Optional[float], hits: int, last_access: Optional[float],
+         expires_in: Optional[float], now: float) -> Dict[str, Any]:
+    return {
+        "tier": tier,
+        "symbol": symbol,
+        "period": period,
+        "interval": interval,
+        "bytes": nbytes,
+        "age": now - fetched_at if fetched_at is not None else None,
+        "hits": hits,
+        "last_access": now - last_access if last_access is not None else None,
+        "expires_in": expires_in,
+    }
+
+
+def cache_inventory() -> List[Dict[str, Any]]:
+    """
+    One row per cached entry: tier, symbol, period, interval, bytes, age (s),
+    hits, seconds since the last access and seconds until it expires (None
+    for tiers that do not expire)
+    """
+    now = time.time()
+    rows = []
+    for tier, cache in (("history", _history_cache), ("live", _live_cache)):
+        for (symbol, period), entry in cache.items():
+            interval = "1m" if period == "live" else base_interval(period)
+            rows.append(_row(tier, symbol, period, interval, entry.nbytes, entry.fetched_at,
+                             entry.hits, entry.last_access, entry.expires_in(now), now))
+    for symbol, entry in _price_cache.items():
+        rows.append(_row("minute", symbol, "1d", "1m", _frame_bytes(entry.value), entry.fetched_at,
+                         entry.hits, entry.last_access, entry.expires_in(now), now))
+    for (symbol, period, interval), (fetched_at, frame, hits, last_access) in resampled_items():
+        rows.append(_row("resampled", symbol, period, interval, _frame_bytes(frame), fetched_at,
+                         hits, last_access, None, now))
+    for symbol, buffer in live_buffers():
+        rows.append(_row("quotes", symbol, "live", None, buffer.nbytes, buffer.last_quote_at,
+                         buffer.reads, buffer.last_read, None, now))
+    for tier, store in _stores().items():
+        for symbol, stats in store.items():
+            rows.append(_row(tier, symbol, "max", "1d", stats["bytes"], None,
+                             stats["reads"], stats["last_read"], None, now))
+    return rows
+
+
+def _stores():
+    stores = {"universe": universe_store()}
+    replay_store = getattr(get_provider(), "store", None)
+    if replay_store is not None:
+        stores["replay"] = replay_store
+    return stores
+
+
+def inventory_totals(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Entries, bytes and hits per tier (every tier listed, empty ones with zeros)"""
+    totals = {tier: {"entries": 0, "bytes": 0, "hits": 0} for tier in TIERS}
+    for row in rows:
+        tier = totals[row["tier"]]
+        tier["entries"] += 1
+        tier["bytes"] += row["bytes"]
+        tier["hits"] += row["hits"]
+    return totals
+
+
+def evict(tier: str, symbol: str, period: Optional[str] = None, interval: Optional[str] = None) -> bool:
+    """Drop one entry (as listed by cache_inventory); returns whether it was cached"""
+    if tier == "history":
+        return _history_cache.invalidate((symbol, period))
+    if tier == "live":
+        return _live_cache.invalidate((symbol, "live"))
+    if tier == "minute":
+        return _price_cache.invalidate(symbol)
+    if tier == "resampled":
+        return evict_resampled((symbol, period, interval))
+    if tier == "quotes":
+        return drop_live_buffer(symbol)
+    if tier in ("universe", "replay"):
+        store = _stores().get(tier)
+        return store.drop(symbol) if store is not None else False
+    raise ValueError(f"Unknown cache tier {tier!r}, expected one of {', '.join(TIERS)}")
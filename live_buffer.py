@@ -0,0 +1,124 @@
+"""
+Live quote buffer module
+Polled live quotes kept per symbol in a fixed-size NumPy ring buffer and
+aggregated into 1-minute OHLC candles, so live mode has a price series of its
+own without extra 1-minute history downloads
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import LIVE_BUFFER
+from market_calendar import exchange_timezone
+
+CANDLE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+class QuoteBuffer:
+    """Last `capacity` (timestamp, price) quotes of one symbol; the oldest are overwritten"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.last_read: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, price: float, timestamp: Optional[float] = None):
+        with self._lock:
+            self._times[self._next] = time.time() if timestamp is None else timestamp
+            self._prices[self._next] = price
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self._times.nbytes + self._prices.nbytes
+
+    @property
+    def last_quote_at(self) -> Optional[float]:
+        return float(self._times[(self._next - 1) % self.capacity]) if self._count else None
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps (epoch seconds) and prices in arrival order, as copies"""
+        with self._lock:
+            self.reads += 1
+            self.last_read = time.time()
+            start = (self._next - self._count) % self.capacity
+            order = (start + np.arange(self._count)) % self.capacity
+            return self._times[order], self._prices[order]
+
+    def candles(self, tz=None, seconds: int = 60) -> pd.DataFrame:
+        """OHLC candles of `seconds` each (minutes without quotes are left out)"""
+        times, prices = self.snapshot()
+        if not len(prices):
+            return pd.DataFrame(columns=CANDLE_COLUMNS)
+        buckets = (times // seconds).astype(np.int64)
+        starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+        ends = np.r_[starts[1:] - 1, len(prices) - 1]
+        index = pd.to_datetime(buckets[starts] * seconds, unit="s", utc=True)
+        if tz is not None:
+            index = index.tz_convert(tz)
+        return pd.DataFrame({
+            "Open": prices[starts],
+            "High": np.maximum.reduceat(prices, starts),
+            "Low": np.minimum.reduceat(prices, starts),
+            "Close": prices[ends],
+        }, index=index.rename("Datetime"))
+
+
+_buffers: Dict[str, QuoteBuffer] = {}
+_buffers_lock = threading.Lock()
+
+
+def record_quote(symbol: str, price: float, timestamp: Optional[float] = None):
+    """Add a polled quote to the symbol's buffer (non-positive prices are ignored)"""
+    if not price or price <= 0:
+        return
+    with _buffers_lock:
+        buffer = _buffers.get(symbol)
+        if buffer is None:
+            buffer = _buffers[symbol] = QuoteBuffer(LIVE_BUFFER["capacity"])
+    buffer.append(float(price), timestamp)
+
+
+def live_candles(symbol: str) -> pd.DataFrame:
+    """1-minute candles of the quotes recorded for a symbol, in its exchange's timezone"""
+    buffer = _buffers.get(symbol)
+    if buffer is None:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+    return buffer.candles(exchange_timezone(symbol))
+
+
+def sparkline(candles: pd.DataFrame, points: Optional[int] = None) -> pd.Series:
+    """Latest candle closes, for a small trend line next to the live price"""
+    points = LIVE_BUFFER["sparkline_points"] if points is None else points
+    if candles is None or candles.empty or "Close" not in candles.columns:
+        return pd.Series(dtype=float)
+    return candles["Close"].tail(points)
+
+
+def live_buffers() -> List[Tuple[str, QuoteBuffer]]:
+    """Snapshot of (symbol, buffer) pairs"""
+    with _buffers_lock:
+        return list(_buffers.items())
+
+
+def drop_live_buffer(symbol: str) -> bool:
+    with _buffers_lock:
+        return _buffers.pop(symbol, None) is not None
+
+
+def clear_live_buffers():
+    with _buffers_lock:
+        _buffers.clear()
@@ -0,0 +1,121 @@
+"""
+Live chart module
+A fixed trailing window of candles, kept per session and updated in place from
+live quotes: each tick mutates the latest bar (or rolls in a new one) and its
+moving-average point, so the work and the figure sent stay the same size
+whatever the length of the loaded history
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from market_calendar import INTERVAL_SECONDS
+
+
+class LiveChart:
+    """Candles and a moving average over the last `window` bars, updated from quotes"""
+
+    def __init__(self, symbol: str, bars: pd.DataFrame, interval: str, window: int, ma_window: int):
+        self.symbol = symbol
+        self.interval_name = interval
+        self.interval = pd.Timedelta(seconds=INTERVAL_SECONDS.get(interval, 86400))
+        self.window = window
+        self.ma_window = ma_window
+        # Keep ma_window - 1 bars before the visible window so its first MA point is complete
+        tail = bars.tail(window + ma_window - 1)
+        self.times = tail.index
+        self.open = tail["Open"].to_numpy(dtype=float).copy()
+        self.high = tail["High"].to_numpy(dtype=float).copy()
+        self.low = tail["Low"].to_numpy(dtype=float).copy()
+        self.close = tail["Close"].to_numpy(dtype=float).copy()
+        self.ma = self._moving_average()
+        self._figure = None
+
+    def _moving_average(self) -> np.ndarray:
+        """Trailing mean of `ma_window` closes (NaN until enough bars)"""
+        sums = np.cumsum(np.r_[0.0, self.close])
+        ma = np.full(len(self.close), np.nan)
+        if len(self.close) >= self.ma_window:
+            ma[self.ma_window - 1:] = (sums[self.ma_window:] - sums[:-self.ma_window]) / self.ma_window
+        return ma
+
+    def bar_start(self, now: pd.Timestamp) -> pd.Timestamp:
+        """
+        Start of the bar `now` falls in, on the grid of the existing bars: a whole
+        number of intervals after the latest bar (month starts for monthly bars).
+        Computed on exchange wall-clock time, so DST changes do not shift the grid.
+        """
+        tz = self.times.tz
+        last = self.times[-1].tz_localize(None) if tz is not None else self.times[-1]
+        if now.tzinfo is not None:
+            now = (now.tz_convert(tz) if tz is not None else now).tz_localize(None)
+        if self.interval_name == "1mo":
+            start = now.normalize().replace(day=1)
+        else:
+            start = last + ((now - last) // self.interval) * self.interval
+        return start.tz_localize(tz, ambiguous=True, nonexistent="shift_forward") if tz is not None else start
+
+    def update(self, price: float, now: pd.Timestamp, can_open_bar: bool = True) -> bool:
+        """
+        Apply a quote: start a new bar once `now` is past the latest bar's interval
+        (while the market is open), otherwise move the latest bar's close, high and low
+
+        Returns whether anything changed.
+        """
+        if not price or price <= 0 or len(self.close) == 0:
+            return False
+        start = self.bar_start(now) if can_open_bar else None
+        if start is not None and start > self.times[-1]:
+            self.times = self.times[1:].append(pd.DatetimeIndex([start]))
+            for name in ("open", "high", "low", "close", "ma"):
+                setattr(self, name, np.r_[getattr(self, name)[1:], price])
+        elif price == self.close[-1]:
+            return False
+        else:
+            self.close[-1] = price
+            self.high[-1] = max(self.high[-1], price)
+            self.low[-1] = min(self.low[-1], price)
+        if len(self.close) >= self.ma_window:
+            self.ma[-1] = self.close[-self.ma_window:].mean()
+        self._sync_figure()
+        return True
+
+    @property
+    def figure(self):
+        if self._figure is None:
+            import plotly.graph_objects as go
+            self._figure = go.Figure([
+                go.Candlestick(name="Price", increasing={'line': {'color': 'green'}},
+                               decreasing={'line': {'color': 'red'}}),
+                go.Scatter(name=f"MA {self.ma_window}", mode="lines", line={'color': 'orange', 'width': 1.5}),
+            ])
+            self._figure.update_layout(
+                title=f"{self.symbol} Live (last {self.window} bars)",
+                height=320,
+                margin={'t': 40, 'b': 20},
+                xaxis_rangeslider_visible=False,
+                template="plotly_white",
+                uirevision=self.symbol,  # keep the user's zoom across ticks
+                showlegend=False,
+            )
+            self._sync_figure()
+        return self._figure
+
+    def _sync_figure(self):
+        if self._figure is None:
+            return
+        visible = slice(-self.window, None)
+        x = self.times[visible]
+        with self._figure.batch_update():
+            candles, ma = self._figure.data
+            candles.x, candles.open, candles.high = x, self.open[visible], self.high[visible]
+            candles.low, candles.close = self.low[visible], self.close[visible]
+            ma.x, ma.y = x, self.ma[visible]
+
+
+def live_chart(symbol: str, bars: pd.DataFrame, interval: str, window: int, ma_window: int) -> Optional[LiveChart]:
+    if bars is None or bars.empty:
+        return None
+    return LiveChart(symbol, bars, interval, window, ma_window)
@@ -0,0 +1,188 @@
+"""
+Market calendar module
+Per-exchange trading sessions (resolved from the ticker suffix) with holidays,
+used for the session banner and to size cache lifetimes
+"""
+
+import logging
+from datetime import date, datetime, time as dtime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from config import EXCHANGES, DEFAULT_EXCHANGE, RISK_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_SECONDS = {"1m": 60, "1h": 3600, "1d": 86400, "1wk": 7 * 86400, "1mo": 31 * 86400}
+# (exchange, year) already warned about missing holiday data
+_warned_years = set()
+
+
+@lru_cache(maxsize=None)
+def _index_exchanges() -> Dict[str, str]:
+    """Index symbol -> exchange, from each exchange's indices and the risk benchmarks"""
+    indices = {index.upper(): name for name, index in RISK_SETTINGS["benchmarks"].items()}
+    for name, exchange in EXCHANGES.items():
+        indices.update((index.upper(), name) for index in exchange.get("indices", []))
+    return indices
+
+
+def resolve_exchange(symbol: str) -> str:
+    """
+    Exchange name for a ticker from its suffix ('TATAMOTORS.NS' -> 'NSE', 'BTC-USD'
+    and 'EURUSD=X' -> '24/7') or, for indices, from the configured index lists
+    ('^NSEI' -> 'NSE'); other unsuffixed tickers -> US
+    """
+    symbol = symbol.upper().strip()
+    if symbol in _index_exchanges():
+        return _index_exchanges()[symbol]
+    default = None
+    for name, exchange in EXCHANGES.items():
+        for suffix in exchange["suffixes"]:
+            if not suffix:
+                default = default or name
+            elif symbol.endswith(suffix.upper()):
+                return name
+    return default or DEFAULT_EXCHANGE
+
+
+@lru_cache(maxsize=None)
+def _calendar(name: str) -> Tuple[ZoneInfo, dtime, dtime, frozenset, timedelta]:
+    exchange = EXCHANGES[name]
+    return (
+        ZoneInfo(exchange["timezone"]),
+        dtime.fromisoformat(exchange["open"]),
+        dtime.fromisoformat(exchange["close"]),
+        frozenset(date.fromisoformat(day) for day in exchange.get("holidays", [])),
+        timedelta(minutes=exchange.get("settle_minutes", 0)),
+    )
+
+
+def always_open(name: str) -> bool:
+    return bool(EXCHANGES[name].get("always_open"))
+
+
+@lru_cache(maxsize=None)
+def holidays_until(name: str) -> Optional[int]:
+    """Last year with holiday data for an exchange (None when it lists none)"""
+    holidays = _calendar(name)[3]
+    return max(day.year for day in holidays) if holidays else None
+
+
+def calendar_known(name: str, day: date) -> bool:
+    """Whether `day` falls in a year the exchange's holiday list covers; warns once per missing year"""
+    last_year = holidays_until(name)
+    if last_year is None or day.year <= last_year:
+        return True
+    if (name, day.year) not in _warned_years:
+        _warned_years.add((name, day.year))
+        logger.warning("No %s holidays configured for %d (EXCHANGES in config.py); "
+                       "using the default cache TTL", name, day.year)
+    return False
+
+
+def is_trading_day(name: str, day: date) -> bool:
+    if always_open(name):
+        return True
+    _, _, _, holidays, _ = _calendar(name)
+    return day.weekday() < 5 and day not in holidays
+
+
+def _session(name: str, day: date) -> Tuple[datetime, datetime]:
+    tz, open_time, close_time, _, _ = _calendar(name)
+    return datetime.combine(day, open_time, tz), datetime.combine(day, close_time, tz)
+
+
+def next_open(name: str, now: datetime) -> datetime:
+    """Start of the next regular session strictly after `now`"""
+    tz = _calendar(name)[0]
+    day = now.astimezone(tz).date()
+    for _ in range(30):
+        if is_trading_day(name, day):
+            session_open, _ = _session(name, day)
+            if session_open > now:
+                return session_open
+        day += timedelta(days=1)
+    raise ValueError(f"No trading day within 30 days for {name}; check its holiday list")
+
+
+def last_close(name: str, now: datetime) -> datetime:
+    """End of the latest regular session that closed at or before `now`"""
+    tz = _calendar(name)[0]
+    day = now.astimezone(tz).date()
+    for _ in range(30):
+        if is_trading_day(name, day):
+            _, session_close = _session(name, day)
+            if session_close <= now:
+                return session_close
+        day -= timedelta(days=1)
+    raise ValueError(f"No trading day within 30 days for {name}; check its holiday list")
+
+
+def session_state(name: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Status (OPEN / PRE_MARKET / AFTER_HOURS / CLOSED) with the relevant open and close times"""
+    tz = _calendar(name)[0]
+    now = (now or datetime.now(tz)).astimezone(tz)
+    if always_open(name):
+        return {"status": "OPEN", "exchange": name, "now": now, "close": None}
+    today = now.date()
+    if is_trading_day(name, today):
+        session_open, session_close = _session(name, today)
+        if session_open <= now < session_close:
+            return {"status": "OPEN", "exchange": name, "now": now, "close": session_close}
+        if now < session_open:
+            return {"status": "PRE_MARKET", "exchange": name, "now": now, "open": session_open}
+        return {"status": "AFTER_HOURS", "exchange": name, "now": now, "open": next_open(name, now)}
+    return {"status": "CLOSED", "exchange": name, "now": now, "open": next_open(name, now)}
+
+
+def exchange_timezone(symbol: str) -> ZoneInfo:
+    """Local timezone of a symbol's exchange"""
+    return _calendar(resolve_exchange(symbol))[0]
+
+
+def session_info(symbol: Optional[str] = None, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Session banner for a symbol's exchange: status, a human-readable time hint and is_trading_hours"""
+    name = resolve_exchange(symbol) if symbol else DEFAULT_EXCHANGE
+    state = session_state(name, now)
+    local_now = state["now"]
+    if state["status"] == "OPEN" and state["close"] is None:
+        time_info = "Trades around the clock"
+    elif state["status"] == "OPEN":
+        time_info = f"Market closes at {state['close'].strftime('%I:%M %p')}"
+    elif state["open"].date() == local_now.date():
+        time_info = f"Market opens at {state['open'].strftime('%I:%M %p')}"
+    elif state["open"].date() == local_now.date() + timedelta(days=1):
+        time_info = f"Market opens tomorrow at {state['open'].strftime('%I:%M %p')}"
+    else:
+        time_info = f"Market opens {state['open'].strftime('%A at %I:%M %p')}"
+    return {
+        "status": state["status"],
+        "time_info": f"{time_info} ({local_now.tzname()})",
+        "is_trading_hours": state["status"] == "OPEN",
+        "exchange": name,
+    }
+
+
+def cache_ttl(symbol: str, interval: str, fetched_at: float, default_ttl: float) -> float:
+    """
+    Seconds data fetched at `fetched_at` stays fresh
+
+    While the exchange is open (or the last close has not settled yet) this is
+    the tier's default TTL, capped at the bar interval. Once the session has
+    closed and settled, nothing changes until the next open, so the data stays
+    fresh until then. Round-the-clock markets, and years the holiday list does
+    not cover, always get the default TTL.
+    """
+    name = resolve_exchange(symbol)
+    tz, _, _, _, settle = _calendar(name)
+    fetched = datetime.fromtimestamp(fetched_at, tz)
+    open_ttl = min(default_ttl, INTERVAL_SECONDS.get(interval, default_ttl))
+    if always_open(name) or not calendar_known(name, fetched.date()):
+        return open_ttl
+    if session_state(name, fetched)["status"] == "OPEN":
+        return open_ttl
+    if fetched < last_close(name, fetched) + settle:
+        return open_ttl
+    return max(open_ttl, (next_open(name, fetched) - fetched).total_seconds())
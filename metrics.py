@@ -10,7 +10,10 @@ from datetime import datetime
 
 
 from data_etl import StockData
-from utils import format_number, format_percentage, format_currency
+from live_buffer import sparkline
+from upstream import get_upstream_status
+from profiling import rerun_spans, stage_summary
+from utils import format_number, format_percentage, format_currency, get_trading_session_info
 
 def render_real_time_price(stock_data: StockData):
 
@@ -23,6 +26,10 @@ def render_real_time_price(stock_data: StockData):
     now = datetime.now()
     fdate = now.strftime("%Y-%m-%d - %H:%M")
     st.write(f"🕐 Current Date & Time {fdate}")
+    session = get_trading_session_info(stock_data.symbol)
+    st.caption(f"{session['exchange']} {session['status'].replace('_', ' ').lower()}: {session['time_info']}")
+    if stock_data.is_stale:
+        st.caption(f"⏳ Showing data fetched {stock_data.age / 60:.0f} min ago, refreshing in the background")
     # Create columns for price display
     col1, col2 = st.columns([2, 2])
 
@@ -48,6 +55,19 @@ def render_real_time_price(stock_data: StockData):
             border=True
             )
 
+def render_live_sparkline(live_data: StockData):
+    """Trend of the polled live quotes as 1-minute closes, with the range they covered"""
+    candles = live_data.data
+    if candles is None or len(candles) < 2:
+        return
+    trend = sparkline(candles)
+    st.line_chart(trend.rename("Live"), height=120)
+    last_minute = (candles['Close'].iloc[-1] / candles['Close'].iloc[-2] - 1) * 100
+    st.caption(
+        f"Live: {len(candles)} one-minute candles, range {format_currency(candles['Low'].min())} – "
+        f"{format_currency(candles['High'].max())}, last minute {format_percentage(last_minute)}"
+    )
+
 def render_key_metrics(stock_data: StockData):
 
     st.subheader("💲Key Financial Metrics")
@@ -254,6 +274,48 @@ def render_comparison_metrics(stock_data_list: list, metric_keys: list):
         st.warning("No comparison data available")
 
 
+def render_upstream_status(container=st):
+    """
+    Render circuit breaker state and call counters for each upstream call type
+
+    Args:
+        container: Streamlit container to render into (defaults to the main page)
+    """
+    status = get_upstream_status()
+    state_icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+
+    rows = []
+    for call_type, stats in status.items():
+        rows.append({
+            'Call': call_type,
+            'Breaker': f"{state_icons.get(stats['state'], '⚪')} {stats['state']}",
+            'Calls': stats['calls'],
+            'Failures': stats['failures'],
+            'Retries': stats['retries'],
+            'Rejected': stats['rejected'],
+        })
+
+    container.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+
+def render_performance_panel():
+    """
+    Render the debug panel: this rerun's stage timings and the process-wide
+    rolling percentiles per stage
+    """
+    with st.expander("🛠️ Performance (debug)", expanded=True):
+        spans = rerun_spans()
+        if spans:
+            st.write("**This rerun**")
+            spans_df = pd.DataFrame(spans)
+            spans_df['ms'] = spans_df['ms'].round(2)
+            spans_df = spans_df.astype(object).fillna("").astype(str)
+            st.dataframe(spans_df, use_container_width=True, hide_index=True)
+
+        st.write("**All sessions (rolling window)**")
+        st.dataframe(stage_summary(), use_container_width=True, hide_index=True)
+
+
 # Error handling wrapper
 def safe_render_metrics(render_func, *args, **kwargs):
     """
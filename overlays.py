@@ -0,0 +1,94 @@
+"""
+Chart overlays module
+Anchored VWAP and the price-by-volume profile for the candlestick chart,
+computed with NumPy over the loaded bars and memoized per data version
+"""
+
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from cache import LRUMemo
+from config import CHART_SETTINGS
+
+OVERLAYS = ["volume", "vwap", "profile"]
+OVERLAY_LABELS = {"volume": "Volume bars", "vwap": "VWAP", "profile": "Volume profile"}
+
+_memo = LRUMemo(64)
+
+
+def typical_price(frame: pd.DataFrame) -> np.ndarray:
+    return (frame["High"].to_numpy(dtype=float) + frame["Low"].to_numpy(dtype=float)
+            + frame["Close"].to_numpy(dtype=float)) / 3
+
+
+def anchored_vwap(frame: pd.DataFrame) -> pd.Series:
+    """Volume-weighted average price from the first bar of `frame` onwards"""
+    volume = frame["Volume"].fillna(0).to_numpy(dtype=float)
+    cumulative_volume = np.cumsum(volume)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.cumsum(typical_price(frame) * volume) / cumulative_volume
+    return pd.Series(np.where(cumulative_volume > 0, vwap, np.nan), index=frame.index, name="VWAP")
+
+
+def volume_profile(frame: pd.DataFrame, bins: int) -> Dict[str, np.ndarray]:
+    """
+    Traded volume per price bin (each bar's volume at its typical price)
+
+    Returns bin centers, their volumes, the bin height and the point of control
+    (center of the bin with the most volume); {} without any traded volume
+    (FX pairs and some indices report none).
+    """
+    volume = frame["Volume"].fillna(0).to_numpy(dtype=float)
+    low, high = frame["Low"].min(), frame["High"].max()
+    if not np.isfinite([low, high]).all() or high <= low or not volume.sum() > 0:
+        return {}
+    volumes, edges = np.histogram(typical_price(frame), bins=bins, range=(low, high), weights=volume)
+    centers = (edges[:-1] + edges[1:]) / 2
+    return {
+        "centers": centers,
+        "volumes": volumes,
+        "height": edges[1] - edges[0],
+        "poc": float(centers[np.argmax(volumes)]),
+    }
+
+
+def session_bars(minute_bars: pd.DataFrame) -> pd.DataFrame:
+    """Minute bars of the latest session only, the anchor of intraday VWAP"""
+    if minute_bars.empty:
+        return minute_bars
+    days = minute_bars.index.normalize()
+    return minute_bars[days == days[-1]]
+
+
+def chart_overlays(stock_data, period: str, selected, minute_bars: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    VWAP and/or volume profile for a chart window, reused until the data is refetched
+
+    VWAP is anchored at the start of the window, computed from the base bars;
+    the intraday window uses the latest session's 1-minute bars instead when given.
+    The profile bins the window's base bars (finer than the chart's bars).
+    """
+    data = stock_data.data
+    if data.empty or "Volume" not in data.columns:
+        return {}
+    minute_version: Hashable = None
+    if minute_bars is not None and not minute_bars.empty:
+        minute_version = (len(minute_bars), minute_bars.index[-1])
+    key = (stock_data.symbol, period, stock_data.fetched_at, len(data), data.index[-1],
+           tuple(sorted(selected)), minute_version)
+
+    def compute() -> Dict:
+        result = {}
+        if "vwap" in selected:
+            vwap_source = session_bars(minute_bars) if minute_version is not None else data
+            result["vwap"] = anchored_vwap(vwap_source)
+        if "profile" in selected:
+            result["profile"] = volume_profile(data, CHART_SETTINGS["profile_bins"])
+        return result
+    return _memo.get(key, compute)
+
+
+def clear_overlays():
+    _memo.clear()
@@ -0,0 +1,65 @@
+"""
+TickerTrek - Stock Screener page
+Filters every locally stored symbol with a vectorized expression and ranks the matches
+"""
+
+import streamlit as st
+
+from config import PAGE_CONFIG, CUSTOM_CSS, SCREENER_SETTINGS
+from screener import get_universe_panel, run_screen, ScreenerError, FUNCTIONS
+
+DEFAULT_FILTER = "RSI(14) < RSI_OVERSOLD and CLOSE > MA(200) and VOL(30) < 0.4"
+
+
+def render_screener():
+    st.set_page_config(**{**PAGE_CONFIG, "page_title": "TickerTrek - Screener"})
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown('<h1 class="main-header">🔎 Stock Screener</h1>', unsafe_allow_html=True)
+
+    panel = get_universe_panel()
+    if len(panel) == 0:
+        st.info(
+            "No local history yet. Browse a few symbols on the main page, or store a universe with\n\n"
+            f"`python batch.py snapshot --tickers-file universe.txt --output-dir {SCREENER_SETTINGS['universe_dir']}`"
+        )
+        return
+
+    st.caption(
+        f"Universe: {len(panel):,} symbols, up to {panel.depth:,} daily bars each "
+        f"({panel.start:%Y-%m-%d} → {panel.end:%Y-%m-%d}), values as of each symbol's latest bar"
+    )
+
+    expression = st.text_input("Filter", value=DEFAULT_FILTER, key="screener_filter")
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        sort_by = st.text_input("Rank by (blank = first indicator)", value="", key="screener_sort")
+    with col2:
+        ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+    with col3:
+        limit = st.number_input("Max results", min_value=1, value=SCREENER_SETTINGS["max_results"])
+
+    with st.expander("Filter syntax"):
+        st.write(f"""
+        Compare indicators with `<, <=, >, >=, ==, !=` and combine with `and` / `or`.
+
+        **Indicators:** {', '.join(f'`{name}`' for name in FUNCTIONS)}
+        - `MA(n)`, `RSI(n)`, `MAX(n)`, `MIN(n)` over the last n bars
+        - `VOL(n)`: annualised volatility of the last n daily returns
+        - `RET(n)`: % return over the last n bars
+        - `SHARPE`, `DRAWDOWN`: over the whole history, as in the statistics table
+
+        Values from `TECHNICAL_INDICATORS` can be used as numbers, e.g. `RSI() > RSI_OVERBOUGHT`,
+        `MA(MA_SHORT) > MA(MA_LONG)`.
+        """)
+
+    try:
+        results = run_screen(panel, expression, sort_by=sort_by or None, ascending=ascending)
+    except ScreenerError as e:
+        st.error(f"Invalid filter: {e}")
+        return
+
+    st.subheader(f"{len(results)} matching symbols")
+    st.dataframe(results.head(int(limit)).round(2), use_container_width=True, hide_index=True)
+
+
+render_screener()
@@ -0,0 +1,66 @@
+"""
+TickerTrek - Bulk Export page
+Full price history plus indicators for a watchlist, zipped per symbol as CSV or Parquet
+"""
+
+import os
+
+import streamlit as st
+
+from config import PAGE_CONFIG, CUSTOM_CSS, PERIOD_OPTIONS
+from export import export_to_tempfile, parse_symbols, EXPORT_FORMATS, MAX_DOWNLOAD_BYTES
+
+EXPORT_PERIODS = {**PERIOD_OPTIONS, "5 Years": "5y", "10 Years": "10y", "Max": "max"}
+
+
+def render_export():
+    st.set_page_config(**{**PAGE_CONFIG, "page_title": "TickerTrek - Export"})
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown('<h1 class="main-header">📦 Bulk Export</h1>', unsafe_allow_html=True)
+
+    symbols_text = st.text_area(
+        "Symbols",
+        value=st.session_state.get("stock_symbol", "NVDA"),
+        help="Comma or space separated, e.g. AAPL, MSFT, NVDA"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        period_label = st.selectbox("Period", list(EXPORT_PERIODS), index=list(EXPORT_PERIODS).index("Max"))
+    with col2:
+        file_format = st.radio("Format", EXPORT_FORMATS, horizontal=True, format_func=str.upper)
+    st.caption("Each symbol is written as its own file with OHLCV, moving averages, RSI and Bollinger bands.")
+
+    symbols = parse_symbols(symbols_text)
+    if not st.button("Build export", disabled=not symbols):
+        return
+
+    progress = st.progress(0.0)
+    path, results = export_to_tempfile(
+        symbols, EXPORT_PERIODS[period_label], file_format,
+        progress=lambda i, total, symbol: progress.progress(i / total, text=f"{symbol} ({i}/{total})")
+    )
+    try:
+        failed = {symbol: error for symbol, error in results.items() if error}
+        for symbol, error in failed.items():
+            st.warning(f"{symbol} skipped: {error}")
+        size = os.path.getsize(path)
+        if len(failed) < len(results) and size > MAX_DOWNLOAD_BYTES:
+            st.error(
+                f"The export is {size / 1e6:.1f} MB, over the {MAX_DOWNLOAD_BYTES / 1e6:.0f} MB in-page download limit. "
+                f"Export fewer symbols or a shorter period, or run "
+                f"`python batch.py export --tickers {' '.join(symbols)} --period {EXPORT_PERIODS[period_label]} "
+                f"--format {file_format} --output export.zip` to write it straight to disk."
+            )
+        elif len(failed) < len(results):
+            with open(path, "rb") as f:
+                st.download_button(
+                    label=f"Download {len(results) - len(failed)} symbols (.zip, {size / 1e6:.1f} MB)",
+                    data=f,
+                    file_name=f"tickertrek_export_{file_format}.zip",
+                    mime="application/zip"
+                )
+    finally:
+        os.remove(path)
+
+
+render_export()
@@ -0,0 +1,131 @@
+"""
+TickerTrek - Admin page
+What the process caches and the open sessions hold in memory, with manual eviction
+"""
+
+import pandas as pd
+import streamlit as st
+
+from config import PAGE_CONFIG, CUSTOM_CSS
+from inventory import TIERS, cache_inventory, inventory_totals, evict
+from service_client import service_url, fetch_json, post_json
+from utils import format_bytes
+
+
+def load_inventory():
+    """(entries, totals) from the data service when one is configured, otherwise from this process"""
+    if service_url():
+        payload = fetch_json("/cache")
+        return payload["entries"], payload["totals"]
+    rows = cache_inventory()
+    return rows, inventory_totals(rows)
+
+
+def evict_entry(row) -> bool:
+    params = {key: row[key] for key in ("tier", "symbol", "period", "interval")}
+    if service_url():
+        return post_json("/cache/evict", **params)["evicted"]
+    return evict(**params)
+
+
+def evict_clicked(row, label: str):
+    """Runs before the rerun it triggers, so the listing below already reflects the eviction"""
+    try:
+        evicted = evict_entry(row)
+    except OSError as e:
+        st.session_state["admin_message"] = ("error", f"Could not evict {label}: {e}")
+        return
+    st.session_state["admin_message"] = (
+        ("success", f"Evicted {label}") if evicted else ("warning", f"{label} was no longer cached")
+    )
+
+
+def session_footprints() -> pd.DataFrame:
+    """st.session_state size per open session (deep size, as Streamlit's own stats measure it)"""
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    from streamlit.vendor.pympler.asizeof import asizeof
+
+    # No public listing of sessions; this is what Streamlit's SessionStateStatProvider iterates
+    session_mgr = getattr(Runtime.instance(), "_session_mgr", None) if Runtime.exists() else None
+    if session_mgr is None or not hasattr(session_mgr, "list_active_sessions"):
+        return pd.DataFrame()
+    ctx = get_script_run_ctx()
+    rows = []
+    for session_info in session_mgr.list_active_sessions():
+        session = session_info.session
+        state = session.session_state.filtered_state
+        sizes = {key: asizeof(value) for key, value in state.items()}
+        largest = sorted(sizes, key=sizes.get, reverse=True)[:3]
+        rows.append({
+            "Session": session.id[:8] + (" (this one)" if ctx is not None and session.id == ctx.session_id else ""),
+            "Keys": len(state),
+            "Bytes": sum(sizes.values()),
+            "Largest keys": ", ".join(f"{key} ({format_bytes(sizes[key])})" for key in largest),
+        })
+    return pd.DataFrame(rows)
+
+
+def render_admin():
+    st.set_page_config(**{**PAGE_CONFIG, "page_title": "TickerTrek - Admin"})
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown('<h1 class="main-header">🧰 Admin</h1>', unsafe_allow_html=True)
+
+    try:
+        rows, totals = load_inventory()
+    except OSError as e:
+        st.error(f"Data service at {service_url()} is unavailable: {e}")
+        return
+    st.caption(f"Caches of {'the data service at ' + service_url() if service_url() else 'this process'}")
+
+    st.subheader("🗄️ Cache tiers")
+    cols = st.columns(3)
+    cols[0].metric("Entries", f"{sum(t['entries'] for t in totals.values()):,}")
+    cols[1].metric("Memory", format_bytes(sum(t['bytes'] for t in totals.values())))
+    cols[2].metric("Hits", f"{sum(t['hits'] for t in totals.values()):,}")
+    st.dataframe(pd.DataFrame([
+        {"Tier": tier, "Holds": TIERS.get(tier, ""), "Entries": t["entries"],
+         "Memory": format_bytes(t["bytes"]), "Hits": t["hits"]}
+        for tier, t in totals.items()
+    ]), use_container_width=True, hide_index=True)
+
+    st.subheader("📋 Cached entries")
+    message = st.session_state.pop("admin_message", None)
+    if message:
+        getattr(st, message[0])(message[1])
+    if not rows:
+        st.info("Nothing cached yet.")
+    else:
+        entries = pd.DataFrame(rows).sort_values("bytes", ascending=False)  # index stays the position in rows
+        # A new filter changes the entry list, so the selected position no longer means the same entry
+        tiers = st.multiselect("Tiers", list(TIERS), default=list(TIERS), key="admin_tiers",
+                               on_change=st.session_state.pop, args=("admin_entry", None))
+        shown = entries[entries["tier"].isin(tiers)]
+        st.dataframe(shown.assign(bytes=shown["bytes"].map(format_bytes)).rename(columns={
+            "tier": "Tier", "symbol": "Symbol", "period": "Period", "interval": "Interval", "bytes": "Memory",
+            "age": "Age (s)", "hits": "Hits", "last_access": "Last access (s ago)", "expires_in": "Expires in (s)",
+        }).round(1), use_container_width=True, hide_index=True)
+
+        choices = [rows[i] for i in shown.index]
+        labels = [" · ".join(str(row[key]) for key in ("tier", "symbol", "period", "interval") if row[key])
+                  for row in choices]
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            choice = st.selectbox("Entry", range(len(labels)), format_func=labels.__getitem__, key="admin_entry")
+        with col2:
+            st.write("")
+            st.button("Evict", disabled=choice is None, on_click=evict_clicked,
+                      args=(choices[choice], labels[choice]) if choice is not None else None)
+
+    st.subheader("👥 Session state")
+    sessions = session_footprints()
+    if sessions.empty:
+        st.info("Session sizes are only available when running under `streamlit run`.")
+    else:
+        st.metric("Total session state", format_bytes(sessions["Bytes"].sum()),
+                  f"{len(sessions)} open sessions", delta_color="off")
+        st.dataframe(sessions.assign(Bytes=sessions["Bytes"].map(format_bytes)).rename(columns={"Bytes": "Memory"}),
+                     use_container_width=True, hide_index=True)
+
+
+render_admin()
@@ -0,0 +1,115 @@
+"""
+Warm-start prefetch
+Loads the quick-select symbols (and an optional hot list) into the history cache
+when the server starts, then refreshes them in the background before they expire
+(which, outside trading hours, is not until the exchange's next open),
+so quick-select clicks are always served from cache
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from config import POPULAR_STOCKS, PREFETCH_SETTINGS, RISK_SETTINGS
+from data_etl import StockDataManage
+from service_client import service_url
+from telemetry import counter, gauge
+
+logger = logging.getLogger(__name__)
+
+HOT_LIST_ENV = "TICKERTREK_HOT_LIST"
+
+PREFETCH_FETCHES = counter(
+    "tickertrek_prefetch_fetches_total", "Background prefetch fetches by result (ok/failed)", ["result"]
+)
+PREFETCH_LAST_PASS = gauge(
+    "tickertrek_prefetch_last_pass_timestamp_seconds", "Unix time of the last completed prefetch pass"
+)
+
+_started = False
+_start_lock = threading.Lock()
+# symbol -> (consecutive failed fetches, time before which it is not retried)
+_backoff: Dict[str, Tuple[int, float]] = {}
+_backoff_lock = threading.Lock()
+
+
+def hot_symbols() -> List[str]:
+    """POPULAR_STOCKS, the risk benchmarks, the configured hot list and TICKERTREK_HOT_LIST, without duplicates"""
+    symbols = list(POPULAR_STOCKS.values()) + list(RISK_SETTINGS["benchmarks"].values())
+    symbols += list(PREFETCH_SETTINGS.get("hot_list", []))
+    symbols += [part for part in os.environ.get(HOT_LIST_ENV, "").split(",")]
+    return list(dict.fromkeys(symbol.upper().strip() for symbol in symbols if symbol.strip()))
+
+
+def due_symbols(symbols: List[str], period: str, lead: float) -> List[str]:
+    """Symbols whose cached history is missing or expires within `lead` seconds, unless backing off after failures"""
+    due = []
+    now = time.time()
+    with _backoff_lock:
+        backing_off = {symbol for symbol, (_, retry_at) in _backoff.items() if retry_at > now}
+    for symbol in symbols:
+        if symbol in backing_off:
+            continue
+        expires_in = StockDataManage.history_expires_in(symbol, period)
+        if expires_in is None or expires_in <= lead:
+            due.append(symbol)
+    return due
+
+
+def _fetch(symbol: str, period: str) -> bool:
+    try:
+        ok = bool(StockDataManage.refresh_history(symbol, period).is_valid())
+    except Exception as e:
+        logger.warning("Prefetch of %s failed: %s", symbol, e)
+        ok = False
+    PREFETCH_FETCHES.inc(result="ok" if ok else "failed")
+    _record_outcome(symbol, ok)
+    return ok
+
+
+def _record_outcome(symbol: str, ok: bool):
+    """Reset a symbol's backoff on success; otherwise double it, from check_interval up to max_backoff"""
+    with _backoff_lock:
+        if ok:
+            _backoff.pop(symbol, None)
+            return
+        failures = _backoff.get(symbol, (0, 0.0))[0] + 1
+        delay = min(PREFETCH_SETTINGS["max_backoff"], PREFETCH_SETTINGS["check_interval"] * 2 ** (failures - 1))
+        _backoff[symbol] = (failures, time.time() + delay)
+    if failures > 1:
+        logger.info("Prefetch of %s failed %d times in a row, next try in %.0fs", symbol, failures, delay)
+
+
+def prefetch_pass(symbols: List[str], period: str, lead: float, workers: int) -> Dict[str, bool]:
+    """Refresh every due symbol; returns symbol -> success"""
+    due = due_symbols(symbols, period, lead)
+    if not due:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch") as pool:
+        results = dict(zip(due, pool.map(lambda symbol: _fetch(symbol, period), due)))
+    PREFETCH_LAST_PASS.set(time.time())
+    logger.info("Prefetched %d/%d symbols", sum(results.values()), len(results))
+    return results
+
+
+def _run(settings: Dict):
+    while True:
+        try:
+            prefetch_pass(hot_symbols(), settings["period"], settings["lead"], settings["workers"])
+        except Exception:
+            logger.exception("Prefetch pass failed")
+        time.sleep(settings["check_interval"])
+
+
+def start_prefetch():
+    """Warm the cache and keep it warm from a daemon thread, once per process"""
+    global _started
+    with _start_lock:
+        # Workers using the data service leave prefetching to it
+        if _started or not PREFETCH_SETTINGS["enabled"] or service_url():
+            return
+        _started = True
+    threading.Thread(target=_run, args=(dict(PREFETCH_SETTINGS),), name="prefetch", daemon=True).start()
@@ -0,0 +1,98 @@
+"""
+Per-stage timing instrumentation
+Lightweight spans around each stage of a Streamlit rerun, kept per session for
+the debug panel and as a rolling process-wide window for p50/p95/p99 summaries
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from telemetry import histogram
+
+# Samples kept per stage for the process-wide percentile summary
+SAMPLE_WINDOW = 1000
+_SPANS_KEY = "_perf_spans"
+
+_samples: Dict[str, deque] = {}
+_samples_lock = threading.Lock()
+
+STAGE_SECONDS = histogram("tickertrek_render_stage_seconds", "Duration of each render pipeline stage", ["stage"])
+
+
+def _in_session() -> bool:
+    return get_script_run_ctx() is not None
+
+
+def begin_rerun():
+    """Start a fresh span list for the current session's rerun"""
+    if _in_session():
+        st.session_state[_SPANS_KEY] = []
+
+
+def begin_fragment_rerun():
+    """Start a fresh span list when only a fragment (not the whole script) is rerunning"""
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        st.session_state[_SPANS_KEY] = []
+
+
+def rerun_spans() -> List[Dict[str, Any]]:
+    """Spans recorded so far during the current session's rerun"""
+    if not _in_session():
+        return []
+    return st.session_state.get(_SPANS_KEY, [])
+
+
+@contextmanager
+def span(stage: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Time the enclosed block as `stage`
+
+    The yielded dict can be filled with extra attributes (e.g. cache status,
+    payload bytes) that are shown alongside the duration.
+    """
+    record = {"stage": stage, **attrs}
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        elapsed = time.perf_counter() - start
+        record["ms"] = elapsed * 1000
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        with _samples_lock:
+            _samples.setdefault(stage, deque(maxlen=SAMPLE_WINDOW)).append(record["ms"])
+        if _in_session():
+            st.session_state.setdefault(_SPANS_KEY, []).append(record)
+
+
+def payload_bytes(frame) -> int:
+    """Deep in-memory size of a DataFrame (0 for anything else)"""
+    if isinstance(frame, pd.DataFrame):
+        return int(frame.memory_usage(deep=True).sum())
+    return 0
+
+
+def stage_summary() -> pd.DataFrame:
+    """Rolling p50/p95/p99 (ms) per stage across all sessions of this process"""
+    with _samples_lock:
+        snapshot = {stage: np.fromiter(samples, dtype=float) for stage, samples in _samples.items()}
+
+    rows = []
+    for stage, values in sorted(snapshot.items()):
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        rows.append({"Stage": stage, "Samples": len(values), "p50 ms": round(p50, 2),
+                     "p95 ms": round(p95, 2), "p99 ms": round(p99, 2)})
+    return pd.DataFrame(rows, columns=["Stage", "Samples", "p50 ms", "p95 ms", "p99 ms"])
+
+
+def reset_samples():
+    with _samples_lock:
+        _samples.clear()
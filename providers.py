@@ -0,0 +1,174 @@
+"""
+Market data providers
+Where StockDataManage gets prices and company info from: Yahoo Finance (through
+the upstream rate limiter and circuit breaker) or recorded files for offline replay
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from columnar_store import ColumnarStore
+from config import DATA_SOURCE
+from resample import INTERVALS, resample_ohlcv, window_start
+from upstream import call_upstream
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_ENV = "TICKERTREK_PROVIDER"
+
+
+def _ticker(symbol: str):
+    """yfinance Ticker; yfinance is imported on first use to keep start-up fast"""
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+
+class YahooProvider:
+    """Live data from Yahoo Finance"""
+
+    name = "yahoo"
+
+    def history(self, symbol: str, period: str, interval: str) -> pd.DataFrame:
+        return call_upstream("history", _ticker(symbol).history, period=period, interval=interval)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        stock = _ticker(symbol)
+        return call_upstream("info", lambda: stock.info)
+
+    def quote(self, symbol: str) -> float:
+        fast_info = _ticker(symbol).fast_info
+        return float(call_upstream("quote", fast_info.get, "last_price", 0.0) or 0.0)
+
+
+class ReplayProvider:
+    """
+    Recorded data for offline runs and tests, no network access
+
+    Reads <SYMBOL>.parquet (daily bars, as written by `batch.py snapshot`), an
+    optional <SYMBOL>.1h.parquet for intraday periods, optional <SYMBOL>.1m.parquet
+    minute bars and an optional <SYMBOL>.info.json. Periods are cut from the end
+    of the recording; coarser intervals are resampled; intraday periods fall back
+    to daily bars when no hourly file exists. The quote is the last recorded close. `latency` seconds
+    are slept per call to stand in for upstream round trips in load tests.
+
+    Daily recordings are held compressed in a ColumnarStore (a whole recorded
+    universe stays resident) and only the requested window is decoded.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+        self._frames: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        self.store = ColumnarStore()
+
+    def _path(self, symbol: str, interval: str, extension: str = "parquet") -> str:
+        stem = symbol if interval == "1d" else f"{symbol}.{interval}"
+        return os.path.join(self.directory, f"{stem}.{extension}")
+
+    def _stored(self, symbol: str) -> bool:
+        """Whether the daily recording is in the store, loading it when new or changed"""
+        path = self._path(symbol, "1d")
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return False
+        if self.store.version(symbol) != mtime:
+            self.store.put(symbol, pd.read_parquet(path), version=mtime)
+        return True
+
+    def _load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        if interval == "1d":
+            return self.store.get(symbol) if self._stored(symbol) else None
+        path = self._path(symbol, interval)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._frames.get((symbol, interval))
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        frame = pd.read_parquet(path).sort_index()
+        with self._lock:
+            self._frames[(symbol, interval)] = (mtime, frame)
+        return frame
+
+    def _bars(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Recorded bars at `interval`, resampled from the finest recording that is not coarser"""
+        sources = reversed(INTERVALS[:INTERVALS.index(interval) + 1]) if interval in INTERVALS else [interval]
+        for source in sources:
+            frame = self._load(symbol, source)
+            if frame is not None:
+                return frame if source == interval else resample_ohlcv(frame, interval)
+        return None
+
+    def _wait(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def history(self, symbol: str, period: str, interval: str) -> pd.DataFrame:
+        self._wait()
+        if interval == "1d" and self._stored(symbol):
+            index = self.store.index(symbol)
+            return self.store.get(symbol, start=index[window_start(index, period)]) if len(index) else pd.DataFrame()
+        frame = self._bars(symbol, interval)
+        if frame is None and interval == "1h":
+            frame = self._bars(symbol, "1d")
+        if frame is None:
+            return pd.DataFrame()
+        return frame.iloc[window_start(frame.index, period):]
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        self._wait()
+        try:
+            with open(self._path(symbol, "1d", "info.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def quote(self, symbol: str) -> float:
+        self._wait()
+        frame = self._bars(symbol, "1h")
+        if frame is None and self._stored(symbol):
+            frame = self.store.get(symbol, ["Close"], tail=1)
+        if frame is None or frame.empty:
+            return 0.0
+        return float(frame["Close"].iloc[-1])
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name: str, replay_dir: Optional[str] = None, latency: Optional[float] = None):
+    if name == "yahoo":
+        return YahooProvider()
+    if name == "replay":
+        return ReplayProvider(replay_dir or DATA_SOURCE["replay_dir"],
+                              DATA_SOURCE["replay_latency"] if latency is None else latency)
+    raise ValueError(f"Unknown data provider {name!r}; choose 'yahoo' or 'replay'")
+
+
+def get_provider():
+    """The process-wide provider from DATA_SOURCE (or the TICKERTREK_PROVIDER environment variable)"""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = create_provider(os.environ.get(PROVIDER_ENV) or DATA_SOURCE["provider"])
+        return _provider
+
+
+def set_provider(provider):
+    """Replace the process-wide provider (e.g. the data service's --provider option)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,175 @@
+"""
+Resampling module
+Derives coarser OHLCV bars (1h -> 1d -> 1wk -> 1mo) and shorter periods from
+cached base bars, so changing the chart interval or period never needs another download
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import INTERVAL_OPTIONS, PERIOD_SUPERSETS
+
+# Finest to coarsest; a frame can only be resampled to an interval at or after its own
+INTERVALS = ["1h", "1d", "1wk", "1mo"]
+INTERVAL_LABELS = {"1h": "1 Hour", "1d": "1 Day", "1wk": "1 Week", "1mo": "1 Month"}
+# Extra columns and how they combine; anything else is dropped
+SUM_COLUMNS = ["Volume", "Dividends", "Stock Splits"]
+MAX_CACHED_FRAMES = 64
+# Periods served by trading days rather than calendar offsets
+TRADING_DAY_PERIODS = {"1d": 1, "5d": 5}
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+# Rough calendar length, only used to order periods
+PERIOD_DAYS = {"1d": 1, "5d": 7, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731,
+               "5y": 1827, "10y": 3653, "max": float("inf")}
+
+
+def base_interval(period: str) -> str:
+    """Interval fetched from upstream for a period: hourly for intraday periods, daily otherwise"""
+    return "1h" if INTERVAL_OPTIONS.get(period) == "1h" else "1d"
+
+
+def default_interval(period: str) -> str:
+    """Interval shown by default for a period, from INTERVAL_OPTIONS"""
+    return INTERVAL_OPTIONS.get(period, "1d")
+
+
+def superset_period(period: str) -> str:
+    """
+    Period actually fetched and cached for `period`
+
+    The longest window configured in PERIOD_SUPERSETS for the period's base
+    interval, or the period itself when it is longer or has no known length.
+    """
+    superset = PERIOD_SUPERSETS.get(base_interval(period), period)
+    if period not in PERIOD_DAYS or PERIOD_DAYS[period] > PERIOD_DAYS.get(superset, 0):
+        return period
+    return superset
+
+
+def window_start(index: pd.DatetimeIndex, period: str) -> int:
+    """Position of the first bar of the trailing `period` window in a sorted index"""
+    if len(index) == 0:
+        return 0
+    if period in TRADING_DAY_PERIODS:
+        days = (index.tz_localize(None) if index.tz is not None else index).normalize().asi8
+        session_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        return int(session_starts[max(0, len(session_starts) - TRADING_DAY_PERIODS[period])])
+    if period in PERIOD_OFFSETS:
+        cutoff = index[-1].normalize() - PERIOD_OFFSETS[period]
+        return int(index.searchsorted(cutoff, side="left"))
+    return 0
+
+
+def available_intervals(period: str) -> List[str]:
+    """Intervals that can be derived locally from the period's base bars"""
+    return INTERVALS[INTERVALS.index(base_interval(period)):]
+
+
+def _bin_starts(index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """Start of the bin each timestamp falls in, as naive local (exchange) wall-clock time"""
+    if index.tz is not None:
+        # bin on wall-clock time so DST changes do not split days, weeks or months
+        index = index.tz_localize(None)
+    if interval == "1h":
+        return index.floor("h")
+    day = index.normalize()
+    if interval == "1d":
+        return day
+    if interval == "1wk":
+        return day - pd.to_timedelta(index.dayofweek, unit="D")
+    if interval == "1mo":
+        return day - pd.to_timedelta(index.day - 1, unit="D")
+    raise ValueError(f"Unsupported interval {interval!r}; choose from {', '.join(INTERVALS)}")
+
+
+def resample_ohlcv(frame: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate sorted OHLCV bars into `interval` bars
+
+    Open is the first open, High the max, Low the min, Close the last close and
+    Volume (plus Dividends / Stock Splits when present) the sum within each bin.
+    Bins are labelled with their start and contain only bars that exist, so
+    non-trading days never produce empty bars.
+    """
+    frame = frame.dropna(subset=["Open", "High", "Low", "Close"])
+    if frame.empty:
+        return frame
+
+    keys = _bin_starts(frame.index, interval).asi8
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)] - 1
+
+    columns = {
+        "Open": frame["Open"].to_numpy()[starts],
+        "High": np.maximum.reduceat(frame["High"].to_numpy(), starts),
+        "Low": np.minimum.reduceat(frame["Low"].to_numpy(), starts),
+        "Close": frame["Close"].to_numpy()[ends],
+    }
+    for column in SUM_COLUMNS:
+        if column in frame.columns:
+            columns[column] = np.add.reduceat(frame[column].fillna(0).to_numpy(), starts)
+
+    index = _bin_starts(frame.index[starts], interval)
+    if frame.index.tz is not None:
+        index = index.tz_localize(frame.index.tz, ambiguous=True, nonexistent="shift_forward")
+    index.name = frame.index.name
+    return pd.DataFrame(columns, index=index)
+
+
+# (symbol, period, interval) -> [fetched_at of the base bars, frame, hits, last access]
+_cache: "OrderedDict[Tuple, list]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def resampled(symbol: str, period: str, frame: pd.DataFrame, fetched_at: float, interval: str) -> pd.DataFrame:
+    """
+    `frame` (the period's base bars) at `interval`, cached per symbol/period/interval
+
+    Results are reused until the base bars are refetched (a different fetched_at).
+    """
+    if interval == base_interval(period):
+        return frame
+    if interval not in available_intervals(period):
+        raise ValueError(f"Interval {interval!r} cannot be derived from {base_interval(period)!r} bars")
+
+    key = (symbol, period, interval)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == fetched_at:
+            _cache.move_to_end(key)
+            cached[2] += 1
+            cached[3] = time.time()
+            return cached[1]
+
+    result = resample_ohlcv(frame, interval)
+    with _lock:
+        _cache[key] = [fetched_at, result, 0, time.time()]
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_FRAMES:
+            _cache.popitem(last=False)
+    return result
+
+
+def resampled_items() -> List[Tuple[Tuple, list]]:
+    """Snapshot of ((symbol, period, interval), [fetched_at, frame, hits, last_access]) pairs"""
+    with _lock:
+        return [(key, list(value)) for key, value in _cache.items()]
+
+
+def evict_resampled(key: Tuple) -> bool:
+    with _lock:
+        return _cache.pop(key, None) is not None
+
+
+def clear_resampled():
+    with _lock:
+        _cache.clear()
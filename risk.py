@@ -0,0 +1,155 @@
+"""
+Risk analytics module
+Return-distribution and benchmark-relative risk metrics on daily closes,
+memoized per data version so reruns reuse them until the data is refetched
+"""
+
+from statistics import NormalDist
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from analytics import calculate_sharpe_ratio, calculate_max_drawdown
+from cache import LRUMemo
+from config import RISK_SETTINGS
+from market_calendar import resolve_exchange
+
+TRADING_DAYS = 252
+MAX_MEMOIZED = 128
+# Labels of the metrics that need the benchmark
+RELATIVE_METRICS = ['Beta', 'Alpha (annual)', 'Correlation', 'Upside Capture', 'Downside Capture']
+
+
+def benchmark_symbol(symbol: str) -> Optional[str]:
+    """Index a symbol is measured against, from its exchange (None when none is configured)"""
+    return RISK_SETTINGS["benchmarks"].get(resolve_exchange(symbol))
+
+
+def _daily_returns(close: pd.Series) -> np.ndarray:
+    prices = close.to_numpy(dtype=float)
+    returns = prices[1:] / prices[:-1] - 1
+    return returns[np.isfinite(returns)]
+
+
+def value_at_risk(returns: np.ndarray, confidence: float) -> Dict[str, float]:
+    """One-day VaR and CVaR (expected shortfall) as positive loss percentages"""
+    tail_probability = 1 - confidence
+    cutoff = np.quantile(returns, tail_probability)
+    mean, std = returns.mean(), returns.std(ddof=1)
+    z = NormalDist().inv_cdf(tail_probability)
+    return {
+        'VaR (historical)': -cutoff * 100,
+        'CVaR (historical)': -returns[returns <= cutoff].mean() * 100,
+        'VaR (parametric)': -(mean + z * std) * 100,
+        'CVaR (parametric)': -(mean - std * NormalDist().pdf(z) / tail_probability) * 100,
+    }
+
+
+def sortino_ratio(returns: np.ndarray, risk_free_rate: float) -> float:
+    """Annualised excess return over downside deviation (shortfall below the risk-free rate)"""
+    shortfall = np.minimum(returns - risk_free_rate / TRADING_DAYS, 0)
+    downside = np.sqrt(np.mean(shortfall ** 2))
+    if downside == 0:
+        return 0.0
+    return (returns.mean() * TRADING_DAYS - risk_free_rate) / (downside * np.sqrt(TRADING_DAYS))
+
+
+def calmar_ratio(close: pd.Series) -> Dict[str, float]:
+    """Compound annual growth rate (%) and its ratio to the maximum drawdown"""
+    prices = close.to_numpy(dtype=float)
+    cagr = (prices[-1] / prices[0]) ** (TRADING_DAYS / (len(prices) - 1)) - 1
+    max_drawdown = calculate_max_drawdown(close) / 100
+    return {
+        'CAGR': cagr * 100,
+        'Calmar Ratio': cagr / abs(max_drawdown) if max_drawdown < 0 else 0.0,
+    }
+
+
+def _by_date(close: pd.Series) -> pd.Series:
+    """Closes keyed by the exchange-local trading date, so indices on other exchanges line up"""
+    index = close.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return pd.Series(close.to_numpy(dtype=float), index=index.normalize())
+
+
+def relative_metrics(close: pd.Series, benchmark_close: pd.Series, risk_free_rate: float) -> Dict[str, float]:
+    """Beta, Jensen's alpha (annual %), correlation and up/down capture (%) on common trading dates"""
+    aligned = pd.concat([_by_date(close), _by_date(benchmark_close)], axis=1, join="inner").to_numpy()
+    returns = aligned[1:] / aligned[:-1] - 1
+    returns = returns[np.isfinite(returns).all(axis=1)]
+    if len(returns) < 2:
+        return {}
+    stock, index = returns[:, 0], returns[:, 1]
+    variance = index.var(ddof=1)
+    if variance == 0:
+        return {}
+
+    beta = np.cov(stock, index, ddof=1)[0, 1] / variance
+    daily_rf = risk_free_rate / TRADING_DAYS
+    alpha = (stock.mean() - daily_rf - beta * (index.mean() - daily_rf)) * TRADING_DAYS
+    up, down = index > 0, index < 0
+    return {
+        'Beta': beta,
+        'Alpha (annual)': alpha * 100,
+        'Correlation': np.corrcoef(stock, index)[0, 1],
+        'Upside Capture': stock[up].mean() / index[up].mean() * 100 if up.any() else np.nan,
+        'Downside Capture': stock[down].mean() / index[down].mean() * 100 if down.any() else np.nan,
+    }
+
+
+def compute_risk_metrics(close: pd.Series, benchmark_close: Optional[pd.Series] = None,
+                         confidence: Optional[float] = None,
+                         risk_free_rate: Optional[float] = None) -> Dict[str, float]:
+    """All risk metrics for daily closes, keyed by their display labels; benchmark ones need benchmark_close"""
+    confidence = RISK_SETTINGS["confidence"] if confidence is None else confidence
+    risk_free_rate = RISK_SETTINGS["risk_free_rate"] if risk_free_rate is None else risk_free_rate
+    returns = _daily_returns(close)
+    if len(returns) < 2:
+        return {}
+
+    metrics = value_at_risk(returns, confidence)
+    metrics['Sortino Ratio'] = sortino_ratio(returns, risk_free_rate)
+    metrics.update(calmar_ratio(close))
+    if benchmark_close is not None and len(benchmark_close) > 2:
+        metrics.update(relative_metrics(close, benchmark_close, risk_free_rate))
+    return {name: float(value) for name, value in metrics.items()}
+
+
+def compute_returns_analysis(close: pd.Series) -> Dict[str, float]:
+    """Daily return mean/std, Sharpe ratio and maximum drawdown (as a fraction)"""
+    returns = close.pct_change().dropna()
+    return {
+        'daily_return_mean': returns.mean(),
+        'daily_return_std': returns.std(),
+        'sharpe_ratio': calculate_sharpe_ratio(returns, RISK_SETTINGS["risk_free_rate"]),
+        'max_draw_down': calculate_max_drawdown(close) / 100,
+    }
+
+
+_memo = LRUMemo(MAX_MEMOIZED)
+
+
+def _version(stock_data) -> Hashable:
+    """Identity of a StockData's contents: the same fetch and the same window of it"""
+    data = stock_data.data
+    return stock_data.symbol, stock_data.fetched_at, len(data), data.index[-1] if len(data) else None
+
+
+def returns_analysis(stock_data) -> Dict[str, float]:
+    """compute_returns_analysis for a StockData, reused until its data is refetched"""
+    return _memo.get(("returns", _version(stock_data)),
+                     lambda: compute_returns_analysis(stock_data.data['Close']))
+
+
+def risk_analysis(stock_data, benchmark=None) -> Dict[str, float]:
+    """compute_risk_metrics for a StockData (and optional benchmark StockData), reused until either is refetched"""
+    benchmark_version = _version(benchmark) if benchmark is not None else None
+    benchmark_close = benchmark.data['Close'] if benchmark is not None else None
+    return _memo.get(("risk", _version(stock_data), benchmark_version),
+                     lambda: compute_risk_metrics(stock_data.data['Close'], benchmark_close))
+
+
+def clear_risk_memo():
+    _memo.clear()
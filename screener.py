@@ -0,0 +1,424 @@
+"""
+Stock screener module
+Evaluates filters such as  RSI(14) < 30 and CLOSE > MA(200) and VOL(30) < 0.4
+as columnar array operations over a dates x symbols panel of locally stored
+history (cached symbols plus the snapshot directory), with no upstream calls
+"""
+
+import os
+import re
+import threading
+import warnings
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import ColumnarStore
+from config import SCREENER_SETTINGS, TECHNICAL_INDICATORS
+from data_etl import StockDataManage
+
+TRADING_DAYS = 252
+RISK_FREE_RETURN = 0.02  # same default as analytics.calculate_sharpe_ratio
+
+
+class ScreenerError(ValueError):
+    """Raised for filter expressions that cannot be parsed or evaluated"""
+
+
+class Panel:
+    """
+    Bars-ago x symbols float arrays per OHLCV field, built on demand
+
+    Each symbol's own bars are right-aligned, so row -1 is every symbol's latest
+    bar and windows never mix in another exchange's sessions or holidays.
+    Shorter histories are padded with NaN at the top. Symbols in `histories`
+    are sliced from frames already in memory; the rest of `store` are decoded
+    from the compressed store for just the rows a filter reads, and the decoded
+    arrays are dropped again by release(), so only the store stays resident.
+    """
+
+    def __init__(self, histories: Dict[str, pd.DataFrame], store: Optional[ColumnarStore] = None):
+        self._frames = {symbol: frame for symbol, frame in histories.items() if not frame.empty}
+        self._store = store
+        spans = {symbol: (len(frame), frame.index[0], frame.index[-1]) for symbol, frame in self._frames.items()}
+        for symbol in (store.symbols() if store is not None else []):
+            if symbol not in spans:
+                rows, first, last = store.span(symbol)
+                if rows:
+                    spans[symbol] = (rows, first, last)
+        self.symbols = pd.Index(sorted(spans))
+        self._lengths = np.array([spans[symbol][0] for symbol in self.symbols], dtype=int)
+        self.depth = int(self._lengths.max()) if len(self._lengths) else 0
+        self.last_dates = pd.DatetimeIndex([_naive(spans[symbol][2]) for symbol in self.symbols])
+        self.start = min((_naive(span[1]) for span in spans.values()), default=None)
+        self.end = max(self.last_dates, default=None)
+        # field -> widest (rows x symbols) array decoded since the last release()
+        self._decoded: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _build(self, field: str, rows: int) -> np.ndarray:
+        block = np.full((rows, len(self.symbols)), np.nan)
+        for column, symbol in enumerate(self.symbols):
+            take = min(rows, self._lengths[column])
+            frame = self._frames.get(symbol)
+            if frame is not None:
+                values = frame[field].to_numpy(dtype=float)[-take:] if field in frame.columns else np.nan
+            else:
+                values = self._store.arrays(symbol, [field], tail=take)[1].get(field, np.nan)
+            block[rows - take:, column] = values
+        return block
+
+    def tail(self, field: str, rows: int) -> np.ndarray:
+        """The last `rows` bars of a field (at most depth)"""
+        rows = min(rows, self.depth)
+        with self._lock:
+            block = self._decoded.get(field)
+            if block is None or len(block) < rows:
+                block = self._decoded[field] = self._build(field, rows)
+        return block[len(block) - rows:]
+
+    def column(self, field: str) -> np.ndarray:
+        """A field over every bar"""
+        return self.tail(field, self.depth)
+
+    def release(self):
+        with self._lock:
+            self._decoded.clear()
+
+
+def _naive(timestamp: pd.Timestamp) -> pd.Timestamp:
+    """Drop the exchange timezone so dates from different markets compare"""
+    return timestamp.tz_localize(None) if timestamp.tzinfo is not None else timestamp
+
+
+# Indicator functions: (panel, argument) -> value per symbol at its latest bar.
+# Window semantics follow utils.py (simple rolling means, NaN until the window is full).
+
+def _field(name: str) -> Callable[[Panel, Optional[float]], np.ndarray]:
+    def latest(panel: Panel, _arg=None) -> np.ndarray:
+        return panel.tail(name, 1)[-1]
+    return latest
+
+
+def _window(panel: Panel, n: int) -> np.ndarray:
+    if n < 1:
+        raise ScreenerError("Window lengths must be at least 1")
+    if panel.depth < n:
+        return np.full((n, len(panel)), np.nan)
+    return panel.tail("Close", n)
+
+
+def _ma(panel: Panel, n) -> np.ndarray:
+    return _window(panel, int(n)).mean(axis=0)
+
+
+def _rsi(panel: Panel, n) -> np.ndarray:
+    delta = np.diff(_window(panel, int(n) + 1), axis=0)
+    gain = np.where(delta > 0, delta, 0.0).mean(axis=0)
+    loss = np.where(delta < 0, -delta, 0.0).mean(axis=0)
+    gain[np.isnan(delta).any(axis=0)] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def _returns(prices: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices[1:] / prices[:-1] - 1
+
+
+def _vol(panel: Panel, n) -> np.ndarray:
+    """Annualised volatility of the last n daily returns"""
+    return _returns(_window(panel, int(n) + 1)).std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+
+
+def _ret(panel: Panel, n) -> np.ndarray:
+    """Percent return over the last n bars"""
+    window = _window(panel, int(n) + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (window[-1] / window[0] - 1) * 100
+
+
+def _max(panel: Panel, n) -> np.ndarray:
+    return _window(panel, int(n)).max(axis=0)
+
+
+def _min(panel: Panel, n) -> np.ndarray:
+    return _window(panel, int(n)).min(axis=0)
+
+
+def _sharpe(panel: Panel, _arg=None) -> np.ndarray:
+    """Same definition as analytics.calculate_sharpe_ratio, over each symbol's full history"""
+    returns = _returns(panel.column("Close"))
+    with warnings.catch_warnings():
+        # All-NaN columns (symbols with no data in range) legitimately yield NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        excess = np.nanmean(returns, axis=0) * TRADING_DAYS - RISK_FREE_RETURN
+        return excess / (np.nanstd(returns, axis=0, ddof=1) * np.sqrt(TRADING_DAYS))
+
+
+def _drawdown(panel: Panel, _arg=None) -> np.ndarray:
+    """Same definition as analytics.calculate_max_drawdown (percent, <= 0)"""
+    close = panel.column("Close")
+    peak = np.fmax.accumulate(close, axis=0)
+    with warnings.catch_warnings():
+        # All-NaN columns (symbols with no data in range) legitimately yield NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmin((close - peak) / peak * 100, axis=0)
+
+
+# name -> (function, default argument)
+FUNCTIONS: Dict[str, Tuple[Callable, Optional[float]]] = {
+    "CLOSE": (_field("Close"), None),
+    "OPEN": (_field("Open"), None),
+    "HIGH": (_field("High"), None),
+    "LOW": (_field("Low"), None),
+    "VOLUME": (_field("Volume"), None),
+    "MA": (_ma, TECHNICAL_INDICATORS["MA_LONG"]),
+    "RSI": (_rsi, TECHNICAL_INDICATORS["RSI_PERIOD"]),
+    "VOL": (_vol, 30),
+    "RET": (_ret, 20),
+    "MAX": (_max, TRADING_DAYS),
+    "MIN": (_min, TRADING_DAYS),
+    "SHARPE": (_sharpe, None),
+    "DRAWDOWN": (_drawdown, None),
+}
+
+# Config values usable as constants, e.g.  RSI() < RSI_OVERSOLD  or  MA(MA_SHORT) > MA(MA_LONG)
+CONSTANTS: Dict[str, float] = dict(TECHNICAL_INDICATORS)
+
+COMPARATORS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater,
+    ">=": np.greater_equal, "==": np.equal, "!=": np.not_equal,
+}
+
+_TOKEN = re.compile(r"\s*(?:(-?\d+(?:\.\d+)?)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|<|>)|([(),]))")
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match or match.end() == position:
+            raise ScreenerError(f"Unexpected input at: {expression[position:position + 15]!r}")
+        number, name, comparator, punct = match.groups()
+        if number is not None:
+            tokens.append(("number", number))
+        elif name is not None:
+            lowered = name.lower()
+            tokens.append(("logic", lowered) if lowered in ("and", "or") else ("name", name.upper()))
+        elif comparator is not None:
+            tokens.append(("cmp", comparator))
+        else:
+            tokens.append((punct, punct))
+        position = match.end()
+    return tokens
+
+
+class Term:
+    """A number, config constant or indicator call such as RSI(14)"""
+
+    def __init__(self, name: Optional[str], arg: Optional[float], value: Optional[float] = None):
+        self.name = name
+        self.arg = arg
+        self.value = value
+
+    @property
+    def label(self) -> str:
+        if self.name is None:
+            return f"{self.value:g}"
+        if self.arg is None:
+            return self.name
+        return f"{self.name}({self.arg:g})"
+
+    def evaluate(self, panel: Panel) -> np.ndarray:
+        if self.name is None:
+            return np.full(len(panel), self.value, dtype=float)
+        function, _ = FUNCTIONS[self.name]
+        return np.asarray(function(panel, self.arg), dtype=float)
+
+
+class _Parser:
+    """expr := and_expr ('or' and_expr)* ; and_expr := cmp ('and' cmp)* ; cmp := term OP term"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+        self.terms: List[Term] = []
+
+    def _peek(self) -> Tuple[str, str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else ("end", "")
+
+    def _take(self, kind: str) -> str:
+        token_kind, value = self._peek()
+        if token_kind != kind:
+            raise ScreenerError(f"Expected {kind} but found {value or 'end of expression'!r}")
+        self.position += 1
+        return value
+
+    def parse(self):
+        tree = self._or()
+        if self._peek()[0] != "end":
+            raise ScreenerError(f"Unexpected {self._peek()[1]!r}")
+        return tree
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek() == ("logic", "or"):
+            self.position += 1
+            nodes.append(self._and())
+        return ("or", nodes) if len(nodes) > 1 else nodes[0]
+
+    def _and(self):
+        nodes = [self._comparison()]
+        while self._peek() == ("logic", "and"):
+            self.position += 1
+            nodes.append(self._comparison())
+        return ("and", nodes) if len(nodes) > 1 else nodes[0]
+
+    def _comparison(self):
+        left = self._term()
+        comparator = self._take("cmp")
+        right = self._term()
+        return ("cmp", comparator, left, right)
+
+    def _number_or_constant(self) -> float:
+        kind, value = self._peek()
+        if kind == "number":
+            self.position += 1
+            return float(value)
+        if kind == "name" and value in CONSTANTS:
+            self.position += 1
+            return float(CONSTANTS[value])
+        raise ScreenerError(f"Expected a number or config constant, found {value!r}")
+
+    def _term(self) -> Term:
+        kind, value = self._peek()
+        if kind == "number" or (kind == "name" and value in CONSTANTS):
+            return Term(None, None, self._number_or_constant())
+
+        name = self._take("name")
+        if name not in FUNCTIONS:
+            raise ScreenerError(f"Unknown indicator {name!r}; available: {', '.join(FUNCTIONS)}")
+        arg = FUNCTIONS[name][1]
+        if self._peek()[0] == "(":
+            self.position += 1
+            if self._peek()[0] != ")":
+                arg = self._number_or_constant()
+            self._take(")")
+        term = Term(name, arg)
+        if all(existing.label != term.label for existing in self.terms):
+            self.terms.append(term)
+        return term
+
+
+def parse_expression(expression: str):
+    """Parse a filter into (tree, indicator terms referenced by it)"""
+    if not expression or not expression.strip():
+        raise ScreenerError("Empty filter expression")
+    parser = _Parser(_tokenize(expression))
+    tree = parser.parse()
+    return tree, parser.terms
+
+
+def parse_term(text: str) -> Term:
+    parser = _Parser(_tokenize(text))
+    term = parser._term()
+    if parser._peek()[0] != "end":
+        raise ScreenerError(f"Expected a single indicator, got {text!r}")
+    return term
+
+
+def _evaluate(tree, panel: Panel, values: Dict[str, np.ndarray]) -> np.ndarray:
+    kind = tree[0]
+    if kind == "cmp":
+        _, comparator, left, right = tree
+        left_values = values.get(left.label)
+        if left_values is None:
+            left_values = left.evaluate(panel)
+        right_values = values.get(right.label)
+        if right_values is None:
+            right_values = right.evaluate(panel)
+        with np.errstate(invalid="ignore"):
+            return COMPARATORS[comparator](left_values, right_values)
+    combine = np.logical_and if kind == "and" else np.logical_or
+    return combine.reduce([_evaluate(node, panel, values) for node in tree[1]])
+
+
+def run_screen(panel: Panel, expression: str, sort_by: Optional[str] = None,
+               ascending: bool = True, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Symbols passing `expression`, with the value of every indicator it references
+
+    Results are ranked by `sort_by` (an indicator such as "RSI(14)"), defaulting
+    to the first indicator in the expression.
+    """
+    tree, terms = parse_expression(expression)
+    sort_term = parse_term(sort_by) if sort_by else (terms[0] if terms else None)
+    if sort_term is not None and all(term.label != sort_term.label for term in terms):
+        terms.append(sort_term)
+
+    if len(panel) == 0:
+        return pd.DataFrame(columns=["Symbol", "As of"] + [term.label for term in terms])
+
+    try:
+        values = {term.label: term.evaluate(panel) for term in terms}
+        mask = _evaluate(tree, panel, values)
+    finally:
+        # Decoded windows are only needed while evaluating
+        panel.release()
+
+    result = pd.DataFrame({"Symbol": panel.symbols[mask], "As of": panel.last_dates[mask]})
+    for label, column in values.items():
+        result[label] = column[mask]
+    if sort_term is not None:
+        result = result.sort_values(sort_term.label, ascending=ascending, na_position="last")
+    if limit:
+        result = result.head(limit)
+    return result.reset_index(drop=True)
+
+
+# Snapshot histories, kept compressed between panel rebuilds so only changed files are re-read
+_universe = ColumnarStore()
+
+
+def universe_store() -> ColumnarStore:
+    return _universe
+
+
+def _universe_fingerprint(directory: str, cached: Dict[str, pd.DataFrame]) -> Tuple:
+    files = ()
+    if directory and os.path.isdir(directory):
+        files = tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns) for entry in os.scandir(directory) if entry.name.endswith(".parquet")
+        ))
+    return files, tuple(sorted((symbol, id(frame), len(frame)) for symbol, frame in cached.items()))
+
+
+_panel_memo: Dict[str, object] = {"fingerprint": None, "panel": None}
+_panel_lock = threading.Lock()
+
+
+def get_universe_panel(directory: Optional[str] = None) -> Panel:
+    """
+    Panel over the snapshot directory plus every symbol cached in this process
+
+    The panel is rebuilt only when a snapshot file or cached history changes;
+    cached (fresher) histories win over snapshot files for the same symbol.
+    Snapshot files are read into the compressed universe store, which the
+    panel decodes from on demand.
+    """
+    directory = directory if directory is not None else SCREENER_SETTINGS["universe_dir"]
+    cached = StockDataManage.cached_histories()
+    fingerprint = _universe_fingerprint(directory, cached)
+
+    with _panel_lock:
+        if _panel_memo["fingerprint"] != fingerprint:
+            _universe.sync_directory(directory)
+            _panel_memo["panel"] = Panel(cached, store=_universe)
+            _panel_memo["fingerprint"] = fingerprint
+        return _panel_memo["panel"]
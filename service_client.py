@@ -0,0 +1,90 @@
+"""
+Client side of the local market-data service (see data_service.py)
+Also holds the wire format: an Arrow IPC stream of the price history with the
+rest of the StockData fields as JSON in the schema metadata
+"""
+
+import json
+import os
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from config import DATA_SOURCE
+
+SERVICE_ENV = "TICKERTREK_DATA_SERVICE"
+META_KEY = b"tickertrek"
+CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+_service_url = os.environ.get(SERVICE_ENV) or DATA_SOURCE.get("service_url")
+
+
+def service_url() -> Optional[str]:
+    """Base URL of the data service this process uses, None to fetch locally"""
+    return _service_url
+
+
+def use_data_service(url: Optional[str]):
+    """Point this process at a data service (None: fetch locally, as the service itself does)"""
+    global _service_url
+    _service_url = url.rstrip("/") if url else None
+
+
+def encode_frame(frame: pd.DataFrame, meta: Dict[str, Any]) -> bytes:
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[META_KEY] = json.dumps(meta, default=str).encode()
+    table = table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_frame(payload: bytes) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(payload).read_all()
+    meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+    return table.to_pandas(), meta
+
+
+def _get(path: str, params: Dict[str, str], timeout: float) -> bytes:
+    url = f"{_service_url}{path}?{urllib.parse.urlencode(params)}"
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read()
+
+
+def fetch_stock(symbol: str, period: str, fetched_at: Optional[float] = None,
+                timeout: float = 30.0) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    (history, metadata) for symbol/period from the service; raises OSError when it is unreachable
+
+    With the `fetched_at` of a copy already held, the history comes back empty
+    (metadata "unchanged") when the service has not refetched it since.
+    """
+    params = {"symbol": symbol, "period": period}
+    if fetched_at is not None:
+        params["fetched_at"] = repr(fetched_at)
+    return decode_frame(_get("/stock", params, timeout))
+
+
+def fetch_minute_bars(symbol: str, timeout: float = 30.0) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """Today's 1-minute bars for symbol from the service"""
+    return decode_frame(_get("/minute", {"symbol": symbol}, timeout))
+
+
+def fetch_json(path: str, timeout: float = 30.0, **params) -> Dict[str, Any]:
+    return json.loads(_get(path, params, timeout))
+
+
+def post_json(path: str, timeout: float = 30.0, **params) -> Dict[str, Any]:
+    params = {key: value for key, value in params.items() if value is not None}
+    url = f"{_service_url}{path}?{urllib.parse.urlencode(params)}"
+    request = urllib.request.Request(url, data=b"", method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
@@ -1,10 +1,14 @@
 import streamlit as st
 from typing import Tuple
-from config import POPULAR_STOCKS, PERIOD_OPTIONS
+from config import POPULAR_STOCKS, PERIOD_OPTIONS, CACHE_SETTINGS, CHART_SETTINGS
+from metrics import render_upstream_status
+from data_etl import StockDataManage
+from resample import available_intervals, default_interval, INTERVAL_LABELS
+from overlays import OVERLAYS, OVERLAY_LABELS
 
 
-def render_sidebar() -> Tuple[str, str]:
-    # returns Tuple [stock_symbol, period, chart_options]
+def render_sidebar() -> Tuple[str, str, str, Tuple[str, ...]]:
+    # returns Tuple [stock_symbol, period, interval, chart overlays]
     st.sidebar.header("Stock Selection")
     stock_symbol = render_stock_input()
 
@@ -12,11 +16,12 @@ def render_sidebar() -> Tuple[str, str]:
 
     if selected_quick_stock:
         stock_symbol = selected_quick_stock
-    period = render_period_selections()
+    period, interval = render_period_selections()
+    overlays = render_chart_overlays()
 
     render_additional_tools()
 
-    return stock_symbol, period
+    return stock_symbol, period, interval, overlays
 
 
 def render_stock_input() -> str:
@@ -32,6 +37,7 @@ def render_stock_input() -> str:
     with col2:
         if st.button("GO"):
             st.cache_data.clear()
+            StockDataManage.clear_cache()
             st.rerun()
         return stock_symbol.upper().strip() if stock_symbol else ""
 
@@ -54,7 +60,7 @@ def render_quick_select_buttons() -> str:
     return ""
 
 
-def render_period_selections() -> str:
+def render_period_selections() -> Tuple[str, str]:
     with st.sidebar.expander("⏳ Time Settings", expanded=True):
         selected_label = st.selectbox(
         "Select Time Period:",
@@ -63,7 +69,33 @@ def render_period_selections() -> str:
         key="sidebar_period_select",
         help="Choose the time range for data"
     )
-    return PERIOD_OPTIONS[selected_label]
+        period = PERIOD_OPTIONS[selected_label]
+        intervals = available_intervals(period)
+        interval = st.selectbox(
+            "Chart Interval:",
+            options=intervals,
+            index=intervals.index(default_interval(period)),
+            format_func=INTERVAL_LABELS.get,
+            key=f"sidebar_interval_select_{period}",
+            help="Bar size of the chart, built from the cached data without a new download"
+        )
+        st.toggle(
+            "Live price",
+            key="live_mode",
+            help=f"Refresh the price every {CACHE_SETTINGS['live']['ttl']} s without reloading the rest of the page"
+        )
+    return period, interval
+
+
+def render_chart_overlays() -> Tuple[str, ...]:
+    with st.sidebar.expander("📊 Chart Overlays", expanded=False):
+        selected = tuple(
+            name for name in OVERLAYS
+            if st.checkbox(OVERLAY_LABELS[name], value=name in CHART_SETTINGS["default_overlays"],
+                           key=f"overlay_{name}")
+        )
+        st.caption("VWAP is anchored at the start of the period (the session open for 1 Day)")
+    return selected
 
 """
 def render_chart_options() -> Dict:
@@ -162,6 +194,15 @@ def render_additional_tools():
         )
         st.session_state.theme = theme
 
+        st.session_state.show_perf_panel = st.checkbox(
+            "Show performance panel",
+            value=False,
+            help="Display per-stage timings for each page refresh"
+        )
+
+    with st.sidebar.expander("Data provider status"):
+        render_upstream_status()
+
     with st.sidebar.expander("About"):
         st.write("""
         **TickerTrek™️ is a comprehensive stock analysis tool built with:
@@ -0,0 +1,281 @@
+"""
+Prometheus-style metrics export
+Counters, gauges and histograms in the Prometheus text exposition format,
+served on a local HTTP endpoint and/or written to a file for a scraper
+"""
+
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import METRICS_EXPORT
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+# (metric name, metric type, help text, [(labels dict, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, key))
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def collect(self) -> List[Family]:
+        with self.lock:
+            samples = [(self._labels(key), value) for key, value in self.values.items()]
+        return [(self.name, self.metric_type, self.help_text, samples)]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down"""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self.series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            # [bucket counts..., sum, count]
+            series = self.series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self) -> List[Family]:
+        samples = []
+        with self.lock:
+            for key, series in self.series.items():
+                labels = self._labels(key)
+                for bound, count in zip(self.buckets, series):
+                    samples.append(({**labels, "le": _format_value(bound)}, count))
+                samples.append(({**labels, "__suffix__": "_sum"}, series[-2]))
+                samples.append(({**labels, "__suffix__": "_count"}, series[-1]))
+        return [(self.name, self.metric_type, self.help_text, samples)]
+
+
+_metrics: List[_Metric] = []
+_collectors: List[Callable[[], List[Family]]] = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        _metrics.append(metric)
+    return metric
+
+
+def counter(name: str, help_text: str, label_names: Iterable[str] = ()) -> Counter:
+    return _register(Counter(name, help_text, label_names))
+
+
+def gauge(name: str, help_text: str, label_names: Iterable[str] = ()) -> Gauge:
+    return _register(Gauge(name, help_text, label_names))
+
+
+def histogram(name: str, help_text: str, label_names: Iterable[str] = (),
+              buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram(name, help_text, label_names, buckets))
+
+
+def register_collector(collector: Callable[[], List[Family]]):
+    """Add a callable evaluated at scrape time that returns metric families"""
+    with _registry_lock:
+        _collectors.append(collector)
+
+
+# Session activity, recorded from the main script on every rerun
+SESSION_IDLE_SECONDS = 300
+_sessions: Dict[str, Tuple[float, bool]] = {}
+_sessions_lock = threading.Lock()
+
+RERUNS = counter("tickertrek_reruns_total", "Streamlit script reruns")
+
+
+def record_session_activity(session_id: str, live: bool = False):
+    """Mark a session as active now, and whether it is subscribed to live updates"""
+    with _sessions_lock:
+        _sessions[session_id] = (time.time(), live)
+    RERUNS.inc()
+
+
+def _collect_sessions() -> List[Family]:
+    cutoff = time.time() - SESSION_IDLE_SECONDS
+    with _sessions_lock:
+        for session_id in [sid for sid, (seen, _) in _sessions.items() if seen < cutoff]:
+            del _sessions[session_id]
+        active = len(_sessions)
+        live = sum(1 for _, is_live in _sessions.values() if is_live)
+    return [
+        ("tickertrek_active_sessions", "gauge",
+         f"Sessions with a rerun in the last {SESSION_IDLE_SECONDS}s", [({}, active)]),
+        ("tickertrek_live_subscribers", "gauge", "Active sessions in live mode", [({}, live)]),
+    ]
+
+
+register_collector(_collect_sessions)
+
+
+def render_metrics() -> str:
+    """Every registered metric and collector in Prometheus text format"""
+    with _registry_lock:
+        metrics = list(_metrics)
+        collectors = list(_collectors)
+
+    families: List[Family] = []
+    for metric in metrics:
+        families.extend(metric.collect())
+    for collector in collectors:
+        try:
+            families.extend(collector())
+        except Exception:
+            logger.exception("Metrics collector %r failed", collector)
+
+    lines = []
+    for name, metric_type, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            labels = dict(labels)
+            suffix = labels.pop("__suffix__", "_bucket" if "le" in labels else "")
+            lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics_file(path: str):
+    """Atomically replace `path` with the current metrics"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+
+
+def _file_writer(path: str, interval: float):
+    while True:
+        try:
+            write_metrics_file(path)
+        except OSError:
+            logger.exception("Could not write metrics file %s", path)
+        time.sleep(interval)
+
+
+_export_started = False
+_export_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def _bind_metrics_server(host: str, first_port: int, port_range: int) -> Optional[ThreadingHTTPServer]:
+    """Metrics server on the first free port from first_port up, one per worker process on the host"""
+    for port in range(first_port, first_port + max(port_range, 1)):
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError:
+            continue  # another worker on this host owns it
+        logger.info("Serving metrics at http://%s:%s/metrics", host, port)
+        return server
+    logger.error("Metrics endpoint not started: ports %s-%s on %s are all in use, this process exports nothing",
+                 first_port, first_port + max(port_range, 1) - 1, host)
+    return None
+
+
+def start_metrics_export():
+    """Start the HTTP endpoint and/or file writer from METRICS_EXPORT, once per process"""
+    global _export_started, _server
+    with _export_lock:
+        if _export_started or not METRICS_EXPORT["enabled"]:
+            return
+        _export_started = True
+
+        if METRICS_EXPORT.get("port"):
+            _server = _bind_metrics_server(METRICS_EXPORT["host"], METRICS_EXPORT["port"],
+                                           METRICS_EXPORT.get("port_range", 1))
+            if _server is not None:
+                threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+
+        if METRICS_EXPORT.get("file"):
+            threading.Thread(
+                target=_file_writer,
+                args=(METRICS_EXPORT["file"].format(pid=os.getpid()), METRICS_EXPORT["file_interval"]),
+                name="metrics-file",
+                daemon=True
+            ).start()
@@ -0,0 +1,35 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from config import RISK_SETTINGS
+from market_calendar import resolve_exchange, cache_ttl
+
+# Wednesday 2026-10-21, 10:30 in Mumbai: NSE/BSE are trading, New York is closed
+DURING_NSE_SESSION = datetime(2026, 10, 21, 10, 30, tzinfo=ZoneInfo("Asia/Kolkata")).timestamp()
+
+
+def test_suffixes_resolve_to_their_exchange():
+    assert resolve_exchange("TATAMOTORS.NS") == "NSE"
+    assert resolve_exchange("RELIANCE.BO") == "BSE"
+    assert resolve_exchange("VOD.L") == "LSE"
+    assert resolve_exchange("BTC-USD") == "24/7"
+    assert resolve_exchange("AAPL") == "US"
+
+
+def test_indices_resolve_to_their_exchange():
+    assert resolve_exchange("^NSEI") == "NSE"
+    assert resolve_exchange("^NSEBANK") == "NSE"
+    assert resolve_exchange("^bsesn") == "BSE"
+    assert resolve_exchange("^FTSE") == "LSE"
+    assert resolve_exchange("^GSPC") == "US"
+
+
+def test_every_benchmark_resolves_to_the_exchange_it_measures():
+    for exchange, index in RISK_SETTINGS["benchmarks"].items():
+        assert resolve_exchange(index) == exchange
+
+
+def test_indian_index_is_not_held_fresh_until_the_us_open():
+    assert cache_ttl("^NSEI", "1d", DURING_NSE_SESSION, 300) == 300
+    assert cache_ttl("^BSESN", "1d", DURING_NSE_SESSION, 300) == 300
+    assert cache_ttl("AAPL", "1d", DURING_NSE_SESSION, 300) > 3600
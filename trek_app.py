@@ -4,23 +4,28 @@ main module v1.0.0
 """
 
 import streamlit as st
-import sys
-import os
 import pandas as pd
-from streamlit_autorefresh import st_autorefresh
 
-sys.path.append(os.path.dirname(os.path.abspath('C:\\Users\prath\Desktop\TickerTrek2')))
-
-from config import PAGE_CONFIG, CUSTOM_CSS
+from config import PAGE_CONFIG, CUSTOM_CSS, CACHE_SETTINGS, CHART_SETTINGS, TECHNICAL_INDICATORS
 from sidebar import render_sidebar
-from metrics import render_key_metrics, render_real_time_price
-from data_table import render_recent_data, render_statistics
+from metrics import render_key_metrics, render_real_time_price, render_live_sparkline, render_performance_panel
+from data_table import render_recent_data, render_statistics, render_risk_analysis
 from data_etl import StockDataManage
 from visualization import plot_candlestick
+from live_chart import live_chart
+from market_calendar import session_info
+from resample import default_interval
+from profiling import begin_rerun, begin_fragment_rerun, span, payload_bytes
+from telemetry import start_metrics_export, record_session_activity
+from prefetch import start_prefetch
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 def main():
     """Main application function"""
     st.set_page_config(**PAGE_CONFIG)
+    begin_rerun()
+    start_metrics_export()
+    start_prefetch()
     st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     st.markdown(
         '<h1 class="main-header">📈TickerTrek - Stock Price Analytics</h1>',
@@ -32,34 +37,51 @@ def main():
         st.session_state.stock_symbol = 'NVDA'
     if 'period' not in st.session_state:
         st.session_state.period = '1y'
-    stock_symbol, period = render_sidebar()  # Render sidebar and get user inputs
+    with span("sidebar"):
+        stock_symbol, period, interval, overlays = render_sidebar()  # Render sidebar and get user inputs
 
     if stock_symbol:  # Update session state
         st.session_state.stock_symbol = stock_symbol
     if period:
         st.session_state.period = period
 
-    if st.session_state.period == "live":
-        st_autorefresh(interval=10_000, key="live_refresh")
+    live = st.session_state.get("live_mode", False)
+    track_session_activity(live)
 
     if st.session_state.stock_symbol:
         data_manager = StockDataManage()
 
-        with st.spinner(f"Fetching data..."):  # Fetch data with loading spinner
+        with st.spinner(f"Fetching data..."), span("fetch.history") as fetch_span:  # Fetch data with loading spinner
             stock_data = data_manager.get_stock_data(st.session_state.stock_symbol, period)
+            fetch_span["cache"] = data_manager.last_cache_status
+            fetch_span["bytes"] = payload_bytes(stock_data.data)
+        if stock_data.error:
+            getattr(st, stock_data.error_level)(stock_data.error)
         st.markdown("---")
-        render_real_time_price(stock_data)
-
-        st.plotly_chart(plot_candlestick(st.session_state.stock_symbol,st.session_state.period))
+        # Only this part reruns on the live cadence; the sections below rerun with the page
+        st.fragment(render_live_section, run_every=CACHE_SETTINGS["live"]["ttl"] if live else None)(
+            st.session_state.stock_symbol, period, interval, live
+        )
+
+        with span("chart_build") as chart_span:
+            figure = cached_candlestick(stock_data, period, interval, overlays)
+            chart_span["rows"] = len(stock_data.data)
+        st.plotly_chart(figure)
         st.markdown("---")
-        render_key_metrics(stock_data)
+        with span("key_metrics"):
+            render_key_metrics(stock_data)
         st.markdown("---")
 
-        render_statistics(stock_data)  # Statistics and analysis
-        render_recent_data(stock_data)
+        with span("statistics"):
+            render_statistics(stock_data)  # Statistics and analysis
+        with span("risk"):
+            render_risk_analysis(stock_data, data_manager.get_risk_analysis(stock_data, period))
+        with span("recent_data"):
+            render_recent_data(stock_data)
         st.markdown("---")
         if stock_data.info:
-            render_company_info(stock_data)
+            with span("company_info"):
+                render_company_info(stock_data)
 
         else:
             st.error(f"❌ Could not fetch data for symbol: {st.session_state.stock_symbol}")
@@ -68,10 +90,75 @@ def main():
     else:
         st.info("👈 Please enter a stock symbol in the sidebar to get started!")
 
+    if st.session_state.get('show_perf_panel'):
+        render_performance_panel()
+
     # Footer
     render_footer()
 
 
+def track_session_activity(live: bool):
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        record_session_activity(ctx.session_id, live=live)
+
+
+def render_live_section(symbol: str, period: str, interval: str, live: bool):
+    """Price header and change metrics, plus the live chart in live mode; reruns on its own every live tick"""
+    begin_fragment_rerun()
+    data_manager = StockDataManage()
+    with span("real_time_price"):
+        stock_data = data_manager.get_stock_data(symbol, period)
+        if live:
+            track_session_activity(live)
+            stock_data = data_manager.with_live_price(stock_data)
+        render_real_time_price(stock_data)
+        if live:
+            render_live_sparkline(data_manager.get_stock_data(symbol, "live"))
+    if live and stock_data.is_valid():
+        with span("live_chart"):
+            chart = session_live_chart(data_manager, stock_data, period, interval)
+        if chart is not None:
+            st.plotly_chart(chart.figure, key="live_chart")
+
+
+def session_live_chart(data_manager, stock_data, period: str, interval: str):
+    """
+    This session's live chart, updated in place from the latest quote
+
+    It is built once from the trailing bars of the chart's interval and then
+    only has its latest bar (and moving-average point) moved, or a new bar
+    rolled in, so every tick costs the same whatever the period loaded.
+    """
+    key = (stock_data.symbol, period, interval, stock_data.fetched_at)
+    memo = st.session_state.get("_live_chart")
+    if memo is None or memo[0] != key:
+        bars = data_manager.get_bars(stock_data.symbol, period, interval)
+        memo = (key, live_chart(stock_data.symbol, bars, interval or default_interval(period),
+                                CHART_SETTINGS["live_bars"], TECHNICAL_INDICATORS["MA_SHORT"]))
+        st.session_state["_live_chart"] = memo
+    chart = memo[1]
+    if chart is not None:
+        now = pd.Timestamp.now(tz=chart.times.tz)
+        chart.update(stock_data.current_price, now, session_info(stock_data.symbol)["is_trading_hours"])
+    return chart
+
+
+def cached_candlestick(stock_data, period: str, interval: str, overlays=()):
+    """
+    Candlestick figure for this session, rebuilt only when its inputs change
+
+    Reruns caused by unrelated widgets reuse the previous figure instead of
+    rebuilding it from the price history.
+    """
+    key = (stock_data.symbol, period, interval, stock_data.fetched_at, overlays)
+    memo = st.session_state.get("_chart_memo")
+    if memo is None or memo[0] != key:
+        memo = (key, plot_candlestick(stock_data.symbol, period, interval, overlays))
+        st.session_state["_chart_memo"] = memo
+    return memo[1]
+
+
 def render_company_info(stock_data):
     if not stock_data.info:
         return
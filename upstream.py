@@ -0,0 +1,229 @@
+"""
+Upstream call protection module
+Process-wide rate limiting, retry with jittered backoff and circuit breaking
+for every Yahoo Finance request made by the data layer
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from config import UPSTREAM_SETTINGS
+from telemetry import histogram, register_collector
+
+# Errors that mean the provider answered but the request itself was bad.
+# They are not retried and do not count against the circuit breaker.
+NON_RETRYABLE_ERRORS = (KeyError, IndexError, ValueError, TypeError)
+
+
+class UpstreamUnavailable(Exception):
+    """Raised when a call is rejected by the rate limiter or an open circuit"""
+
+    def __init__(self, call_type: str, reason: str):
+        super().__init__(f"{call_type} calls unavailable: {reason}")
+        self.call_type = call_type
+        self.reason = reason
+
+
+class TokenBucket:
+    """Thread-safe token bucket, refilled continuously at `rate` tokens/sec"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Classic closed -> open -> half-open breaker over consecutive failures"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial_in_flight = False
+            # Half-open: let exactly one trial call through
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+            return True
+
+    def release_trial(self):
+        """Give back a half-open trial slot that was granted but not used"""
+        with self.lock:
+            self.trial_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            self.trial_in_flight = False
+            if (self.state == self.HALF_OPEN
+                    or self.consecutive_failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+def _new_stats() -> Dict[str, int]:
+    return {"calls": 0, "failures": 0, "retries": 0, "rejected": 0}
+
+
+_limiters = {
+    call_type: TokenBucket(settings["rate"], settings["burst"])
+    for call_type, settings in UPSTREAM_SETTINGS.items()
+}
+_breakers = {
+    call_type: CircuitBreaker(settings["failure_threshold"], settings["reset_timeout"])
+    for call_type, settings in UPSTREAM_SETTINGS.items()
+}
+_stats = {call_type: _new_stats() for call_type in UPSTREAM_SETTINGS}
+_stats_lock = threading.Lock()
+
+UPSTREAM_LATENCY = histogram(
+    "tickertrek_upstream_latency_seconds", "Latency of individual upstream call attempts", ["call_type"]
+)
+
+
+def scale_rate_limits(factor: float):
+    """
+    Rebuild every token bucket at `factor` times its configured rate and burst
+
+    Worker pools call this with 1/workers so the host as a whole stays within
+    UPSTREAM_SETTINGS even though each process keeps its own limiter.
+    """
+    for call_type, settings in UPSTREAM_SETTINGS.items():
+        _limiters[call_type] = TokenBucket(settings["rate"] * factor, max(1, int(settings["burst"] * factor)))
+
+
+def _count(call_type: str, key: str):
+    with _stats_lock:
+        _stats[call_type][key] += 1
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_upstream(call_type: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a provider call under the limiter, retry policy and breaker for `call_type`
+
+    Raises:
+        UpstreamUnavailable: when throttled locally, the circuit is open,
+            or all retries were exhausted
+    """
+    settings = UPSTREAM_SETTINGS[call_type]
+    limiter = _limiters[call_type]
+    breaker = _breakers[call_type]
+
+    last_error = None
+    for attempt in range(settings["retries"] + 1):
+        if not breaker.allow():
+            _count(call_type, "rejected")
+            raise UpstreamUnavailable(call_type, "circuit open")
+        if not limiter.acquire(timeout=settings["max_wait"]):
+            breaker.release_trial()
+            _count(call_type, "rejected")
+            raise UpstreamUnavailable(call_type, "rate limited")
+
+        _count(call_type, "calls")
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except NON_RETRYABLE_ERRORS:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - started, call_type=call_type)
+            breaker.record_success()
+            raise
+        except Exception as e:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - started, call_type=call_type)
+            last_error = e
+            _count(call_type, "failures")
+            breaker.record_failure()
+            if attempt < settings["retries"]:
+                _count(call_type, "retries")
+                time.sleep(backoff_delay(attempt, settings["backoff_base"], settings["backoff_max"]))
+            continue
+
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, call_type=call_type)
+        breaker.record_success()
+        return result
+
+    raise UpstreamUnavailable(call_type, f"retries exhausted ({type(last_error).__name__}: {last_error})")
+
+
+def get_upstream_status() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of breaker state and call counters per call type"""
+    with _stats_lock:
+        snapshot = {call_type: dict(stats) for call_type, stats in _stats.items()}
+    for call_type, breaker in _breakers.items():
+        snapshot[call_type]["state"] = breaker.state
+        snapshot[call_type]["consecutive_failures"] = breaker.consecutive_failures
+        snapshot[call_type]["tokens"] = round(_limiters[call_type].tokens, 2)
+    return snapshot
+
+
+_BREAKER_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+def _collect_metrics():
+    status = get_upstream_status()
+    families = []
+    for key, help_text in (("calls", "Upstream call attempts"),
+                           ("failures", "Upstream call attempts that failed"),
+                           ("retries", "Upstream retries after a failed attempt"),
+                           ("rejected", "Upstream calls rejected by the rate limiter or an open circuit")):
+        samples = [({"call_type": call_type}, stats[key]) for call_type, stats in status.items()]
+        families.append((f"tickertrek_upstream_{key}_total", "counter", help_text, samples))
+    families.append((
+        "tickertrek_upstream_circuit_state", "gauge", "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+        [({"call_type": call_type}, _BREAKER_STATE_VALUES[stats["state"]]) for call_type, stats in status.items()]
+    ))
+    return families
+
+
+register_collector(_collect_metrics)
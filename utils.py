@@ -2,8 +2,8 @@
 Utility helper function
 """
 import pandas as pd
-from datetime import datetime, timedelta
-import streamlit as st
+from datetime import datetime
+from market_calendar import session_info
 
 
 def format_number(num): #returns formatted string number T,M,K,B
@@ -23,6 +23,15 @@ def format_number(num): #returns formatted string number T,M,K,B
         return f"{num:.0f}"
 
 
+def format_bytes(num): #returns a size in B, KB, MB, GB
+    num = float(num or 0)
+    for unit in ("B", "KB", "MB"):
+        if abs(num) < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} GB"
+
+
 def format_currency(amount): #Returns formated percentage string
     try:
         amount = float(amount)
@@ -93,41 +102,9 @@ def calculate_bollinger_bands(data, window=20, stdd=2):
 
     return upper,middle,lower
 
-def get_trading_session_info():
-    now=datetime.now()
-
-    market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
-    market_close= now.replace(hour=15, minute=30,second=0, microsecond=0)
-
-    is_weekday=now.weekday()<5
-
-    if is_weekday and market_open <= now <= market_close:
-        status="OPEN"
-        time_info = f"Market closes at{market_close.strftime('%I:%M %p')}"
-
-    elif is_weekday and now <market_open:
-        status="PRE_MARKET"
-        time_info= f"Market opens at{market_open.strftime('%I:%M %p')}"
-
-    elif is_weekday and now>market_close:
-        status="AFTER_HOURS"
-        next_open = (now + timedelta(days=1)).replace(hour=9,minute=15,second=0,microsecond=0)
-        time_info = f"Market opens tomorrow at {next_open.strftime('%I:%M %p')}"
-
-    else:
-        status = "CLOSED"
-        days_until_monday = (7 - now.weekday()) % 7
-        if days_until_monday == 0:
-            days_until_monday = 1
-        next_trading_day = now + timedelta(days=days_until_monday)
-        next_open = next_trading_day.replace(hour=9, minute=30, second=0, microsecond=0)
-        time_info = f"Market opens {next_open.strftime('%A at %I:%M %p')}"
-
-    return {
-            "status" : status,
-            "time_info":time_info,
-            "is_trading_hours": status=="OPEN"
-    }
+def get_trading_session_info(symbol=None):
+    """Market status for the symbol's exchange (DEFAULT_EXCHANGE when no symbol is given)"""
+    return session_info(symbol)
 
 
 def create_price_alert(current_price, target_price, alert_type="both"):
@@ -160,9 +137,10 @@ def format_market_cap(market_cap):
 
 
 
-@st.cache_data(ttl=300)
 def cached_calculations(func,*args,**kwargs):
-    return func(*args,**kwargs)
+    # Streamlit is imported lazily so the indicators above stay usable headless
+    import streamlit as st
+    return st.cache_data(ttl=300)(func)(*args,**kwargs)
 
 
 def safe_divide(nume,deno,default=0):
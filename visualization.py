@@ -1,12 +1,14 @@
-import plotly.graph_objects as go
 from data_etl import StockDataManage
+from config import CHART_SETTINGS
+from overlays import chart_overlays
 import pandas as pd
 
-def plot_candlestick(ticker_symbol:str, period: str = '1y'):
+def plot_candlestick(ticker_symbol:str, period: str = '1y', interval: str = None, overlays=()):
+    import plotly.graph_objects as go  # deferred to the first chart, keeps start-up fast
     manager = StockDataManage()
 
     try:
-        df = manager.get_candlestick_data(ticker_symbol,period)
+        df = manager.get_candlestick_data(ticker_symbol,period,interval)
         if not pd.api.types.is_datetime64_any_dtype(df['Date']):
             df['Date'] = pd.to_datetime(df['Date'])
 
@@ -19,7 +21,8 @@ def plot_candlestick(ticker_symbol:str, period: str = '1y'):
             low=df['Low'],
             close=df['Close'],
             increasing={'line': {'color':'green'}},
-            decreasing={'line': {'color':'red'}}
+            decreasing={'line': {'color':'red'}},
+            name='Price'
         )])
 
         fig.update_layout(
@@ -29,7 +32,51 @@ def plot_candlestick(ticker_symbol:str, period: str = '1y'):
             xaxis_rangeslider_visible=False,
             template="plotly_white"
         )
+        if overlays:
+            add_overlays(fig, manager, ticker_symbol, period, df, overlays)
         return fig
 
     except Exception:
-        raise RuntimeError(f"Failed to render candlestick chart")
\ No newline at end of file
+        raise RuntimeError(f"Failed to render candlestick chart")
+
+
+def add_overlays(fig, manager, ticker_symbol: str, period: str, df: pd.DataFrame, overlays):
+    """Volume bars in a panel below the price, VWAP line and volume profile along the price axis"""
+    import plotly.graph_objects as go
+
+    if "volume" in overlays and 'Volume' in df.columns:
+        rising = df['Close'] >= df['Open']
+        fig.add_trace(go.Bar(
+            x=df.index, y=df['Volume'], yaxis='y2', name='Volume', showlegend=False,
+            marker={'color': rising.map({True: 'rgba(0,128,0,0.5)', False: 'rgba(255,0,0,0.5)'}).tolist()}
+        ))
+        volume_height = CHART_SETTINGS["volume_height"]
+        fig.update_layout(
+            yaxis={'domain': [volume_height + 0.05, 1]},
+            yaxis2={'domain': [0, volume_height], 'title': 'Volume', 'showgrid': False}
+        )
+
+    wanted = [name for name in ("vwap", "profile") if name in overlays]
+    if not wanted:
+        return
+    stock_data = manager.get_stock_data(ticker_symbol, period)
+    minute_bars = manager.get_minute_bars(ticker_symbol) if "vwap" in wanted and period == "1d" else None
+    data = chart_overlays(stock_data, period, wanted, minute_bars)
+
+    vwap = data.get("vwap")
+    if vwap is not None and vwap.notna().any():
+        fig.add_trace(go.Scatter(x=vwap.index, y=vwap.values, mode='lines', name='VWAP',
+                                 line={'color': 'orange', 'width': 1.5}))
+
+    profile = data.get("profile")
+    if profile:
+        # Drawn on its own x axis, growing leftwards from the right edge over a quarter of the chart
+        fig.add_trace(go.Bar(
+            x=profile["volumes"], y=profile["centers"], width=profile["height"], orientation='h',
+            xaxis='x2', yaxis='y', name='Volume profile', showlegend=False,
+            marker={'color': 'rgba(70,130,180,0.3)'}
+        ))
+        fig.update_layout(xaxis2={'overlaying': 'x', 'range': [profile["volumes"].max() * 4, 0],
+                                  'visible': False})
+        fig.add_hline(y=profile["poc"], line_dash='dot', line_color='steelblue',
+                      annotation_text='POC', annotation_position='top left')